@@ -0,0 +1,411 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import tornado.web
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+import stage_timing
+from cascade import CascadeMatcher
+from job_queue import JobQueue, QueueFullError
+from match_results import MatchResults
+from matcher import ResumeMatcher, prepare_resume_features
+from parse_cache import ParseCache, DEFAULT_CACHE_PATH
+from resume_parser import parse_resume
+from text_processor import preprocess_text, warmup
+
+# Default port, shared with the static frontend the server also hosts
+DEFAULT_PORT = 8001
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+
+# Largest request body accepted (a batch of uploaded resumes)
+MAX_BODY_BYTES = 100 * 1024 * 1024
+
+# How often a job event stream checks for progress, and sends a keepalive when idle
+EVENT_POLL_SECONDS = 0.25
+EVENT_KEEPALIVE_SECONDS = 15
+# Ranked results sent with each job event unless the client asks for another
+# page; the full ranking is read by paging the job or exporting it
+EVENT_RESULTS_TOP_K = 50
+# Seconds a client is told to wait when the job queue is full
+RETRY_AFTER_SECONDS = 5
+
+# Per-process state for scoring workers, set by _init_worker
+_worker_state = {'cache': None, 'timings': None}
+
+def _init_worker(cache_path, timings=False):
+    """Load the NLP models and open the parse cache once per worker process"""
+    _worker_state['cache'] = ParseCache(cache_path) if cache_path else None
+    if timings:
+        _worker_state['timings'] = stage_timing.HistogramSink()
+        stage_timing.set_sink(_worker_state['timings'])
+    warmup(spacy_model=False)
+
+def _call_with_timings(func, *args):
+    """Run func in a worker and send back the stage timings it recorded with its result"""
+    result = func(*args)
+    timings = _worker_state['timings']
+    return result, timings.drain() if timings is not None else None
+
+def parse_upload(file_name, data):
+    """Parse, preprocess and extract job-independent features from one uploaded resume (runs in a worker)"""
+    try:
+        # Already one of a pool of workers: extract PDF pages serially rather
+        # than starting a page pool in every worker
+        resume_data = parse_resume(data, cache=_worker_state['cache'], file_name=file_name, page_workers=1)
+        if not resume_data['text'].strip():
+            raise ValueError("No text could be extracted from the file")
+        resume_data['raw_text'] = resume_data['text']
+        resume_data['text'] = preprocess_text(resume_data['text'])
+        resume_data.update(prepare_resume_features(resume_data['text']))
+        return {'file_name': file_name, 'resume': resume_data, 'error': None}
+    except Exception as e:
+        return {'file_name': file_name, 'resume': None, 'error': f"{type(e).__name__}: {e}"}
+
+def fit_matcher(jd_text):
+    """ResumeMatcher fitted on a raw job description"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(jd_text))
+    return matcher
+
+def score_resumes(jd_text, resumes_data, top_k=None, offset=0):
+    """Rank preprocessed resumes against a raw job description, optionally one page of them (runs in a worker)"""
+    return fit_matcher(jd_text).match_resumes(resumes_data, top_k, offset)
+
+def cascade_texts(jd_text, resumes, top_k=None, offset=0):
+    """Rank resumes given as raw text with the cascade, plus its per-stage stats (runs in a worker).
+
+    Only the text is preprocessed up front; skills and similarity profiles
+    are left to the cascade, which builds them for the resumes that reach
+    those stages.
+    """
+    resumes_data = [{'candidate_name': resume.get('candidate_name') or f"Candidate {i + 1}",
+                     'text': preprocess_text(resume['text'])} for i, resume in enumerate(resumes)]
+    return CascadeMatcher(fit_matcher(jd_text)).match_resumes(resumes_data, top_k, offset)
+
+def prepare_texts(resumes):
+    """Preprocess and extract features for resumes given as raw text (runs in a worker)"""
+    resumes_data = []
+    for i, resume in enumerate(resumes):
+        processed_text = preprocess_text(resume['text'])
+        resume_data = {'candidate_name': resume.get('candidate_name') or f"Candidate {i + 1}",
+                       'text': processed_text}
+        resume_data.update(prepare_resume_features(processed_text))
+        resumes_data.append(resume_data)
+    return resumes_data
+
+def public_resume(resume_data):
+    """JSON-safe view of a parsed resume (internal matching features removed)"""
+    return {
+        'candidate_name': resume_data['candidate_name'],
+        'contact_info': resume_data['contact_info'],
+        'education': resume_data['education'],
+        'experience_years': resume_data['experience_years'],
+        'extraction': resume_data['extraction'],
+        'skills': resume_data['skills'],
+        'text': resume_data['raw_text']
+    }
+
+class BaseHandler(tornado.web.RequestHandler):
+    """Shared helpers: JSON errors and running CPU-bound work off the event loop"""
+    @property
+    def executor(self):
+        return self.application.settings['executor']
+
+    @property
+    def jobs(self):
+        return self.application.settings['jobs']
+
+    async def run_in_worker(self, func, *args):
+        """Run CPU-bound NLP in the worker pool so the event loop keeps serving requests"""
+        result, timings = await IOLoop.current().run_in_executor(self.executor, _call_with_timings, func, *args)
+        stage_timing.merge(timings)
+        return result
+
+    async def parse_uploads(self):
+        """Parse every uploaded file of the request concurrently in the worker pool"""
+        return await asyncio.gather(*(self.run_in_worker(parse_upload, file_name, data)
+                                      for file_name, data in self.uploaded_files()))
+
+    def uploaded_files(self):
+        """Every uploaded file of the request as (file name, data)"""
+        uploads = [(upload.filename, upload.body)
+                   for uploads in self.request.files.values() for upload in uploads]
+        if not uploads:
+            raise tornado.web.HTTPError(400, reason="Upload at least one PDF or DOCX resume")
+        return uploads
+
+    def get_job(self, job_id):
+        """The job with this id, or a 404"""
+        job = self.jobs.get(job_id) if self.jobs else None
+        if job is None:
+            raise tornado.web.HTTPError(404, reason="Unknown job")
+        return job
+
+    def top_k(self):
+        """The optional top_k query argument: how many ranked results to return"""
+        return self.count_argument('top_k', None)
+
+    def offset(self):
+        """The optional offset query argument: how many of the best results to skip (for paging)"""
+        return self.count_argument('offset', 0)
+
+    def count_argument(self, name, default):
+        """A non-negative integer query argument, or a 400"""
+        value = self.get_query_argument(name, None)
+        if value is None:
+            return default
+        try:
+            count = int(value)
+        except ValueError:
+            count = -1
+        if count < 0:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be a non-negative integer")
+        return count
+
+    def json_body(self):
+        """Decode a JSON object request body, or a 400"""
+        try:
+            body = json.loads(self.request.body or b"{}")
+        except json.JSONDecodeError:
+            raise tornado.web.HTTPError(400, reason="Request body must be JSON")
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Request body must be a JSON object")
+        return body
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({'error': self._reason, 'status': status_code})
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write({'status': 'ok'})
+
+class MetricsHandler(BaseHandler):
+    """GET per-stage timings in the Prometheus text format"""
+    def get(self):
+        sink = stage_timing.get_sink()
+        if not isinstance(sink, stage_timing.HistogramSink):
+            raise tornado.web.HTTPError(404, reason="Stage timing is not enabled")
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.write(sink.to_prometheus())
+
+class ParseHandler(BaseHandler):
+    """POST multipart resume files; returns the parsed fields of each"""
+    async def post(self):
+        parsed = await self.parse_uploads()
+        self.write({'resumes': [{'file_name': result['file_name'],
+                                 'resume': public_resume(result['resume']) if result['resume'] else None,
+                                 'error': result['error']} for result in parsed]})
+
+class ScoreHandler(BaseHandler):
+    """POST JSON {"job_description", "resumes": [{"candidate_name", "text"}], "cascade"}; returns ranked results"""
+    async def post(self):
+        body = self.json_body()
+        jd_text = (body.get('job_description') or '').strip()
+        resumes = body.get('resumes') or []
+        if not jd_text:
+            raise tornado.web.HTTPError(400, reason="job_description is required")
+        if not isinstance(resumes, list) or not all(isinstance(r, dict) and 'text' in r for r in resumes):
+            raise tornado.web.HTTPError(400, reason="resumes must be a list of objects with a 'text' field")
+
+        cascade = body.get('cascade', False)
+        if not isinstance(cascade, bool):
+            raise tornado.web.HTTPError(400, reason="cascade must be true or false")
+
+        top_k, offset = self.top_k(), self.offset()
+        if cascade:
+            # Only candidates that pass the cascade are returned, with its per-stage stats
+            results, stages = await self.run_in_worker(cascade_texts, jd_text, resumes, top_k, offset)
+            self.write({'results': results, 'scored': len(resumes), 'offset': offset, 'stages': stages})
+            return
+        resumes_data = await self.run_in_worker(prepare_texts, resumes)
+        results = await self.run_in_worker(score_resumes, jd_text, resumes_data, top_k, offset)
+        self.write({'results': results, 'scored': len(resumes_data), 'offset': offset})
+
+class ScreenHandler(BaseHandler):
+    """POST multipart job_description plus resume files; parses and ranks the whole batch"""
+    async def post(self):
+        jd_text = self.get_body_argument('job_description', '').strip()
+        if not jd_text:
+            raise tornado.web.HTTPError(400, reason="job_description is required")
+        top_k, offset = self.top_k(), self.offset()
+
+        parsed = await self.parse_uploads()
+        errors = [{'file_name': result['file_name'], 'error': result['error']}
+                  for result in parsed if result['error']]
+        resumes_data = [result['resume'] for result in parsed if result['resume']]
+
+        results = (await self.run_in_worker(score_resumes, jd_text, resumes_data, top_k, offset)
+                   if resumes_data else [])
+        self.write({'results': results, 'errors': errors, 'scored': len(resumes_data), 'offset': offset})
+
+class JobsHandler(BaseHandler):
+    """POST multipart job_description plus resume files; queues a background screening job"""
+    async def post(self):
+        jd_text = self.get_body_argument('job_description', '').strip()
+        if not jd_text:
+            raise tornado.web.HTTPError(400, reason="job_description is required")
+        uploads = self.uploaded_files()
+        near_duplicate_threshold = self.near_duplicate_threshold()
+
+        # Preprocessing the job description is NLP work, so the matcher is
+        # fitted in the worker pool; the job itself runs in the queue's pool
+        matcher = await self.run_in_worker(fit_matcher, jd_text)
+        try:
+            job = self.jobs.submit(matcher, uploads, near_duplicate_threshold=near_duplicate_threshold)
+        except QueueFullError as e:
+            # Written directly: send_error would drop the Retry-After header
+            self.set_status(503)
+            self.set_header('Retry-After', str(RETRY_AFTER_SECONDS))
+            self.finish({'error': str(e), 'status': 503})
+            return
+
+        self.set_status(202)
+        self.write({'job_id': job.job_id, 'status': job.status, 'total': job.total,
+                    'status_url': f"/api/jobs/{job.job_id}", 'events_url': f"/api/jobs/{job.job_id}/events"})
+
+    def near_duplicate_threshold(self):
+        """The optional near_duplicate_threshold form field: a similarity in (0, 1], or a 400"""
+        value = self.get_body_argument('near_duplicate_threshold', '').strip()
+        if not value:
+            return None
+        try:
+            threshold = float(value)
+        except ValueError:
+            threshold = 0.0
+        if not 0 < threshold <= 1:
+            raise tornado.web.HTTPError(400, reason="near_duplicate_threshold must be a number in (0, 1]")
+        return threshold
+
+class JobHandler(BaseHandler):
+    """GET a job's progress and ranked results so far (page with ?top_k=N&offset=M); DELETE cancels it"""
+    def get(self, job_id):
+        self.write(self.get_job(job_id).snapshot(self.top_k(), self.offset()))
+
+    def delete(self, job_id):
+        job = self.get_job(job_id)
+        job.cancel()
+        self.set_status(202)
+        self.write(job.snapshot(0))
+
+class JobEventsHandler(BaseHandler):
+    """GET a server-sent event stream of a job's progress, ending with a 'done' event.
+    
+    Each event carries one page of the ranking (?top_k=N&offset=M, by default
+    the best EVENT_RESULTS_TOP_K), so a tick costs the same however large the job.
+    """
+    async def get(self, job_id):
+        job = self.get_job(job_id)
+        top_k, offset = self.count_argument('top_k', EVENT_RESULTS_TOP_K), self.offset()
+        self.set_header('Content-Type', 'text/event-stream')
+        self.set_header('Cache-Control', 'no-cache')
+
+        version = None
+        idle = 0
+        try:
+            while True:
+                finished = job.finished
+                if job.version != version:
+                    snapshot = job.snapshot(top_k, offset)
+                    version = snapshot['version']
+                    event = 'done' if finished else 'progress'
+                    self.write(f"event: {event}\ndata: {json.dumps(snapshot)}\n\n")
+                    await self.flush()
+                    idle = 0
+                    if finished:
+                        break
+                elif idle >= EVENT_KEEPALIVE_SECONDS:
+                    self.write(": keepalive\n\n")
+                    await self.flush()
+                    idle = 0
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+                idle += EVENT_POLL_SECONDS
+        except StreamClosedError:
+            # The client went away; the job keeps running and can still be polled
+            pass
+
+class JobExportHandler(BaseHandler):
+    """GET a job's ranking as a file: ?format=csv (default, streamed in chunks) or ?format=parquet"""
+    async def get(self, job_id):
+        job = self.get_job(job_id)
+        export_format = self.get_query_argument('format', 'csv')
+        if export_format not in ('csv', 'parquet'):
+            raise tornado.web.HTTPError(400, reason="format must be csv or parquet")
+        
+        # The ranking's columns are built one page at a time, handing the
+        # event loop back between pages so other requests are not held up
+        self.set_header('Content-Disposition', f'attachment; filename="resume_matching_results.{export_format}"')
+        if export_format == 'csv':
+            self.set_header('Content-Type', 'text/csv; charset=utf-8')
+            for page_number, page in enumerate(job.iter_ranking()):
+                for chunk in page.iter_csv(header=page_number == 0):
+                    self.write(chunk)
+                    await self.flush()
+        else:
+            pages = []
+            for page in job.iter_ranking():
+                pages.append(page)
+                await asyncio.sleep(0)
+            # Parquet's footer is written last, so the file is built before sending
+            buffer = io.BytesIO()
+            MatchResults.concatenate(pages).write_parquet(buffer)
+            self.set_header('Content-Type', 'application/vnd.apache.parquet')
+            self.write(buffer.getvalue())
+
+def make_app(executor, static_path=FRONTEND_DIR, jobs=None):
+    """Tornado application serving the API under /api and the frontend at /"""
+    return tornado.web.Application([
+        (r"/api/health", HealthHandler),
+        (r"/metrics", MetricsHandler),
+        (r"/api/parse", ParseHandler),
+        (r"/api/score", ScoreHandler),
+        (r"/api/screen", ScreenHandler),
+        (r"/api/jobs", JobsHandler),
+        (r"/api/jobs/([0-9a-f]+)", JobHandler),
+        (r"/api/jobs/([0-9a-f]+)/events", JobEventsHandler),
+        (r"/api/jobs/([0-9a-f]+)/export", JobExportHandler),
+        (r"/(.*)", tornado.web.StaticFileHandler, {'path': static_path, 'default_filename': 'index.html'}),
+    ], executor=executor, jobs=jobs)
+
+def create_executor(workers, cache_path=DEFAULT_CACHE_PATH, timings=None):
+    """Worker pool that parses and scores; every process loads the models once.
+    
+    With timings (default: whether stage timing is on here), workers send
+    their stage timings back to this process.
+    """
+    if timings is None:
+        timings = stage_timing.enabled()
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path, timings))
+
+def run_server(port=DEFAULT_PORT, workers=None, cache_path=DEFAULT_CACHE_PATH):
+    """Start the API and frontend server and block until interrupted"""
+    workers = workers or os.cpu_count() or 1
+    # Stage timings of every request are kept for /metrics
+    stage_timing.set_sink(stage_timing.HistogramSink())
+    executor = create_executor(workers, cache_path)
+    jobs = JobQueue(parse_workers=workers, cache_path=cache_path)
+    
+    # Start every worker (loading its models) before taking traffic
+    print("Loading NLP models...")
+    for future in [executor.submit(os.getpid) for _ in range(workers)]:
+        future.result()
+    
+    app = make_app(executor, jobs=jobs)
+    app.listen(port, max_body_size=MAX_BODY_BYTES, max_buffer_size=MAX_BODY_BYTES)
+    print(f"Serving the screening API and frontend at http://localhost:{port}")
+    try:
+        IOLoop.current().start()
+    except KeyboardInterrupt:
+        print("\nShutting down server...")
+    finally:
+        jobs.shutdown()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the resume screening API and frontend")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="NLP worker processes (default: CPU count)")
+    args = parser.parse_args()
+    run_server(args.port, args.workers)
@@ -1,11 +1,209 @@
 import streamlit as st
 import pandas as pd
+import copy
+import hashlib
+import io
 import os
-import tempfile
-from resume_parser import parse_resume
-from text_processor import preprocess_text, extract_skills_advanced
+import threading
+import time
+import stage_timing
+from job_queue import JobQueue, QueueFullError
+from parse_cache import DEFAULT_CACHE_PATH
+from text_processor import preprocess_text, warmup
 from matcher import ResumeMatcher
-from utils import save_results_to_csv
+from near_duplicates import DEFAULT_NEAR_DUPLICATE_THRESHOLD
+from tfidf_model import CorpusTfidfModel, DEFAULT_MODEL_PATH
+
+# Fitted job descriptions kept across reruns
+MATCHER_CACHE_ENTRIES = 32
+
+# How often a running job's progress is redrawn, and how many of its leading results are shown meanwhile
+JOB_POLL_SECONDS = 0.5
+PARTIAL_RESULTS_SHOWN = 10
+# Ranked results shown per page; rows are only built for the page on screen
+RESULTS_PAGE_SIZE = 50
+# Finished jobs whose download files are kept across reruns
+EXPORT_CACHE_ENTRIES = 8
+
+def content_hash(data):
+    """Hex digest identifying an upload or job description by content"""
+    return hashlib.sha256(data).hexdigest()
+
+@st.cache_resource(show_spinner="Loading NLP models...")
+def load_nlp_models():
+    """Load the NLTK models once per server process (the app never uses SpaCy)"""
+    return warmup(spacy_model=False)
+
+@st.cache_resource
+def enable_stage_timing():
+    """Record per-stage timings of every screening run in this server process"""
+    sink = stage_timing.HistogramSink()
+    stage_timing.set_sink(sink)
+    return sink
+
+@st.cache_resource
+def load_corpus_model():
+    """The persisted corpus TF-IDF model, shared by every session"""
+    if os.path.exists(DEFAULT_MODEL_PATH):
+        return CorpusTfidfModel.load(DEFAULT_MODEL_PATH)
+    return CorpusTfidfModel()
+
+@st.cache_resource
+def get_job_queue():
+    """Background screening jobs and parse workers, shared by every session"""
+    return JobQueue(cache_path=DEFAULT_CACHE_PATH)
+
+@st.cache_resource
+def corpus_model_lock():
+    """Serializes updates to the shared corpus model across sessions"""
+    return threading.Lock()
+
+@st.cache_data(show_spinner=False, max_entries=MATCHER_CACHE_ENTRIES)
+def preprocess_job_description(jd_text):
+    """Preprocessed job description text"""
+    return preprocess_text(jd_text)
+
+@st.cache_resource(show_spinner=False, max_entries=MATCHER_CACHE_ENTRIES)
+def get_matcher(jd_hash, model_version, _processed_jd, _model):
+    """Matcher fitted on a job description, reused while the JD and corpus model are unchanged"""
+    # Jobs score in the background while other sessions update the shared
+    # corpus model, so each matcher keeps its own copy of the model
+    matcher = ResumeMatcher(model=copy.deepcopy(_model) if _model is not None else None)
+    matcher.fit_job_description(_processed_jd)
+    return matcher
+
+def add_to_corpus_model(resumes_data):
+    """Fold a finished batch into the shared corpus model and persist it"""
+    model = load_corpus_model()
+    with corpus_model_lock():
+        # Resumes already counted leave the model unchanged
+        n_documents = model.n_documents
+        model.partial_fit([resume_data['text'] for resume_data in resumes_data])
+        if model.n_documents != n_documents:
+            model.save(DEFAULT_MODEL_PATH)
+
+def results_frame(results, start=0):
+    """Results as a DataFrame with scores formatted as percentages, indexed by rank from start"""
+    df = pd.DataFrame(results)
+    df['score'] = df['score'].apply(lambda x: f"{x*100:.2f}%")
+    df.index = range(start, start + len(df))
+    return df
+
+@st.cache_data(show_spinner="Preparing downloads...", max_entries=EXPORT_CACHE_ENTRIES)
+def export_results(job_id, version, _job):
+    """CSV and Parquet (None without pyarrow) bytes of a job's whole ranking"""
+    # Built in memory in chunks (detailed scores as their own columns); no
+    # shared file on disk for concurrent sessions to race on
+    results_table = _job.ranking()
+    csv_data = ''.join(results_table.iter_csv()).encode('utf-8')
+    try:
+        parquet_data = results_table.write_parquet(io.BytesIO()).getvalue()
+    except ImportError:
+        # Parquet export is optional (needs pyarrow)
+        parquet_data = None
+    return csv_data, parquet_data
+
+def show_results(job):
+    """Display the final ranking one page at a time, with scoring details and downloads"""
+    scored = job.snapshot(0)['scored']
+    if scored:
+        # Display detailed scores in expander
+        with st.expander("View Detailed Scoring Information"):
+            st.write("The matching score is calculated using a combination of:")
+            st.markdown("""
+            - **Cosine Similarity** (60% weight): Measures textual similarity
+            - **Euclidean Distance** (20% weight): Measures vector distance
+            - **Custom Text Similarity** (20% weight): Keyword and phrase matching
+            """)
+            st.write("Decision criteria:")
+            st.markdown("""
+            - **Fit**: Score > 50%
+            - **Potential Fit**: Score 30-50%
+            - **Not Fit**: Score < 30%
+            """)
+        
+        # Display one page as a table
+        pages = (scored + RESULTS_PAGE_SIZE - 1) // RESULTS_PAGE_SIZE
+        page = 1
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                                   key=f"results_page_{job.job_id}")
+        start = (page - 1) * RESULTS_PAGE_SIZE
+        results = job.snapshot(RESULTS_PAGE_SIZE, start)['results']
+        st.caption(f"Candidates ranked {start + 1} to {start + len(results)} of {scored}")
+        st.dataframe(results_frame(results, start), use_container_width=True)
+        
+        # Download buttons (the whole ranking)
+        csv_data, parquet_data = export_results(job.job_id, job.version, job)
+        st.download_button(
+            label="Download Results as CSV",
+            data=csv_data,
+            file_name="resume_matching_results.csv",
+            mime="text/csv"
+        )
+        if parquet_data is not None:
+            st.download_button(
+                label="Download Results as Parquet",
+                data=parquet_data,
+                file_name="resume_matching_results.parquet",
+                mime="application/vnd.apache.parquet"
+            )
+    else:
+        st.warning("No matching results found.")
+
+def show_job(job):
+    """Follow a screening job: progress and leading results while it runs, then the final ranking"""
+    st.subheader("Matching Results")
+    if not job.finished and st.button("Cancel screening"):
+        job.cancel()
+    
+    # Redraw until the job finishes; leaving the page or rerunning just stops watching
+    progress = st.empty()
+    partial = st.empty()
+    while not job.finished:
+        snapshot = job.snapshot(PARTIAL_RESULTS_SHOWN)
+        if snapshot['status'] == 'queued':
+            progress.progress(0.0, text="Waiting for other screenings to finish...")
+        else:
+            progress.progress(snapshot['processed'] / max(snapshot['total'], 1),
+                              text=f"Screened {snapshot['processed']} of {snapshot['total']} resumes")
+        if snapshot['results']:
+            partial.dataframe(results_frame(snapshot['results']), use_container_width=True)
+        time.sleep(JOB_POLL_SECONDS)
+    progress.empty()
+    partial.empty()
+    
+    snapshot = job.snapshot()
+    for failure in snapshot['errors']:
+        st.warning(f"Skipped {failure['file_name']}: {failure['error']}")
+    for warning in snapshot['warnings']:
+        st.warning(warning)
+    if snapshot['status'] == 'failed':
+        st.error(f"An error occurred: {snapshot['error']}")
+        return
+    if snapshot['status'] == 'cancelled':
+        st.warning(f"Screening cancelled after {snapshot['processed']} of {snapshot['total']} resumes.")
+    if snapshot['near_duplicates']:
+        st.info(f"{snapshot['near_duplicates']} near-duplicate resumes reused an earlier copy's scores.")
+    show_results(job)
+    show_stage_timings(snapshot)
+
+def show_stage_timings(snapshot):
+    """Where this batch spent its time, plus every batch so far in Prometheus format"""
+    if not snapshot['timings']:
+        return
+    with st.expander("View Stage Timings"):
+        st.write(f"Batch of {snapshot['total']} resumes screened in {snapshot['elapsed']:.2f}s. "
+                 "Stages nest (e.g. preprocess_text includes its tokenize and lemmatize steps), "
+                 "and parsing runs in parallel workers, so totals can exceed the elapsed time.")
+        df = pd.DataFrame(snapshot['timings']).round(3)
+        st.dataframe(df, use_container_width=True)
+        st.download_button(
+            label="Download All Timings (Prometheus)",
+            data=enable_stage_timing().to_prometheus(),
+            file_name="stage_timings.prom",
+            mime="text/plain"
+        )
 
 # Set page configuration
 st.set_page_config(
@@ -14,6 +212,10 @@ st.set_page_config(
     layout="wide"
 )
 
+# Models load once per server process, not on every rerun
+load_nlp_models()
+enable_stage_timing()
+
 # App title
 st.title("📄 Resume Screening with NLP")
 st.markdown("---")
@@ -30,91 +232,64 @@ uploaded_files = st.sidebar.file_uploader(
     accept_multiple_files=True
 )
 
+# Scoring options
+use_corpus_model = st.sidebar.checkbox(
+    "Use corpus-fitted TF-IDF model",
+    help="Score with IDF weights learned from every resume screened so far instead of the job description alone"
+)
+skip_near_duplicates = st.sidebar.checkbox(
+    "Score near-duplicate resumes once",
+    help="Copies of a resume (e.g. with only the header changed) reuse the first copy's scores instead of being scored again"
+)
+
 # Process button
-if st.sidebar.button("Process Resumes", type="primary"):
+process_clicked = st.sidebar.button("Process Resumes", type="primary")
+if process_clicked:
     if not jd_text:
         st.error("Please enter a job description.")
     elif not uploaded_files:
         st.error("Please upload at least one resume.")
     else:
-        with st.spinner("Processing resumes... This may take a moment for accurate analysis."):
-            try:
-                # Preprocess job description
-                processed_jd = preprocess_text(jd_text)
-                
-                # Parse and preprocess resumes
-                resumes_data = []
-                temp_files = []
-                
-                for uploaded_file in uploaded_files:
-                    # Create a temporary file
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        temp_file_path = tmp_file.name
-                        temp_files.append(temp_file_path)
-                    
-                    # Parse resume
-                    resume_data = parse_resume(temp_file_path)
-                    
-                    # Preprocess resume text
-                    processed_text = preprocess_text(resume_data['text'])
-                    resume_data['text'] = processed_text
-                    
-                    resumes_data.append(resume_data)
-                
-                # Match resumes with enhanced accuracy
-                matcher = ResumeMatcher()
-                matcher.fit_job_description(processed_jd)
-                results = matcher.match_resumes(resumes_data)
-                
-                # Display results
-                st.subheader("Matching Results")
-                if results:
-                    # Convert to DataFrame for better display
-                    df = pd.DataFrame(results)
-                    # Format score as percentage
-                    df['score'] = df['score'].apply(lambda x: f"{x*100:.2f}%")
-                    
-                    # Display detailed scores in expander
-                    with st.expander("View Detailed Scoring Information"):
-                        st.write("The matching score is calculated using a combination of:")
-                        st.markdown("""
-                        - **Cosine Similarity** (60% weight): Measures textual similarity
-                        - **Euclidean Distance** (20% weight): Measures vector distance
-                        - **Custom Text Similarity** (20% weight): Keyword and phrase matching
-                        """)
-                        st.write("Decision criteria:")
-                        st.markdown("""
-                        - **Fit**: Score > 50%
-                        - **Potential Fit**: Score 30-50%
-                        - **Not Fit**: Score < 30%
-                        """)
-                    
-                    # Display as table
-                    st.dataframe(df, use_container_width=True)
-                    
-                    # Save to CSV
-                    csv_filename = save_results_to_csv(results, "matching_results.csv")
-                    
-                    # Download button
-                    with open(csv_filename, "rb") as file:
-                        st.download_button(
-                            label="Download Results as CSV",
-                            data=file,
-                            file_name="resume_matching_results.csv",
-                            mime="text/csv"
-                        )
-                else:
-                    st.warning("No matching results found.")
-                
-                # Clean up temporary files
-                for temp_file in temp_files:
-                    if os.path.exists(temp_file):
-                        os.unlink(temp_file)
-                        
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
-else:
+        try:
+            # Preprocess job description
+            processed_jd = preprocess_job_description(jd_text)
+            
+            # Match resumes with enhanced accuracy; refitted only when the
+            # job description (or corpus model) changes
+            jd_hash = content_hash(jd_text.encode('utf-8'))
+            matcher, on_complete = None, None
+            if use_corpus_model:
+                # The corpus model is shared by every session. The batch is scored
+                # against the model as it stands and added to it once screened
+                model = load_corpus_model()
+                on_complete = add_to_corpus_model
+                with corpus_model_lock():
+                    if model.n_documents:
+                        matcher = get_matcher(jd_hash, model.n_documents, processed_jd, model)
+            if matcher is None:
+                # No corpus model, or one with no resumes in it yet
+                matcher = get_matcher(jd_hash, None, processed_jd, None)
+            
+            # Parse, preprocess and score in the background; resumes screened
+            # before are not parsed or preprocessed again
+            uploads = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+            near_duplicate_threshold = DEFAULT_NEAR_DUPLICATE_THRESHOLD if skip_near_duplicates else None
+            job = get_job_queue().submit(matcher, uploads, on_complete=on_complete,
+                                         near_duplicate_threshold=near_duplicate_threshold)
+            
+            # Remember the job so a rerun or page refresh reconnects to it
+            st.session_state['job_id'] = job.job_id
+            st.experimental_set_query_params(job=job.job_id)
+        except QueueFullError:
+            st.error("The server is busy with other screenings. Please try again in a moment.")
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
+
+job_id = st.session_state.get('job_id') or st.experimental_get_query_params().get('job', [None])[0]
+job = get_job_queue().get(job_id) if job_id else None
+if job is not None:
+    show_job(job)
+elif not process_clicked:
     # Show instructions
     st.info("👈 Enter a job description and upload resumes to get started!")
     
@@ -0,0 +1,98 @@
+"""
+Benchmark per-resume matching latency on a 1,000-resume batch
+"""
+import time
+from sklearn.metrics.pairwise import cosine_similarity, euclidean_distances
+from matcher import ResumeMatcher, get_decision
+from text_processor import preprocess_text, extract_skills_advanced, calculate_text_similarity
+from utils import load_sample_data, create_sample_resumes
+
+def build_batch(size=1000):
+    """Build a batch of preprocessed resumes by cycling the sample resumes"""
+    samples = create_sample_resumes()
+    processed = [preprocess_text(resume['text']) for resume in samples]
+    batch = []
+    for i in range(size):
+        sample = samples[i % len(samples)]
+        batch.append({
+            'candidate_name': f"{sample['candidate_name']} {i+1}",
+            'text': processed[i % len(samples)]
+        })
+    return batch
+
+def legacy_match_resume(matcher, resume_text):
+    """Original match_resume: re-processes the job description for every resume"""
+    resume_vector = matcher.vectorizer.transform([resume_text])
+    cosine_score = cosine_similarity(matcher.jd_vector, resume_vector)[0][0]
+    euclidean_dist = euclidean_distances(matcher.jd_vector, resume_vector)[0][0]
+    euclidean_score = 1 / (1 + euclidean_dist)
+    custom_similarity = calculate_text_similarity(matcher.jd_text, resume_text)
+    final_score = 0.6 * cosine_score + 0.2 * euclidean_score + 0.2 * custom_similarity
+    resume_skills = extract_skills_advanced(resume_text)
+    missing_skills = list(set(matcher.jd_skills) - set(resume_skills))
+    return {
+        'score': final_score,
+        'skills': resume_skills,
+        'missing_skills': missing_skills,
+        'cosine_score': cosine_score,
+        'euclidean_score': euclidean_score,
+        'custom_score': custom_similarity
+    }
+
+def time_per_resume(func, batch):
+    """Return the average seconds per resume and the scores produced"""
+    start = time.perf_counter()
+    scores = [func(resume['text'])['score'] for resume in batch]
+    elapsed = time.perf_counter() - start
+    return elapsed / len(batch), scores
+
+def legacy_match_resumes(matcher, resumes_data):
+    """Original match_resumes: one transform and two sklearn calls per resume"""
+    results = []
+    for resume_data in resumes_data:
+        match_result = legacy_match_resume(matcher, resume_data['text'])
+        results.append({
+            'candidate_name': resume_data['candidate_name'],
+            'score': match_result['score'],
+            'decision': get_decision(match_result['score'])
+        })
+    return sorted(results, key=lambda x: x['score'], reverse=True)
+
+def time_batch(func, batch):
+    """Return the average seconds per resume for a whole-batch matching function"""
+    start = time.perf_counter()
+    results = func(batch)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(batch), results
+
+def run_benchmark(size=1000):
+    """Compare legacy and precomputed job description matching"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(load_sample_data()))
+    batch = build_batch(size)
+
+    legacy_time, legacy_scores = time_per_resume(lambda text: legacy_match_resume(matcher, text), batch)
+    new_time, new_scores = time_per_resume(matcher.match_resume, batch)
+
+    same_scores = all(abs(a - b) < 1e-12 for a, b in zip(legacy_scores, new_scores))
+    print(f"Scores unchanged: {'PASS' if same_scores else 'FAIL'}")
+    print(f"Legacy match_resume:    {legacy_time * 1000:.3f} ms/resume")
+    print(f"Current match_resume:   {new_time * 1000:.3f} ms/resume")
+    print(f"Speedup:                {legacy_time / new_time:.1f}x")
+
+    legacy_batch_time, legacy_results = time_batch(lambda data: legacy_match_resumes(matcher, data), batch)
+    batch_time, batch_results = time_batch(matcher.match_resumes, batch)
+
+    same_ranking = all(a['candidate_name'] == b['candidate_name'] and abs(a['score'] - b['score']) < 1e-9
+                       for a, b in zip(legacy_results, batch_results))
+    print(f"Batch ranking unchanged: {'PASS' if same_ranking else 'FAIL'}")
+    print(f"Legacy match_resumes:   {legacy_batch_time * 1000:.3f} ms/resume")
+    print(f"Batched match_resumes:  {batch_time * 1000:.3f} ms/resume")
+    print(f"Speedup:                {legacy_batch_time / batch_time:.1f}x")
+
+    return same_scores and same_ranking
+
+if __name__ == "__main__":
+    print("Matching Benchmark (1,000 resumes)")
+    print("=" * 50)
+    run_benchmark()
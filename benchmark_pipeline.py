@@ -0,0 +1,138 @@
+"""
+Benchmark every screening stage on a synthetic resume corpus of configurable size
+"""
+import argparse
+import io
+import json
+import os
+import time
+import docx
+import numpy as np
+from cascade import CascadeMatcher
+from matcher import ResumeMatcher
+from resume_parser import parse_resume
+from text_processor import preprocess_text, extract_skills_advanced
+from utils import generate_job_description, generate_resumes
+
+# Batch stages (vectorization, match_resumes) are timed per batch of this many resumes
+BATCH_SIZE = 100
+# Building DOCX files dominates at large sizes, so extraction is timed on a sample
+EXTRACTION_SAMPLE = 500
+PERCENTILES = (50, 95, 99)
+
+def build_docx(text):
+    """DOCX bytes holding resume text, one paragraph per line"""
+    document = docx.Document()
+    for line in text.strip().split('\n'):
+        document.add_paragraph(line.strip())
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+def time_calls(func, items):
+    """Call func on every item, returning the outputs and each call's seconds"""
+    outputs = []
+    seconds = []
+    for item in items:
+        start = time.perf_counter()
+        outputs.append(func(item))
+        seconds.append(time.perf_counter() - start)
+    return outputs, seconds
+
+def summarize(seconds, resumes):
+    """Throughput and latency percentiles of one stage"""
+    total = sum(seconds)
+    summary = {'resumes': resumes, 'calls': len(seconds), 'seconds': total,
+               'throughput': resumes / total if total else float('inf')}
+    for percentile, value in zip(PERCENTILES, np.percentile(seconds, PERCENTILES)):
+        summary[f'p{percentile}'] = float(value)
+    return summary
+
+def batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def run_stages(size, seed=0, batch_size=BATCH_SIZE, extraction_sample=EXTRACTION_SAMPLE):
+    """Time each screening stage on size synthetic resumes; returns stage name -> summary"""
+    resumes = generate_resumes(size, seed=seed)
+    jd_text = generate_job_description(seed=seed)
+    stages = {}
+
+    # Text and field extraction from uploaded DOCX bytes
+    documents = [build_docx(resume['text']) for resume in resumes[:extraction_sample]]
+    _, seconds = time_calls(lambda data: parse_resume(data, file_name="resume.docx"), documents)
+    stages['extraction'] = summarize(seconds, len(documents))
+
+    raw_texts = [resume['text'] for resume in resumes]
+    processed_texts, seconds = time_calls(preprocess_text, raw_texts)
+    stages['preprocess_text'] = summarize(seconds, size)
+
+    _, seconds = time_calls(extract_skills_advanced, processed_texts)
+    stages['extract_skills'] = summarize(seconds, size)
+
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(jd_text))
+    text_batches = batches(processed_texts, batch_size)
+    _, seconds = time_calls(matcher.vectorizer.transform, text_batches)
+    stages['vectorize'] = summarize(seconds, size)
+
+    # Scoring, skill gaps and ranking from preprocessed text
+    resume_batches = batches([{'candidate_name': resume['candidate_name'], 'text': text}
+                              for resume, text in zip(resumes, processed_texts)], batch_size)
+    _, seconds = time_calls(matcher.match_resumes, resume_batches)
+    stages['match_resumes'] = summarize(seconds, size)
+    
+    # The default cascade: possible fits with enough of the job's skills, pruned before the costly stages
+    _, seconds = time_calls(CascadeMatcher(matcher).match_resumes, resume_batches)
+    stages['cascade'] = summarize(seconds, size)
+
+    return stages
+
+def print_stages(size, stages, baseline=None):
+    """Print one table row per stage, with the change in throughput against a baseline"""
+    print(f"\n{size:,} resumes")
+    print(f"{'stage':<16}{'unit':>8}{'resumes/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          + (f"{'vs baseline':>14}" if baseline else ""))
+    for name, summary in stages.items():
+        unit = 'resume' if summary['calls'] == summary['resumes'] else 'batch'
+        row = (f"{name:<16}{unit:>8}{summary['throughput']:>12,.1f}"
+               + "".join(f"{summary[f'p{p}'] * 1000:>10.2f}" for p in PERCENTILES))
+        if baseline and name in baseline:
+            change = summary['throughput'] / baseline[name]['throughput'] - 1
+            row += f"{change:>+13.1%}"
+        print(row)
+
+def run_benchmark(sizes=(100, 1000), seed=0, batch_size=BATCH_SIZE, extraction_sample=EXTRACTION_SAMPLE,
+                  baseline_path=None, save=False):
+    """Benchmark every size, optionally comparing against (or saving) a baseline JSON file"""
+    baseline = {}
+    if baseline_path and os.path.exists(baseline_path) and not save:
+        with open(baseline_path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {}
+    for size in sizes:
+        results[str(size)] = run_stages(size, seed, batch_size, extraction_sample)
+        print_stages(size, results[str(size)], baseline.get(str(size)))
+
+    if baseline_path and save:
+        with open(baseline_path, 'w', encoding='utf-8') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the screening pipeline on synthetic resumes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000],
+                        help="Corpus sizes to benchmark (e.g. 100 1000 10000 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic corpus")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Resumes per call for vectorization and match_resumes")
+    parser.add_argument("--extraction-sample", type=int, default=EXTRACTION_SAMPLE,
+                        help="Resumes built as DOCX files and timed through parse_resume")
+    parser.add_argument("--baseline", default=None, help="JSON file of earlier results to compare against")
+    parser.add_argument("--save", action="store_true", help="Write these results to --baseline instead of comparing")
+    args = parser.parse_args()
+
+    print("Screening Pipeline Benchmark")
+    print("=" * 50)
+    run_benchmark(args.sizes, args.seed, args.batch_size, args.extraction_sample, args.baseline, args.save)
@@ -0,0 +1,58 @@
+"""
+Benchmark preprocess_text against the original per-token POS tagging path
+"""
+import string
+import time
+from nltk.tokenize import word_tokenize
+import text_processor
+from text_processor import clean_text, get_wordnet_pos, lemmatizer, stop_words, preprocess_text
+from utils import create_sample_resumes
+
+def legacy_preprocess_text(text):
+    """Original pipeline: one tagger call and one lemmatizer call per token"""
+    cleaned_text = clean_text(text)
+    tokens = word_tokenize(cleaned_text)
+    tokens = [token for token in tokens if token not in stop_words and token not in string.punctuation]
+    tokens = [lemmatizer.lemmatize(token, get_wordnet_pos(token)) for token in tokens]
+    return ' '.join(tokens)
+
+def time_pipeline(func, texts, rounds):
+    """Return the average seconds per resume for a preprocessing function"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            func(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(texts))
+
+def run_benchmark(rounds=5):
+    """Compare legacy and batched preprocessing on the sample resumes"""
+    texts = [resume['text'] for resume in create_sample_resumes()]
+
+    # Output must be identical before timing means anything
+    mismatches = 0
+    for i, text in enumerate(texts):
+        if legacy_preprocess_text(text) != preprocess_text(text):
+            mismatches += 1
+            print(f"Resume {i+1}: output differs from legacy pipeline")
+    print(f"Output unchanged on sample resumes: {'PASS' if mismatches == 0 else 'FAIL'}")
+
+    legacy_time = time_pipeline(legacy_preprocess_text, texts, rounds)
+
+    # Cold cache first, then warm cache as it would be mid-batch
+    text_processor.lemmatize_cached.cache_clear()
+    cold_time = time_pipeline(preprocess_text, texts, 1)
+    warm_time = time_pipeline(preprocess_text, texts, rounds)
+
+    print(f"Legacy pipeline:        {legacy_time * 1000:.2f} ms/resume")
+    print(f"Batched (cold cache):   {cold_time * 1000:.2f} ms/resume")
+    print(f"Batched (warm cache):   {warm_time * 1000:.2f} ms/resume")
+    print(f"Speedup (warm):         {legacy_time / warm_time:.1f}x")
+    print(f"Lemma cache: {text_processor.lemmatize_cached.cache_info()}")
+
+    return mismatches == 0
+
+if __name__ == "__main__":
+    print("Preprocessing Benchmark")
+    print("=" * 50)
+    run_benchmark()
@@ -0,0 +1,81 @@
+"""
+Benchmark cold-start latency: importing text_processor, starting the app and warming up the models
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Each measurement runs in a fresh interpreter so nothing is already imported
+IMPORT_SNIPPET = "import text_processor"
+LAZY_CHECK_SNIPPET = (
+    "import sys, text_processor; "
+    "print(int('spacy' in sys.modules or 'nltk' in sys.modules or bool(text_processor._models)))"
+)
+# Importing app.py outside `streamlit run` executes the script once in bare
+# mode: every import plus the first render, which is what a new session pays
+APP_SNIPPET = "import app"
+WARMUP_SNIPPET = "import json, text_processor; print(json.dumps(text_processor.warmup()))"
+
+def time_snippet(snippet, runs):
+    """Median wall time in seconds of running a Python snippet in a new process"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], check=True, capture_output=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def run_snippet(snippet):
+    """Run a Python snippet in a new process and return its last line of output"""
+    result = subprocess.run([sys.executable, "-c", snippet], check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return result.stdout.strip().splitlines()[-1]
+
+def run_benchmark(runs=5, baseline_path=None, save=False):
+    """Time cold imports and warmup, optionally comparing against a saved baseline"""
+    lazy = run_snippet(LAZY_CHECK_SNIPPET) == "0"
+    print(f"No models loaded at import: {'PASS' if lazy else 'FAIL'}")
+
+    results = {
+        'interpreter': time_snippet("pass", runs),
+        'import_text_processor': time_snippet(IMPORT_SNIPPET, runs),
+        'app_startup': time_snippet(APP_SNIPPET, runs)
+    }
+    warmup_timings = json.loads(run_snippet(WARMUP_SNIPPET))
+    results['warmup'] = sum(warmup_timings.values())
+
+    print(f"Bare interpreter:           {results['interpreter'] * 1000:.0f} ms")
+    print(f"import text_processor:      {results['import_text_processor'] * 1000:.0f} ms")
+    print(f"App startup (first run):    {results['app_startup'] * 1000:.0f} ms")
+    print(f"warmup():                   {results['warmup'] * 1000:.0f} ms "
+          f"({', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in warmup_timings.items())})")
+
+    if baseline_path and os.path.exists(baseline_path) and not save:
+        with open(baseline_path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        print("Change against baseline:")
+        for name, seconds in results.items():
+            if name in baseline:
+                print(f"  {name}: {baseline[name] * 1000:.0f} ms -> {seconds * 1000:.0f} ms")
+    if baseline_path and save:
+        with open(baseline_path, 'w', encoding='utf-8') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+
+    return lazy
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark import and startup latency")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to take the median of")
+    parser.add_argument("--baseline", default=None, help="JSON file of earlier timings to compare against")
+    parser.add_argument("--save", action="store_true", help="Write these timings to --baseline instead of comparing")
+    args = parser.parse_args()
+
+    print("Startup Benchmark")
+    print("=" * 50)
+    run_benchmark(args.runs, args.baseline, args.save)
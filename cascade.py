@@ -0,0 +1,118 @@
+import time
+import numpy as np
+from matcher import (POTENTIAL_FIT_THRESHOLD, COSINE_WEIGHT, EUCLIDEAN_WEIGHT, CUSTOM_WEIGHT,
+                     top_k_indices)
+from match_results import MatchResults
+from skill_index import skill_bitmap, skill_count
+from stage_timing import timed, timer
+from text_processor import build_similarity_profile, extract_skills_advanced
+
+# Share of the job's skills a resume must hold to reach the custom stage. A
+# heuristic screening policy, not a bound on the score: it roughly halves the
+# profiles built for a typical pool, but can drop a resume that words its
+# skills differently from the job description
+DEFAULT_MIN_SKILL_OVERLAP = 0.2
+
+class CascadeMatcher:
+    """Rank resumes in stages, dropping candidates that cannot pass the threshold before the costly work.
+
+    1. vector: TF-IDF cosine and Euclidean scores for the whole pool (one
+       sparse product). The custom similarity is at most custom_ceiling, so
+       a resume whose score would stay at or below threshold even with that
+       custom score is pruned. With the default ceiling of 1.0 this is exact
+       (only resumes that could never be a Potential Fit are dropped), so it
+       mostly prunes off-topic resumes.
+    2. skills (skipped when min_skill_overlap is None): prune resumes holding
+       less than that fraction of the job's skills (DEFAULT_MIN_SKILL_OVERLAP
+       by default). A screening policy, not a bound on the score.
+    3. custom: similarity profiles (the expensive preprocessing) for the
+       survivors only, giving their exact final score; resumes at or below
+       threshold are pruned.
+
+    The survivors are ranked exactly as ResumeMatcher.match_resumes ranks them.
+    With min_skill_overlap=None and the default ceiling, they are exactly the
+    resumes match_resumes does not call Not Fit.
+    """
+    def __init__(self, matcher, threshold=POTENTIAL_FIT_THRESHOLD, custom_ceiling=1.0,
+                 min_skill_overlap=DEFAULT_MIN_SKILL_OVERLAP):
+        if not 0.0 <= custom_ceiling <= 1.0:
+            raise ValueError("custom_ceiling must be between 0 and 1")
+        self.matcher = matcher
+        self.threshold = threshold
+        self.custom_ceiling = custom_ceiling
+        self.min_skill_overlap = min_skill_overlap
+
+    def match_resumes(self, resumes_data, top_k=None, offset=0):
+        """Surviving candidates as match_resumes result dicts, plus the per-stage stats"""
+        results, stats = self.rank_resumes(resumes_data, top_k, offset)
+        return results.to_records(), stats
+
+    @timed('cascade')
+    def rank_resumes(self, resumes_data, top_k=None, offset=0):
+        """Surviving candidates as a MatchResults (optionally one page), plus the per-stage stats.
+
+        stats has one row per stage run: candidates entering it, how many it
+        pruned and kept, and its seconds.
+        """
+        stats = []
+        if not resumes_data:
+            return MatchResults([], [], [], [], [], [], [], []), stats
+        survivors = np.arange(len(resumes_data))
+
+        def stage(name, start, keep):
+            nonlocal survivors
+            stats.append({'stage': name, 'candidates': len(survivors), 'pruned': int(len(keep) - keep.sum()),
+                          'kept': int(keep.sum()), 'seconds': time.perf_counter() - start})
+            survivors = survivors[keep]
+            return keep
+
+        # Stage 1: vector scores bound the final score from above
+        start = time.perf_counter()
+        with timer('cascade.vector'):
+            scores = self.matcher.vector_scores([resume_data['text'] for resume_data in resumes_data])
+            bound = (COSINE_WEIGHT * scores['cosine_score'] + EUCLIDEAN_WEIGHT * scores['euclidean_score']
+                     + CUSTOM_WEIGHT * self.custom_ceiling)
+        keep = stage('vector', start, bound > self.threshold)
+        scores = {name: values[keep] for name, values in scores.items()}
+
+        # Stage 2 (optional): share of the job's skills each resume holds,
+        # counted on the skill bitmaps
+        skills = {}
+        if self.min_skill_overlap is not None:
+            start = time.perf_counter()
+            with timer('cascade.skills'):
+                jd_bitmap = self.matcher.jd_skill_bitmap
+                jd_count = skill_count(jd_bitmap)
+                overlap = np.ones(len(survivors))
+                for row, i in enumerate(survivors):
+                    resume_data = resumes_data[i]
+                    bitmap = resume_data.get('skill_bitmap')
+                    if bitmap is None:
+                        if 'skills' in resume_data:
+                            bitmap = skill_bitmap(resume_data['skills'])
+                        else:
+                            skills[i] = extract_skills_advanced(resume_data['text'])
+                            bitmap = skill_bitmap(skills[i])
+                    if jd_count:
+                        overlap[row] = skill_count(jd_bitmap & bitmap) / jd_count
+            keep = stage('skills', start, overlap >= self.min_skill_overlap)
+            scores = {name: values[keep] for name, values in scores.items()}
+
+        # Stage 3: the exact final score for what is left
+        start = time.perf_counter()
+        with timer('cascade.custom'):
+            profiles = [resumes_data[i]['similarity_profile'] if 'similarity_profile' in resumes_data[i]
+                        else build_similarity_profile(resumes_data[i]['text']) for i in survivors]
+            scores['custom_score'] = self.matcher.custom_scores(profiles)
+            scores['score'] = (COSINE_WEIGHT * scores['cosine_score'] + EUCLIDEAN_WEIGHT * scores['euclidean_score']
+                               + CUSTOM_WEIGHT * scores['custom_score'])
+        keep = stage('custom', start, scores['score'] > self.threshold)
+        scores = {name: values[keep] for name, values in scores.items()}
+
+        # Rank the survivors; skills found in stage 2 are not extracted again
+        survivor_data = [dict(resumes_data[i], skills=skills[i]) if i in skills else resumes_data[i]
+                         for i in survivors]
+        if top_k == 0 or offset >= len(survivor_data):
+            return MatchResults([], [], [], [], [], [], [], []), stats
+        order = top_k_indices(scores['score'], None if top_k is None else offset + top_k)[offset:]
+        return self.matcher.ranked_results(survivor_data, scores, order), stats
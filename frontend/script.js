@@ -155,7 +155,7 @@ function addPrivacyNotice() {
             <i class="fas fa-lock"></i>
             <div>
                 <h4>Privacy Notice</h4>
-                <p>All processing happens locally in your browser. No data is sent to any server or stored externally.</p>
+                <p>Resumes are only sent to the screening server you run yourself. Nothing is sent to third parties or stored beyond a local parse cache.</p>
             </div>
         </div>
     `;
@@ -227,7 +227,14 @@ function updateFileList() {
     });
 }
 
-// Process resumes (simulated)
+// Base URL of the screening API (same origin when served by api_server.py)
+const API_BASE_URL = window.RESUME_API_BASE_URL || '';
+
+// Best results shown while a job runs, and results fetched per request once it is done
+const EVENT_RESULTS_TOP_K = 50;
+const RANKING_PAGE_SIZE = 500;
+
+// Process resumes with the screening API
 function processResumes() {
     const jobDesc = jobDescription.value.trim();
     
@@ -243,112 +250,185 @@ function processResumes() {
     
     // Show progress
     uploadProgress.style.display = 'block';
-    simulateProcessing();
+    processBtn.disabled = true;
+    submitScreening(jobDesc);
 }
 
-// Simulate processing with progress bar
-function simulateProcessing() {
-    let progress = 0;
-    const interval = setInterval(() => {
-        progress += Math.random() * 10;
-        if (progress >= 100) {
-            progress = 100;
-            clearInterval(interval);
-            
-            // Show results after a short delay
-            setTimeout(() => {
-                showResults();
-                uploadProgress.style.display = 'none';
-                showToast('Resumes processed successfully!', 'success');
-            }, 500);
-        }
-        
-        progressFill.style.width = `${progress}%`;
-        progressText.textContent = `${Math.round(progress)}%`;
-    }, 100);
+// Update the progress bar
+function setProgress(progress, label) {
+    progressFill.style.width = `${progress}%`;
+    progressText.textContent = label || `${Math.round(progress)}%`;
 }
 
-// Show results
-function showResults() {
-    // Generate results based only on uploaded files (no personal data)
-    currentResults = generateResultsFromFiles();
-    filteredResults = [...currentResults];
-    currentPageIndex = 1;
+// Screening job currently running on the server, its event stream, and the job whose results are shown
+let activeJobId = null;
+let jobEvents = null;
+let resultsJobId = null;
+
+// Queue the job description and resumes as a background screening job
+function submitScreening(jobDesc) {
+    const formData = new FormData();
+    formData.append('job_description', jobDesc);
+    uploadedFiles.forEach(file => formData.append('resumes', file, file.name));
+    
+    // XMLHttpRequest (unlike fetch) reports upload progress
+    const request = new XMLHttpRequest();
+    request.open('POST', `${API_BASE_URL}/api/jobs`);
+    request.responseType = 'json';
+    
+    request.upload.addEventListener('progress', (e) => {
+        if (e.lengthComputable) {
+            // Uploading is the first 30%; parsing and scoring the rest
+            setProgress((e.loaded / e.total) * 30);
+        }
+    });
+    request.upload.addEventListener('load', () => {
+        setProgress(30, 'Queued...');
+    });
     
-    renderResults();
-    renderCharts();
-    resultsSection.style.display = 'block';
+    request.addEventListener('load', () => {
+        const response = request.response || {};
+        if (request.status === 503) {
+            finishProcessing();
+            const wait = request.getResponseHeader('Retry-After') || 'a few';
+            showToast(`The server is busy with other screenings. Try again in ${escapeHtml(wait)} seconds.`, 'warning');
+            return;
+        }
+        if (request.status !== 202) {
+            finishProcessing();
+            showToast(`Screening failed: ${escapeHtml(response.error || request.statusText)}`, 'error');
+            return;
+        }
+        watchJob(response.job_id);
+    });
     
-    // Scroll to results
-    resultsSection.scrollIntoView({ behavior: 'smooth' });
+    request.addEventListener('error', () => {
+        finishProcessing();
+        showToast('Could not reach the screening server. Start it with: python frontend/server.py', 'error');
+    });
+    
+    setProgress(0);
+    request.send(formData);
 }
 
-// Generate results based only on uploaded files
-function generateResultsFromFiles() {
-    return uploadedFiles.map((file, index) => {
-        // Generate random but realistic scores
-        const score = 0.5 + (Math.random() * 0.5); // Between 0.5 and 1.0
-        
-        // Generate skills based on file name
-        const skills = generateSkillsFromFile(file.name);
-        const missingSkills = generateMissingSkills(score);
-        const decision = score > 0.7 ? "Fit" : "Not Fit";
+// Follow a job's progress over server-sent events, showing partial results as they arrive
+function watchJob(jobId) {
+    activeJobId = jobId;
+    jobEvents = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/events?top_k=${EVENT_RESULTS_TOP_K}`);
+    
+    jobEvents.addEventListener('progress', (e) => {
+        const job = JSON.parse(e.data);
+        if (job.total > 0) {
+            setProgress(30 + (job.processed / job.total) * 70,
+                        job.status === 'queued' ? 'Queued...' : `Screened ${job.processed} of ${job.total}`);
+        }
+        if (job.results.length > 0) {
+            showPartialResults(job.results);
+        }
+    });
+    
+    jobEvents.addEventListener('done', (e) => {
+        stopWatching();
+        const job = JSON.parse(e.data);
+        setProgress(100);
+        job.errors.forEach(failure => {
+            showToast(`Skipped ${escapeHtml(failure.file_name)}: ${escapeHtml(failure.error)}`, 'warning');
+        });
         
-        return {
-            candidate_name: `Candidate ${index + 1}`,
-            score: score,
-            skills: skills,
-            missing_skills: missingSkills,
-            decision: decision
-        };
+        setTimeout(() => {
+            finishProcessing();
+            if (job.status === 'cancelled') {
+                showToast('Screening cancelled', 'warning');
+                return;
+            }
+            if (job.status === 'failed') {
+                showToast(`Screening failed: ${escapeHtml(job.error)}`, 'error');
+                return;
+            }
+            if (job.results.length === 0) {
+                showToast('No resumes could be read', 'error');
+                return;
+            }
+            // Events only carry the best results; page through the full ranking once
+            loadRanking(job.job_id).then(results => {
+                resultsJobId = job.job_id;
+                showResults(results);
+                showToast('Resumes processed successfully!', 'success');
+            }).catch(error => {
+                showToast(`Could not load the results: ${escapeHtml(error.message)}`, 'error');
+            });
+        }, 300);
+    });
+    
+    jobEvents.addEventListener('error', () => {
+        // EventSource reconnects on its own; give up only once the stream is closed
+        if (jobEvents && jobEvents.readyState === EventSource.CLOSED) {
+            stopWatching();
+            finishProcessing();
+            showToast('Lost the connection to the screening server', 'error');
+        }
     });
 }
 
-// Generate skills based on file name
-function generateSkillsFromFile(filename) {
-    const skillsPool = [
-        "Python", "Java", "JavaScript", "SQL", "HTML/CSS", 
-        "React", "Angular", "Node.js", "Django", "Flask",
-        "Machine Learning", "Data Analysis", "Statistics",
-        "Project Management", "Communication", "Teamwork",
-        "AWS", "Docker", "Kubernetes", "Git", "Linux"
-    ];
-    
-    // Select random skills
-    const numSkills = 3 + Math.floor(Math.random() * 5);
-    const selectedSkills = [];
-    
-    for (let i = 0; i < numSkills; i++) {
-        const randomIndex = Math.floor(Math.random() * skillsPool.length);
-        if (!selectedSkills.includes(skillsPool[randomIndex])) {
-            selectedSkills.push(skillsPool[randomIndex]);
+// Fetch a finished job's whole ranking, one page at a time
+async function loadRanking(jobId) {
+    const results = [];
+    while (true) {
+        const response = await fetch(`${API_BASE_URL}/api/jobs/${jobId}?top_k=${RANKING_PAGE_SIZE}&offset=${results.length}`);
+        if (!response.ok) {
+            throw new Error(response.statusText);
+        }
+        const page = (await response.json()).results;
+        results.push(...page);
+        if (page.length < RANKING_PAGE_SIZE) {
+            return results;
         }
     }
-    
-    return selectedSkills.join(", ");
 }
 
-// Generate missing skills based on score
-function generateMissingSkills(score) {
-    if (score > 0.8) return ""; // High scorers have no missing skills
-    
-    const missingSkillsPool = [
-        "Deep Learning", "PyTorch", "TensorFlow", 
-        "Cloud Architecture", "DevOps", "Cybersecurity",
-        "Agile Methodologies", "Leadership", "Public Speaking"
-    ];
-    
-    const numMissing = Math.floor(Math.random() * 4);
-    const selectedMissing = [];
-    
-    for (let i = 0; i < numMissing; i++) {
-        const randomIndex = Math.floor(Math.random() * missingSkillsPool.length);
-        if (!selectedMissing.includes(missingSkillsPool[randomIndex])) {
-            selectedMissing.push(missingSkillsPool[randomIndex]);
-        }
+// Stop following the active job
+function stopWatching() {
+    if (jobEvents) {
+        jobEvents.close();
+        jobEvents = null;
+    }
+    activeJobId = null;
+}
+
+// Cancel the active job on the server
+function cancelScreening() {
+    if (activeJobId) {
+        fetch(`${API_BASE_URL}/api/jobs/${activeJobId}`, { method: 'DELETE' });
+        stopWatching();
+        finishProcessing();
     }
+}
+
+// Hide the progress bar and re-enable processing
+function finishProcessing() {
+    uploadProgress.style.display = 'none';
+    processBtn.disabled = false;
+}
+
+// Show the ranking so far while a job is still running (charts wait for the final results)
+function showPartialResults(results) {
+    currentResults = results;
+    filterResults();
+    resultsSection.style.display = 'block';
+}
+
+// Show results
+function showResults(results) {
+    currentResults = results;
+    filteredResults = [...currentResults];
+    currentPageIndex = 1;
     
-    return selectedMissing.join(", ");
+    renderResults();
+    renderCharts();
+    resultsSection.style.display = 'block';
+    
+    // Scroll to results
+    resultsSection.scrollIntoView({ behavior: 'smooth' });
 }
 
 // Render charts
@@ -473,20 +553,23 @@ function renderCharts() {
     // Decision Chart
     const decisionCtx = decisionChartCanvas.getContext('2d');
     const fitCount = currentResults.filter(result => result.decision === 'Fit').length;
+    const potentialFitCount = currentResults.filter(result => result.decision === 'Potential Fit').length;
     const notFitCount = currentResults.filter(result => result.decision === 'Not Fit').length;
     
     decisionChart = new Chart(decisionCtx, {
         type: 'doughnut',
         data: {
-            labels: ['Fit Candidates', 'Not Fit Candidates'],
+            labels: ['Fit Candidates', 'Potential Fit Candidates', 'Not Fit Candidates'],
             datasets: [{
-                data: [fitCount, notFitCount],
+                data: [fitCount, potentialFitCount, notFitCount],
                 backgroundColor: [
                     'rgba(74, 194, 154, 0.7)',
+                    'rgba(250, 204, 21, 0.7)',
                     'rgba(248, 113, 113, 0.7)'
                 ],
                 borderColor: [
                     'rgba(74, 194, 154, 1)',
+                    'rgba(250, 204, 21, 1)',
                     'rgba(248, 113, 113, 1)'
                 ],
                 borderWidth: 1
@@ -498,7 +581,7 @@ function renderCharts() {
             plugins: {
                 title: {
                     display: true,
-                    text: 'Fit vs Not Fit Candidates',
+                    text: 'Fit vs Potential Fit vs Not Fit Candidates',
                     font: {
                         size: 16
                     }
@@ -535,10 +618,10 @@ function renderResults() {
     pageResults.forEach(result => {
         const row = document.createElement('tr');
         row.innerHTML = `
-            <td>${result.candidate_name}</td>
+            <td>${escapeHtml(result.candidate_name)}</td>
             <td class="score-cell">${(result.score * 100).toFixed(1)}%</td>
-            <td>${result.skills}</td>
-            <td>${result.missing_skills || 'None'}</td>
+            <td>${escapeHtml(result.skills)}</td>
+            <td>${escapeHtml(result.missing_skills) || 'None'}</td>
             <td class="${result.decision.toLowerCase().replace(' ', '-')}">${result.decision}</td>
         `;
         resultsBody.appendChild(row);
@@ -574,7 +657,7 @@ function filterResults() {
                              result.missing_skills.toLowerCase().includes(searchTerm);
         
         const matchesFilter = filterValue === 'all' || 
-                             result.decision.toLowerCase() === filterValue;
+                             result.decision.toLowerCase().replace(' ', '-') === filterValue;
         
         return matchesSearch && matchesFilter;
     });
@@ -585,6 +668,8 @@ function filterResults() {
 
 // Reset form
 function resetForm() {
+    cancelScreening();
+    resultsJobId = null;
     jobDescription.value = '';
     charCount.textContent = '0';
     uploadedFiles = [];
@@ -595,20 +680,27 @@ function resetForm() {
     showToast('Form reset successfully', 'success');
 }
 
-// Export results (simulated)
+// Export results: the server streams the job's full ranking as CSV
 function exportResults() {
-    if (currentResults.length === 0) {
+    if (currentResults.length === 0 || !resultsJobId) {
         showToast('No results to export', 'error');
         return;
     }
     
-    // Simulate CSV download
-    showToast('Exporting results... This is a simulation.', 'warning');
-    
-    // In a real application, you would generate and download a CSV file
-    setTimeout(() => {
-        showToast('Results exported successfully! (Simulated)', 'success');
-    }, 1500);
+    const link = document.createElement('a');
+    link.href = `${API_BASE_URL}/api/jobs/${resultsJobId}/export?format=csv`;
+    link.download = 'resume_matching_results.csv';
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    showToast('Exporting results...', 'success');
+}
+
+// Escape text extracted from resumes before inserting it as HTML
+function escapeHtml(text) {
+    const element = document.createElement('div');
+    element.textContent = text || '';
+    return element.innerHTML;
 }
 
 // Show toast notification
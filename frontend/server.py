@@ -1,38 +1,27 @@
 """
-Simple HTTP server to serve the frontend files
+Serve the frontend files together with the resume screening API
 """
-import http.server
-import socketserver
 import os
+import sys
 import webbrowser
 import threading
 import time
 
+# The API lives in the project root, next to the NLP modules it uses
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from api_server import run_server
+
 # Set the port for the server
 PORT = 8001  # Changed from 8000 to 8001
 
-# Change to the frontend directory
-frontend_dir = os.path.join(os.path.dirname(__file__))
-os.chdir(frontend_dir)
-
-# Create handler to serve files
-Handler = http.server.SimpleHTTPRequestHandler
-
-# Create server
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    print(f"Serving frontend at http://localhost:{PORT}")
-    
+if __name__ == "__main__":
     # Open browser in a separate thread after a short delay
     def open_browser():
         time.sleep(2)
         webbrowser.open(f"http://localhost:{PORT}")
     
-    threading.Thread(target=open_browser).start()
+    threading.Thread(target=open_browser, daemon=True).start()
     
-    try:
-        print(f"Server running at http://localhost:{PORT}/")
-        print("Press Ctrl+C to stop the server")
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down server...")
-        httpd.shutdown()
\ No newline at end of file
+    print(f"Server running at http://localhost:{PORT}/")
+    print("Press Ctrl+C to stop the server")
+    run_server(PORT)
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from matcher import ResumeMatcher, get_decision
+from near_duplicates import NearDuplicateIndex, minhash_signature, DEFAULT_NEAR_DUPLICATE_THRESHOLD
+from resume_parser import iter_parse_resumes
+from text_processor import preprocess_text
+
+# Resume formats the parser understands
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+def _is_resume(name):
+    """Check whether a file or archive member name is a supported resume"""
+    return name.lower().endswith(RESUME_EXTENSIONS) and not os.path.basename(name).startswith('.')
+
+def _extract_member(stream, name, tmp_dir, counter):
+    """Copy one archive member to its own temporary file"""
+    extension = os.path.splitext(name)[1].lower()
+    tmp_path = os.path.join(tmp_dir, f"{counter}{extension}")
+    with open(tmp_path, 'wb') as tmp_file:
+        shutil.copyfileobj(stream, tmp_file)
+    return tmp_path
+
+def _iter_directory(directory):
+    """Lazily walk a directory tree without listing whole directories in memory"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_directory(entry.path)
+            elif entry.is_file() and _is_resume(entry.name):
+                yield entry.path
+
+def iter_resume_sources(source, tmp_dir):
+    """Yield (name, file_path, is_temporary) for every resume in a directory, zip or tar archive.
+
+    Archive members are extracted one at a time into tmp_dir as they are
+    requested, so only the members still being processed exist on disk.
+    Directories and tar archives are read incrementally; a zip archive's
+    central directory (a few hundred bytes per member) is read up front, so
+    prefer tar for very large batches.
+    """
+    if os.path.isdir(source):
+        for path in _iter_directory(source):
+            yield os.path.relpath(path, source), path, False
+    elif _is_resume(source):
+        # Checked before archives: a DOCX file is itself a zip archive
+        yield os.path.basename(source), source, False
+    elif tarfile.is_tarfile(source):
+        # Checked before zip: an uncompressed tar of DOCX files ends with a
+        # DOCX member's zip directory, which zipfile.is_zipfile accepts
+        # Stream mode reads members sequentially without loading the index
+        with tarfile.open(source, 'r|*') as archive:
+            for counter, member in enumerate(archive):
+                if member.isfile() and _is_resume(member.name):
+                    stream = archive.extractfile(member)
+                    yield member.name, _extract_member(stream, member.name, tmp_dir, counter), True
+                # TarFile remembers every member it has read; a stream never
+                # goes back, so drop them to keep memory flat
+                archive.members = []
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for counter, info in enumerate(archive.infolist()):
+                if not info.is_dir() and _is_resume(info.filename):
+                    with archive.open(info) as stream:
+                        yield info.filename, _extract_member(stream, info.filename, tmp_dir, counter), True
+    else:
+        raise ValueError(f"Unsupported source: {source}. Use a directory, zip/tar archive, PDF or DOCX file.")
+
+def screen_stream(source, matcher, in_flight=16, workers=None, cache_path=None,
+                  near_duplicate_threshold=None, report=None):
+    """Parse, preprocess and score resumes from a source one record at a time.
+
+    matcher must already be fitted on a (preprocessed) job description. At most
+    in_flight resumes are being parsed at once and each record is yielded as
+    soon as it is scored, so memory stays flat however large the source is.
+    Records come back in source order; files that fail carry an 'error'.
+
+    With near_duplicate_threshold (e.g. DEFAULT_NEAR_DUPLICATE_THRESHOLD), a
+    resume whose preprocessed text is a near-duplicate (estimated Jaccard
+    similarity of word shingles at least the threshold) of one scored earlier
+    reuses that score instead of being scored again, and names it in
+    'duplicate_of'. This is off by default: it keeps a signature and a result
+    (about 3 KiB) for every distinct resume, so memory then grows with the
+    number of distinct resumes instead of staying flat. If report is a dict,
+    it is kept up to date with the counts of screened, failed, scored and
+    near-duplicate resumes.
+    """
+    if report is None:
+        report = {}
+    report.update(screened=0, failed=0, scored=0, near_duplicates=0)
+    duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold is not None else None
+    scored = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sources = {}
+
+        def paths():
+            for name, path, is_temporary in iter_resume_sources(source, tmp_dir):
+                sources[path] = (name, is_temporary)
+                yield path
+
+        for parse_result in iter_parse_resumes(paths(), workers=workers, in_flight=in_flight,
+                                               preprocess=True, cache_path=cache_path):
+            name, is_temporary = sources.pop(parse_result['file_path'])
+            if is_temporary:
+                os.remove(parse_result['file_path'])
+
+            report['screened'] += 1
+            if parse_result['error']:
+                report['failed'] += 1
+                yield {'file_name': name, 'error': parse_result['error']}
+                continue
+
+            # Copies of a resume scored before share its result
+            resume_data = parse_result['resume']
+            representative = name
+            if duplicates is not None:
+                representative = duplicates.add(name, minhash_signature(resume_data['processed_text']))
+            if representative in scored:
+                match_result = scored[representative]
+                report['near_duplicates'] += 1
+            else:
+                match_result = matcher.match_resume(resume_data['processed_text'])
+                report['scored'] += 1
+                if duplicates is not None:
+                    scored[name] = {'score': match_result['score'], 'skills': match_result['skills'],
+                                    'missing_skills': match_result['missing_skills']}
+            yield {
+                'file_name': name,
+                'candidate_name': resume_data['candidate_name'],
+                'email': resume_data['contact_info']['email'],
+                'phone': resume_data['contact_info']['phone'],
+                'experience_years': resume_data['experience_years'],
+                'extraction_seconds': resume_data['extraction']['seconds'],
+                'score': match_result['score'],
+                'skills': ', '.join(match_result['skills']),
+                'missing_skills': ', '.join(match_result['missing_skills']),
+                'decision': get_decision(match_result['score']),
+                'duplicate_of': representative if representative != name else '',
+                'error': None
+            }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Screen a directory or archive of resumes against a job description")
+    parser.add_argument("source", help="Directory, zip or tar archive of PDF/DOCX resumes")
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("--output", default="screening_results.csv", help="CSV file to write records to")
+    parser.add_argument("--in-flight", type=int, default=16, help="Maximum resumes being parsed at once")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--near-duplicate-threshold", type=float, nargs='?', const=DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+                        default=None, help="Reuse an earlier copy's score for resumes at least this similar "
+                                           f"(Jaccard, {DEFAULT_NEAR_DUPLICATE_THRESHOLD} if no value is given); "
+                                           "memory then grows with the number of distinct resumes")
+    args = parser.parse_args()
+
+    with open(args.job_description, encoding='utf-8') as jd_file:
+        jd_matcher = ResumeMatcher()
+        jd_matcher.fit_job_description(preprocess_text(jd_file.read()))
+
+    fields = ['file_name', 'candidate_name', 'email', 'phone', 'experience_years', 'extraction_seconds',
+              'score', 'skills', 'missing_skills', 'decision', 'duplicate_of', 'error']
+    report = {}
+    with open(args.output, 'w', newline='', encoding='utf-8') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=fields)
+        writer.writeheader()
+        # Records are written as they arrive; nothing is collected in memory
+        for record in screen_stream(args.source, jd_matcher, in_flight=args.in_flight, workers=args.workers,
+                                    near_duplicate_threshold=args.near_duplicate_threshold, report=report):
+            writer.writerow(record)
+
+    print(f"Screened {report['screened']} resumes ({report['failed']} failed). Results written to {args.output}")
+    if report['near_duplicates']:
+        avoided = report['near_duplicates'] / (report['scored'] + report['near_duplicates'])
+        print(f"{report['near_duplicates']} near-duplicates reused an earlier copy's score: "
+              f"{report['scored']} resumes scored, {avoided:.0%} of scoring avoided")
@@ -0,0 +1,380 @@
+import hashlib
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import numpy as np
+import stage_timing
+from match_results import MatchResults, EXPORT_CHUNK_ROWS
+from matcher import get_decisions, top_k_indices
+from near_duplicates import NearDuplicateIndex, minhash_signature
+from resume_parser import create_parse_pool, iter_parse_resumes
+
+# Jobs that may wait for a runner before submit() pushes back
+DEFAULT_MAX_QUEUED = 8
+# Jobs screened at the same time
+DEFAULT_JOB_WORKERS = 2
+# Resumes being parsed at once by one job
+DEFAULT_IN_FLIGHT = 16
+# Parsed resumes scored together between progress updates
+SCORE_CHUNK_SIZE = 8
+# Finished jobs kept for clients to collect, and processed resumes kept by content
+FINISHED_JOBS_KEPT = 100
+PROCESSED_RESUMES_KEPT = 5000
+
+JOB_STATUSES = ('queued', 'running', 'done', 'cancelled', 'failed')
+FINISHED_STATUSES = ('done', 'cancelled', 'failed')
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit when every queue slot is taken"""
+
+def extraction_warning(file_name, resume_data):
+    """Message for a resume whose text was cut short by the PDF extraction limits, else None"""
+    extraction = resume_data['extraction']
+    if extraction['timed_out'] or extraction['truncated']:
+        return (f"Only part of {file_name} was read ({extraction['pages']} of "
+                f"{extraction['total_pages']} pages in {extraction['seconds']:.1f}s)")
+    return None
+
+class ScreeningJob:
+    """One screening run: progress counts and a ranking that grows as resumes are scored"""
+    def __init__(self, matcher, uploads, on_complete=None, near_duplicate_threshold=None):
+        self.job_id = uuid.uuid4().hex
+        self.matcher = matcher
+        self.uploads = list(uploads)
+        self.on_complete = on_complete
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.status = 'queued'
+        self.total = len(self.uploads)
+        self.processed = 0
+        # Scored resumes by upload index as (resume_data, scores, i), with
+        # their final scores; the ranking is only ordered (and result rows
+        # built) for the part of it a snapshot asks for
+        self._entries = [None] * self.total
+        self._scores = np.zeros(self.total)
+        self._scored = np.zeros(self.total, dtype=bool)
+        self._scored_count = 0
+        # Ranked resumes that reused a near-duplicate's scores instead of being scored
+        self.near_duplicates = 0
+        self.errors = []
+        self.warnings = []
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Bumped on every change so watchers can tell when to send an update
+        self.version = 0
+        # Per-stage timings of this job, parse workers included
+        self.timings = stage_timing.HistogramSink()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; a running job stops after the resume it is on"""
+        self._cancelled.set()
+
+    def _update(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+
+    def _add_results(self, entries, input_indices, processed, near_duplicates=0):
+        """Record newly ranked (resume_data, scores, i) entries under their upload indices"""
+        indices = np.asarray(input_indices, dtype=int)
+        with self._lock:
+            for entry, index in zip(entries, input_indices):
+                self._entries[index] = entry
+            self._scores[indices] = [scores['score'][i] for _, scores, i in entries]
+            self._scored[indices] = True
+            self._scored_count += len(indices)
+            self.near_duplicates += near_duplicates
+            self.processed = processed
+            self.version += 1
+
+    def _ranked_positions(self):
+        """Upload indices of the scored resumes and their scores (call with the lock held)"""
+        positions = np.flatnonzero(self._scored)
+        return positions, self._scores[positions]
+
+    def _ranked_entries(self, positions, scores, top_k=None, offset=0):
+        """Entries ranked offset to offset + top_k (score descending, ties in upload order)"""
+        order = top_k_indices(scores, None if top_k is None else offset + top_k)[offset:]
+        return [self._entries[position] for position in positions[order]]
+
+    def _add_error(self, file_name, error, processed):
+        with self._lock:
+            self.errors.append({'file_name': file_name, 'error': error})
+            self.processed = processed
+            self.version += 1
+
+    def _add_warning(self, message):
+        with self._lock:
+            self.warnings.append(message)
+            self.version += 1
+
+    def snapshot(self, top_k=None, offset=0):
+        """Consistent copy of the job's state with the results ranked offset to offset + top_k"""
+        with self._lock:
+            positions, scores = self._ranked_positions()
+            end = self.finished_at or time.time()
+            snapshot = {
+                'job_id': self.job_id,
+                'status': self.status,
+                'total': self.total,
+                'processed': self.processed,
+                'scored': self._scored_count,
+                'near_duplicates': self.near_duplicates,
+                'failed': len(self.errors),
+                'offset': offset,
+                'errors': list(self.errors),
+                'warnings': list(self.warnings),
+                'error': self.error,
+                'elapsed': end - (self.started_at or end),
+                'timings': self.timings.summary(),
+                'version': self.version
+            }
+        # Ordering and rows happen outside the lock so scoring is not held up by them
+        snapshot['results'] = [self.matcher.result_row(*entry)
+                               for entry in self._ranked_entries(positions, scores, top_k, offset)]
+        return snapshot
+
+    def ranking(self):
+        """The whole ranking so far as a columnar MatchResults, without a dict per candidate"""
+        with self._lock:
+            positions, scores = self._ranked_positions()
+        return self._ranking_columns(self._ranked_entries(positions, scores))
+
+    def iter_ranking(self, page_rows=EXPORT_CHUNK_ROWS):
+        """The ranking so far as MatchResults pages of page_rows rows (at least one page, maybe empty).
+
+        The order is fixed when iteration starts, so the pages fit together
+        even while the job is still scoring; each page's columns are only
+        built when it is requested.
+        """
+        with self._lock:
+            positions, scores = self._ranked_positions()
+        ranked = self._ranked_entries(positions, scores)
+        for start in range(0, max(len(ranked), 1), page_rows):
+            yield self._ranking_columns(ranked[start:start + page_rows])
+
+    def _ranking_columns(self, ranked):
+        """MatchResults for a list of ranked (resume_data, scores, i) entries"""
+        if not ranked:
+            return MatchResults([], [], [], [], [], [], [], [])
+
+        skills, missing_skills = zip(*(self.matcher.skill_gap(resume_data) for resume_data, _, _ in ranked))
+        columns = {name: np.array([scores[name][i] for _, scores, i in ranked])
+                   for name in ('score', 'cosine_score', 'euclidean_score', 'custom_score')}
+        return MatchResults(
+            candidate_name=[resume_data['candidate_name'] for resume_data, _, _ in ranked],
+            skills=skills,
+            missing_skills=missing_skills,
+            decision=get_decisions(columns['score']),
+            **columns
+        )
+
+class JobQueue:
+    """Bounded queue of screening jobs run in the background by a small pool of runners.
+
+    submit() returns immediately with a ScreeningJob whose snapshot() shows
+    progress and the partial ranking; when max_queued jobs are already waiting
+    it raises QueueFullError instead of queueing more work (backpressure).
+    Resumes are parsed, preprocessed and featurized by one shared process pool
+    and processed resumes are kept by content hash, so re-screening the same
+    files (e.g. against an edited job description) only re-runs scoring.
+    """
+    def __init__(self, max_queued=DEFAULT_MAX_QUEUED, job_workers=DEFAULT_JOB_WORKERS,
+                 parse_workers=None, in_flight=DEFAULT_IN_FLIGHT, cache_path=None):
+        self.max_queued = max_queued
+        self.in_flight = in_flight
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._processed = OrderedDict()
+        self._processed_lock = threading.Lock()
+        self._running = 0
+        self._parse_pool = create_parse_pool(parse_workers, features=True, cache_path=cache_path, timings=True)
+        self._runners = [threading.Thread(target=self._run_jobs, daemon=True) for _ in range(job_workers)]
+        for runner in self._runners:
+            runner.start()
+
+    def submit(self, matcher, uploads, on_complete=None, near_duplicate_threshold=None):
+        """Queue a job scoring (file_name, data) uploads with a fitted ResumeMatcher.
+
+        on_complete, if given, is called with the list of processed resumes
+        once the job is done (e.g. to add them to a corpus model). With
+        near_duplicate_threshold, a resume that is a near-duplicate of one
+        earlier in the job (see near_duplicates.py) reuses its scores instead
+        of being scored; it still ranks under its own name and skills.
+        """
+        job = ScreeningJob(matcher, uploads, on_complete, near_duplicate_threshold)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise QueueFullError(f"{self.max_queued} screening jobs are already waiting; try again shortly")
+        with self._jobs_lock:
+            self._jobs[job.job_id] = job
+            self._forget_finished_jobs()
+        return job
+
+    def get(self, job_id):
+        """The job with this id, or None if it is unknown or was forgotten"""
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns False if there is no such job"""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def stats(self):
+        """Queue depth and runner usage"""
+        return {'queued': self._queue.qsize(), 'max_queued': self.max_queued,
+                'running': self._running, 'job_workers': len(self._runners)}
+
+    def shutdown(self):
+        """Cancel every job and stop the runners and parse workers"""
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                job.cancel()
+        for _ in self._runners:
+            self._queue.put(None)
+        for runner in self._runners:
+            runner.join()
+        self._parse_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _forget_finished_jobs(self):
+        """Drop the oldest finished jobs beyond FINISHED_JOBS_KEPT"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self._jobs[job_id]
+
+    def _run_jobs(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.cancelled:
+                job._update(status='cancelled', finished_at=time.time(), uploads=[])
+                continue
+            with self._jobs_lock:
+                self._running += 1
+            try:
+                with stage_timing.collect() as timings:
+                    job.timings = timings
+                    self._run(job)
+            except Exception as e:
+                job._update(status='failed', error=f"{type(e).__name__}: {e}", finished_at=time.time())
+            finally:
+                with self._jobs_lock:
+                    self._running -= 1
+                job.uploads = []
+
+    def _run(self, job):
+        job._update(status='running', started_at=time.time())
+        keys = [hashlib.sha256(data).hexdigest() for _, data in job.uploads]
+        processed_resumes = []
+        pending, pending_indices = [], []
+        processed = 0
+        duplicates = None
+        if job.near_duplicate_threshold is not None:
+            duplicates = NearDuplicateIndex(job.near_duplicate_threshold)
+        # (scores, i) of every resume scored so far, by upload index, for near-duplicates to reuse
+        scored = {}
+
+        def flush():
+            if not pending:
+                return
+            representatives = list(pending_indices)
+            if duplicates is not None:
+                representatives = [duplicates.add(index, r['minhash'] if r.get('minhash') is not None
+                                                  else minhash_signature(r['text']))
+                                   for r, index in zip(pending, pending_indices)]
+            # Only resumes that are not copies of an earlier one are scored
+            unique = [r for r, index, representative in zip(pending, pending_indices, representatives)
+                      if representative == index]
+            if unique:
+                scores = job.matcher.score_resumes([r['text'] for r in unique],
+                                                   [r['similarity_profile'] for r in unique])
+                unique_indices = [index for index, representative in zip(pending_indices, representatives)
+                                  if representative == index]
+                for i, index in enumerate(unique_indices):
+                    scored[index] = (scores, i)
+            entries = [(r, *scored[representative]) for r, representative in zip(pending, representatives)]
+            job._add_results(entries, list(pending_indices), processed, len(pending) - len(unique))
+            pending.clear()
+            pending_indices.clear()
+
+        # Resumes seen before skip the parse pool entirely
+        with self._processed_lock:
+            cached = {i: self._processed[key] for i, key in enumerate(keys) if key in self._processed}
+        to_parse = [(i, upload) for i, upload in enumerate(job.uploads) if i not in cached]
+
+        for i, resume_data in cached.items():
+            if job.cancelled:
+                break
+            processed += 1
+            warning = extraction_warning(job.uploads[i][0], resume_data)
+            if warning:
+                job._add_warning(warning)
+            pending.append(resume_data)
+            pending_indices.append(i)
+            processed_resumes.append(resume_data)
+            if len(pending) >= SCORE_CHUNK_SIZE:
+                flush()
+
+        stream = iter_parse_resumes((upload for _, upload in to_parse), in_flight=self.in_flight,
+                                    executor=self._parse_pool)
+        try:
+            for (i, (file_name, _)), parse_result in zip(to_parse, stream):
+                if job.cancelled:
+                    break
+                processed += 1
+                if parse_result['error']:
+                    flush()
+                    job._add_error(file_name, parse_result['error'], processed)
+                    continue
+
+                resume_data = parse_result['resume']
+                resume_data['text'] = resume_data.pop('processed_text')
+                warning = extraction_warning(file_name, resume_data)
+                if warning:
+                    job._add_warning(warning)
+                self._remember(keys[i], resume_data)
+                pending.append(resume_data)
+                pending_indices.append(i)
+                processed_resumes.append(resume_data)
+                if len(pending) >= SCORE_CHUNK_SIZE:
+                    flush()
+        finally:
+            # Closing the stream cancels parses that have not started
+            stream.close()
+
+        flush()
+        if job.cancelled:
+            job._update(status='cancelled', finished_at=time.time())
+            return
+        if job.on_complete is not None:
+            job.on_complete(processed_resumes)
+        job._update(status='done', finished_at=time.time())
+
+    def _remember(self, key, resume_data):
+        """Keep a processed resume by content hash, evicting the least recently added"""
+        with self._processed_lock:
+            self._processed[key] = resume_data
+            self._processed.move_to_end(key)
+            while len(self._processed) > PROCESSED_RESUMES_KEPT:
+                self._processed.popitem(last=False)
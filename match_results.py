@@ -0,0 +1,142 @@
+import csv
+import io
+import numpy as np
+
+# Flat export columns: the detailed scores each get their own column
+EXPORT_COLUMNS = ('candidate_name', 'score', 'skills', 'missing_skills', 'decision',
+                  'cosine_score', 'euclidean_score', 'custom_score')
+# Rows converted and written per chunk when exporting
+EXPORT_CHUNK_ROWS = 10000
+
+# Column name in a match_resumes row's detailed_scores for each flat score column
+DETAILED_SCORE_KEYS = {'cosine_score': 'cosine', 'euclidean_score': 'euclidean', 'custom_score': 'custom'}
+FLOAT_COLUMNS = ('score', 'cosine_score', 'euclidean_score', 'custom_score')
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Arrow and Parquet export need pyarrow: pip install pyarrow")
+    return pyarrow
+
+class MatchResults:
+    """Ranked match results stored column-wise, one NumPy array per field.
+
+    Holds the same information as the list of dicts match_resumes returns
+    (row(i) rebuilds one of those dicts) without a dict per candidate, and
+    exports to CSV or Parquet in chunks with the detailed scores flattened
+    into their own columns.
+    """
+    def __init__(self, candidate_name, score, skills, missing_skills, decision,
+                 cosine_score, euclidean_score, custom_score):
+        self.columns = {
+            'candidate_name': np.asarray(candidate_name, dtype=object),
+            'score': np.asarray(score, dtype=float),
+            'skills': np.asarray(skills, dtype=object),
+            'missing_skills': np.asarray(missing_skills, dtype=object),
+            'decision': np.asarray(decision, dtype=object),
+            'cosine_score': np.asarray(cosine_score, dtype=float),
+            'euclidean_score': np.asarray(euclidean_score, dtype=float),
+            'custom_score': np.asarray(custom_score, dtype=float)
+        }
+
+    @classmethod
+    def from_records(cls, results):
+        """Build from match_resumes-style row dicts"""
+        columns = {name: [] for name in EXPORT_COLUMNS}
+        for result in results:
+            for name in EXPORT_COLUMNS:
+                if name in DETAILED_SCORE_KEYS:
+                    columns[name].append(result['detailed_scores'][DETAILED_SCORE_KEYS[name]])
+                else:
+                    columns[name].append(result[name])
+        return cls(**columns)
+
+    def __len__(self):
+        return len(self.columns['score'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row(self, i):
+        """Row i as a match_resumes result dict"""
+        columns = self.columns
+        return {
+            'candidate_name': columns['candidate_name'][i],
+            'score': columns['score'][i],
+            'skills': columns['skills'][i],
+            'missing_skills': columns['missing_skills'][i],
+            'decision': columns['decision'][i],
+            'detailed_scores': {key: columns[name][i] for name, key in DETAILED_SCORE_KEYS.items()}
+        }
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def to_records(self):
+        """Every row as a match_resumes result dict"""
+        return list(self)
+
+    def take(self, indices):
+        """A new MatchResults with only the given rows, in the given order (e.g. one page)"""
+        return MatchResults(**{name: column[indices] for name, column in self.columns.items()})
+
+    @classmethod
+    def concatenate(cls, parts):
+        """One MatchResults with the rows of several, in order"""
+        if not parts:
+            return cls([], [], [], [], [], [], [], [])
+        return cls(**{name: np.concatenate([part.columns[name] for part in parts]) for name in EXPORT_COLUMNS})
+
+    def iter_csv(self, chunk_rows=EXPORT_CHUNK_ROWS, header=True):
+        """CSV text in chunks of chunk_rows rows, header first (unless header is False)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_COLUMNS)
+        for start in range(0, len(self), chunk_rows):
+            # tolist() hands csv plain Python values, which format much faster than NumPy scalars
+            writer.writerows(zip(*(self.columns[name][start:start + chunk_rows].tolist() for name in EXPORT_COLUMNS)))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def write_csv(self, path_or_file, chunk_rows=EXPORT_CHUNK_ROWS):
+        """Write every row as CSV, chunk by chunk, to a path or text file object"""
+        if hasattr(path_or_file, 'write'):
+            for chunk in self.iter_csv(chunk_rows):
+                path_or_file.write(chunk)
+            return path_or_file
+        with open(path_or_file, 'w', newline='', encoding='utf-8') as output_file:
+            self.write_csv(output_file, chunk_rows)
+        return path_or_file
+
+    def iter_record_batches(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        """Arrow record batches of chunk_rows rows each"""
+        pyarrow = _import_pyarrow()
+        schema = self.arrow_schema()
+        for start in range(0, len(self), chunk_rows):
+            yield pyarrow.record_batch(
+                [pyarrow.array(self.columns[name][start:start + chunk_rows], type=schema.field(name).type)
+                 for name in EXPORT_COLUMNS], schema=schema)
+
+    def arrow_schema(self):
+        pyarrow = _import_pyarrow()
+        return pyarrow.schema([(name, pyarrow.float64() if name in FLOAT_COLUMNS else pyarrow.string())
+                               for name in EXPORT_COLUMNS])
+
+    def to_arrow(self):
+        """The whole result set as a pyarrow Table"""
+        pyarrow = _import_pyarrow()
+        return pyarrow.Table.from_batches(list(self.iter_record_batches()), schema=self.arrow_schema())
+
+    def write_parquet(self, path_or_file, chunk_rows=EXPORT_CHUNK_ROWS):
+        """Write every row to a Parquet file, one row group per chunk"""
+        pyarrow = _import_pyarrow()
+        with pyarrow.parquet.ParquetWriter(path_or_file, self.arrow_schema()) as writer:
+            for batch in self.iter_record_batches(chunk_rows):
+                writer.write_batch(batch)
+        return path_or_file
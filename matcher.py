@@ -1,24 +1,87 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from text_processor import extract_skills_advanced, calculate_text_similarity
+from text_processor import extract_skills_advanced, build_similarity_profile, calculate_profile_similarity
 from sklearn.metrics.pairwise import euclidean_distances
+from stage_timing import timed, timer
+from match_results import MatchResults
+from skill_index import skill_bitmap, skills_from_bitmap
+from near_duplicates import minhash_signature, cluster_near_duplicates
+
+# Decision thresholds on the final score
+FIT_THRESHOLD = 0.5
+POTENTIAL_FIT_THRESHOLD = 0.3
+
+# Weights of the three similarities in the final score
+COSINE_WEIGHT = 0.6
+EUCLIDEAN_WEIGHT = 0.2
+CUSTOM_WEIGHT = 0.2
+
+def get_decision(score):
+    """Map a final score to a Fit / Potential Fit / Not Fit decision"""
+    # Use a more nuanced threshold
+    if score > POTENTIAL_FIT_THRESHOLD:
+        return "Fit" if score > FIT_THRESHOLD else "Potential Fit"
+    return "Not Fit"
+
+def get_decisions(scores):
+    """Vectorized get_decision over an array of final scores"""
+    return np.where(scores > POTENTIAL_FIT_THRESHOLD,
+                    np.where(scores > FIT_THRESHOLD, "Fit", "Potential Fit"), "Not Fit").astype(object)
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, ties in input order.
+
+    Same as the first k of a stable descending argsort, but selects with
+    argpartition so only the selected candidates are sorted.
+    """
+    scores = np.asarray(scores)
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    if k <= 0:
+        return np.array([], dtype=int)
+    # Everything scoring at least the k-th best; ties at the cut keep input order
+    threshold = np.partition(-scores, k - 1)[k - 1]
+    candidates = np.flatnonzero(-scores <= threshold)
+    return candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+
+def build_vectorizer():
+    """Create the TF-IDF vectorizer used to represent one job description"""
+    # Use a more sophisticated TF-IDF vectorizer
+    return TfidfVectorizer(
+        stop_words='english',
+        max_features=10000,
+        ngram_range=(1, 2),  # Include bigrams for better context
+        min_df=1,
+        # The vectorizer is fitted on a single job description, where any
+        # max_df below 1.0 rejects every term and makes fitting fail
+        max_df=1.0,
+        sublinear_tf=True  # Apply sublinear TF scaling
+    )
+
+def prepare_resume_features(resume_text):
+    """Job-independent features match_resumes reuses when a resume carries them"""
+    skills = extract_skills_advanced(resume_text)
+    return {
+        'skills': skills,
+        'skill_bitmap': skill_bitmap(skills),
+        'similarity_profile': build_similarity_profile(resume_text),
+        'minhash': minhash_signature(resume_text)
+    }
 
 class ResumeMatcher:
-    def __init__(self):
-        # Use a more sophisticated TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=10000,
-            ngram_range=(1, 2),  # Include bigrams for better context
-            min_df=1,
-            max_df=0.8,
-            sublinear_tf=True  # Apply sublinear TF scaling
-        )
+    def __init__(self, model=None):
+        # A CorpusTfidfModel fitted on the resume corpus can replace the
+        # per-job vectorizer; job descriptions are then only transformed
+        self.model = model
+        self.vectorizer = model if model is not None else build_vectorizer()
         self.jd_vector = None
         self.jd_skills = []
+        self.jd_skill_bitmap = 0
         self.jd_text = ""
+        self.jd_profile = None
         
     def fit_job_description(self, jd_text):
         """Fit the vectorizer on the job description"""
@@ -27,37 +90,47 @@ class ResumeMatcher:
         
         # Store job description skills
         self.jd_skills = extract_skills_advanced(jd_text)
+        self.jd_skill_bitmap = skill_bitmap(self.jd_skills)
+        
+        # Precompute the job description side of the custom similarity
+        self.jd_profile = build_similarity_profile(jd_text)
         
-        # Fit and transform the job description
-        self.jd_vector = self.vectorizer.fit_transform([jd_text])
+        # Fit and transform the job description (transform only with a corpus model)
+        if self.model is not None:
+            self.jd_vector = self.vectorizer.transform([jd_text])
+        else:
+            self.jd_vector = self.vectorizer.fit_transform([jd_text])
         
+    @timed('match_resume')
     def match_resume(self, resume_text):
         """Match a resume against the job description"""
         if self.jd_vector is None:
             raise ValueError("Job description not fitted yet. Call fit_job_description first.")
             
         # Transform resume text using the same vectorizer
-        resume_vector = self.vectorizer.transform([resume_text])
-        
-        # Calculate cosine similarity
-        cosine_score = cosine_similarity(self.jd_vector, resume_vector)[0][0]
+        with timer('match.vectorize'):
+            resume_vector = self.vectorizer.transform([resume_text])
         
-        # Calculate Euclidean distance (inverse for similarity)
-        euclidean_dist = euclidean_distances(self.jd_vector, resume_vector)[0][0]
-        euclidean_score = 1 / (1 + euclidean_dist)  # Convert distance to similarity
+        with timer('match.distances'):
+            # Calculate cosine similarity
+            cosine_score = cosine_similarity(self.jd_vector, resume_vector)[0][0]
+            
+            # Calculate Euclidean distance (inverse for similarity)
+            euclidean_dist = euclidean_distances(self.jd_vector, resume_vector)[0][0]
+            euclidean_score = 1 / (1 + euclidean_dist)  # Convert distance to similarity
         
         # Calculate custom text similarity
-        custom_similarity = calculate_text_similarity(self.jd_text, resume_text)
+        custom_similarity = calculate_profile_similarity(self.jd_profile, build_similarity_profile(resume_text))
         
         # Weighted combination of all scores for better accuracy
         # Give more weight to cosine similarity as it's more reliable
-        final_score = 0.6 * cosine_score + 0.2 * euclidean_score + 0.2 * custom_similarity
+        final_score = COSINE_WEIGHT * cosine_score + EUCLIDEAN_WEIGHT * euclidean_score + CUSTOM_WEIGHT * custom_similarity
         
         # Extract resume skills with improved accuracy
         resume_skills = extract_skills_advanced(resume_text)
         
         # Find missing skills
-        missing_skills = list(set(self.jd_skills) - set(resume_skills))
+        missing_skills = self.missing_skills(skill_bitmap(resume_skills))
         
         return {
             'score': final_score,
@@ -68,38 +141,361 @@ class ResumeMatcher:
             'custom_score': custom_similarity
         }
     
-    def match_resumes(self, resumes_data):
-        """Match multiple resumes against the job description"""
-        results = []
+    @timed('score_resumes')
+    def score_resumes(self, resume_texts, profiles=None):
+        """Score a batch of resume texts against the job description in one pass.
         
-        for resume_data in resumes_data:
-            candidate_name = resume_data['candidate_name']
-            resume_text = resume_data['text']
-            
-            # Match resume
-            match_result = self.match_resume(resume_text)
-            
-            # Determine fit decision based on enhanced criteria
-            # Use a more nuanced threshold
-            if match_result['score'] > 0.3:
-                decision = "Fit" if match_result['score'] > 0.5 else "Potential Fit"
-            else:
-                decision = "Not Fit"
+        profiles optionally holds each resume's build_similarity_profile result
+        so it is not recomputed for every job description.
+        """
+        vector_scores = self.vector_scores(resume_texts)
+        cosine_scores = vector_scores['cosine_score']
+        euclidean_scores = vector_scores['euclidean_score']
+        
+        # Custom similarity only needs the resume side per document
+        if profiles is None:
+            profiles = [build_similarity_profile(resume_text) for resume_text in resume_texts]
+        custom_scores = self.custom_scores(profiles)
+        
+        final_scores = COSINE_WEIGHT * cosine_scores + EUCLIDEAN_WEIGHT * euclidean_scores + CUSTOM_WEIGHT * custom_scores
+        
+        return {
+            'score': final_scores,
+            'cosine_score': cosine_scores,
+            'euclidean_score': euclidean_scores,
+            'custom_score': custom_scores
+        }
+    
+    def vector_scores(self, resume_texts):
+        """Cosine and Euclidean scores of a batch: the cheap, fully vectorized part of score_resumes"""
+        if self.jd_vector is None:
+            raise ValueError("Job description not fitted yet. Call fit_job_description first.")
+        
+        # Transform the whole pool into one sparse matrix
+        with timer('match.vectorize'):
+            resume_matrix = self.vectorizer.transform(resume_texts)
+        
+        with timer('match.distances'):
+            # TF-IDF rows are L2-normalized, so a single sparse matrix-vector
+            # product gives the cosine similarity of every resume
+            cosine_scores = (resume_matrix @ self.jd_vector.T).toarray().ravel()
             
-            results.append({
-                'candidate_name': candidate_name,
-                'score': match_result['score'],
-                'skills': ', '.join(match_result['skills']),
-                'missing_skills': ', '.join(match_result['missing_skills']),
-                'decision': decision,
-                'detailed_scores': {
-                    'cosine': match_result['cosine_score'],
-                    'euclidean': match_result['euclidean_score'],
-                    'custom': match_result['custom_score']
-                }
-            })
+            # Derive Euclidean distance from cosine: |a - b|^2 = |a|^2 + |b|^2 - 2a.b
+            # (squared norms are 1, or 0 for a resume with no known terms)
+            resume_sq_norms = np.asarray(resume_matrix.multiply(resume_matrix).sum(axis=1)).ravel()
+            jd_sq_norm = self.jd_vector.multiply(self.jd_vector).sum()
+            euclidean_dists = np.sqrt(np.maximum(resume_sq_norms + jd_sq_norm - 2 * cosine_scores, 0))
+            euclidean_scores = 1 / (1 + euclidean_dists)
+        
+        return {'cosine_score': cosine_scores, 'euclidean_score': euclidean_scores}
+    
+    def custom_scores(self, profiles):
+        """Custom text similarity of each resume similarity profile to the job description"""
+        return np.array([
+            calculate_profile_similarity(self.jd_profile, profile) for profile in profiles
+        ], dtype=float)
+    
+    @timed('match_resumes')
+    def match_resumes(self, resumes_data, top_k=None, offset=0, near_duplicate_threshold=None):
+        """Match multiple resumes against the job description.
+        
+        Resumes that already carry 'skills' and 'similarity_profile' (see
+        prepare_resume_features) skip that job-independent work. With top_k,
+        only the results ranked offset to offset + top_k are returned (one
+        page), and only those candidates get a full result row. With
+        near_duplicate_threshold, near-duplicate resumes are scored once (see
+        rank_resumes).
+        """
+        return self.rank_resumes(resumes_data, top_k, offset, near_duplicate_threshold).to_records()
+    
+    @timed('rank_resumes')
+    def rank_resumes(self, resumes_data, top_k=None, offset=0, near_duplicate_threshold=None):
+        """match_resumes as a columnar MatchResults, without a dict per candidate.
+        
+        With near_duplicate_threshold, resumes whose estimated Jaccard
+        similarity to an earlier one is at least the threshold (MinHash of
+        word shingles, reused from a 'minhash' feature when present) share
+        that resume's scores and skills but keep their own candidate name.
+        Only one resume per cluster is scored; the counts are left in
+        last_near_duplicate_stats.
+        """
+        if not resumes_data or top_k == 0 or offset >= len(resumes_data):
+            return MatchResults([], [], [], [], [], [], [], [])
+        
+        if near_duplicate_threshold is None:
+            scores = self._pool_scores(resumes_data)
+            sources = resumes_data
+        else:
+            signatures = [resume_data['minhash'] if resume_data.get('minhash') is not None
+                          else minhash_signature(resume_data['text']) for resume_data in resumes_data]
+            representatives = cluster_near_duplicates(signatures, near_duplicate_threshold)
+            unique = np.flatnonzero(representatives == np.arange(len(resumes_data)))
+            self.last_near_duplicate_stats = {
+                'resumes': len(resumes_data),
+                'clusters': len(unique),
+                'near_duplicates': len(resumes_data) - len(unique),
+                'scored': len(unique)
+            }
+            # Score one resume per cluster and give every copy its scores
+            unique_scores = self._pool_scores([resumes_data[i] for i in unique])
+            positions = np.searchsorted(unique, representatives)
+            scores = {name: column[positions] for name, column in unique_scores.items()}
+            sources = _DuplicateSources(resumes_data, representatives)
+        
+        # Rank by score (descending, ties in input order); with top_k only
+        # the candidates up to the end of the page are selected and sorted
+        order = top_k_indices(scores['score'], None if top_k is None else offset + top_k)[offset:]
+        return self.ranked_results(sources, scores, order)
+    
+    def _pool_scores(self, resumes_data):
+        """score_resumes over a list of resumes, reusing their similarity profiles"""
+        profiles = [resume_data['similarity_profile'] if 'similarity_profile' in resume_data
+                    else build_similarity_profile(resume_data['text']) for resume_data in resumes_data]
+        return self.score_resumes([resume_data['text'] for resume_data in resumes_data], profiles)
+    
+    def ranked_results(self, resumes_data, scores, order):
+        """MatchResults of the resumes at indices order (best first) from a score_resumes result"""
+        if len(order) == 0:
+            return MatchResults([], [], [], [], [], [], [], [])
+        
+        # Skill columns are built in ranked order, for the selected rows only
+        skills, missing_skills = zip(*(self.skill_gap(resumes_data[i]) for i in order))
+        ranked_scores = scores['score'][order]
+        return MatchResults(
+            candidate_name=[resumes_data[i]['candidate_name'] for i in order],
+            score=ranked_scores,
+            skills=skills,
+            missing_skills=missing_skills,
+            decision=get_decisions(ranked_scores),
+            cosine_score=scores['cosine_score'][order],
+            euclidean_score=scores['euclidean_score'][order],
+            custom_score=scores['custom_score'][order]
+        )
+    
+    def skill_gap(self, resume_data):
+        """A resume's skills and the job's skills it lacks, each joined for display"""
+        # Extract resume skills with improved accuracy
+        if 'skills' in resume_data:
+            resume_skills = resume_data['skills']
+        else:
+            resume_skills = extract_skills_advanced(resume_data['text'])
+        bitmap = resume_data.get('skill_bitmap')
+        if bitmap is None:
+            bitmap = skill_bitmap(resume_skills)
+        return ', '.join(resume_skills), ', '.join(self.missing_skills(bitmap))
+    
+    def missing_skills(self, resume_skill_bitmap):
+        """Job description skills missing from a resume's skill bitmap, in taxonomy order"""
+        return skills_from_bitmap(self.jd_skill_bitmap & ~resume_skill_bitmap)
+    
+    def result_row(self, resume_data, scores, i):
+        """Build the match_resumes output for resume i of a score_resumes result"""
+        score = scores['score'][i]
+        skills, missing_skills = self.skill_gap(resume_data)
+        
+        return {
+            'candidate_name': resume_data['candidate_name'],
+            'score': score,
+            'skills': skills,
+            'missing_skills': missing_skills,
+            'decision': get_decision(score),
+            'detailed_scores': {
+                'cosine': scores['cosine_score'][i],
+                'euclidean': scores['euclidean_score'][i],
+                'custom': scores['custom_score'][i]
+            }
+        }
+
+class _DuplicateSources:
+    """Resume data for ranked_results where near-duplicates reuse their representative's skills"""
+    def __init__(self, resumes_data, representatives):
+        self.resumes_data = resumes_data
+        self.representatives = representatives
+        self._skills = {}
+    
+    def __getitem__(self, i):
+        representative = self.representatives[i]
+        if representative not in self._skills:
+            resume_data = self.resumes_data[representative]
+            if 'skills' not in resume_data:
+                resume_data = dict(resume_data, skills=extract_skills_advanced(resume_data['text']))
+            self._skills[representative] = resume_data
+        if representative == i:
+            return self._skills[representative]
+        return dict(self._skills[representative], candidate_name=self.resumes_data[i]['candidate_name'])
+
+class MultiJobMatcher:
+    """Score one resume pool against many job descriptions at once.
+    
+    Scores are identical to fitting a separate ResumeMatcher per job: each job
+    keeps its own vocabulary (a vectorizer fitted on one document has an IDF of
+    1 for every term), but resumes are vectorized once over the union of all
+    job vocabularies and every job is scored with sparse matrix products.
+    """
+    def __init__(self):
+        self.job_ids = []
+        self.jd_texts = []
+        self.jd_skills = []
+        self.jd_skill_bitmaps = []
+        self.count_vectorizer = None
+        self.jd_matrix = None
+        self.jd_vocab_mask = None
+        self.jd_norms = None
+        self.key_term_index = {}
+        self.jd_term_matrix = None
+        self.jd_term_counts = None
+    
+    def fit_job_descriptions(self, job_descriptions):
+        """Fit every job description; accepts a dict of job id -> text or a list of texts"""
+        if isinstance(job_descriptions, dict):
+            items = list(job_descriptions.items())
+        else:
+            items = list(enumerate(job_descriptions))
+        if not items:
+            raise ValueError("At least one job description is required.")
+        
+        self.job_ids = [job_id for job_id, _ in items]
+        self.jd_texts = [jd_text for _, jd_text in items]
+        self.jd_skills = [extract_skills_advanced(jd_text) for jd_text in self.jd_texts]
+        self.jd_skill_bitmaps = [skill_bitmap(skills) for skills in self.jd_skills]
+        
+        # Each job keeps the vocabulary its own ResumeMatcher would have learned
+        jd_vocabularies = [set(build_vectorizer().fit([jd_text]).vocabulary_) for jd_text in self.jd_texts]
+        vocabulary = {term: i for i, term in enumerate(sorted(set().union(*jd_vocabularies)))}
+        
+        mask_rows, mask_cols = [], []
+        for row, jd_vocabulary in enumerate(jd_vocabularies):
+            mask_rows.extend([row] * len(jd_vocabulary))
+            mask_cols.extend(vocabulary[term] for term in jd_vocabulary)
+        self.jd_vocab_mask = sparse.csr_matrix(
+            (np.ones(len(mask_rows)), (mask_rows, mask_cols)),
+            shape=(len(items), len(vocabulary))
+        )
+        
+        # Raw counts over the shared vocabulary, analyzed like build_vectorizer()
+        self.count_vectorizer = CountVectorizer(
+            stop_words='english',
+            ngram_range=(1, 2),
+            vocabulary=vocabulary
+        )
+        self.jd_matrix = self._sublinear_tf(self.count_vectorizer.transform(self.jd_texts)).multiply(self.jd_vocab_mask).tocsr()
+        self.jd_norms = np.sqrt(np.asarray(self.jd_matrix.multiply(self.jd_matrix).sum(axis=1)).ravel())
+        
+        # Key terms of every job as a binary matrix for the custom similarity
+        jd_profiles = [build_similarity_profile(jd_text) for jd_text in self.jd_texts]
+        self.key_term_index = {term: i for i, term in enumerate(sorted(set().union(*(p['terms'] for p in jd_profiles))))}
+        self.jd_term_matrix, self.jd_term_counts = self._key_term_matrix(jd_profiles)
+    
+    def _sublinear_tf(self, counts):
+        """Apply TfidfTransformer's sublinear TF scaling (1 + log(tf)) to a count matrix"""
+        tf = counts.astype(float)
+        tf.data = np.log(tf.data) + 1
+        return tf
+    
+    def _key_term_matrix(self, profiles):
+        """Binary matrix of profile key terms over the job key-term vocabulary, plus term counts"""
+        rows, cols = [], []
+        for row, profile in enumerate(profiles):
+            for term in profile['terms']:
+                col = self.key_term_index.get(term)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(profiles), len(self.key_term_index))
+        )
+        counts = np.array([len(profile['terms']) for profile in profiles], dtype=float)
+        return matrix, counts
+    
+    def score_resumes(self, resume_texts, profiles=None):
+        """Score every job against every resume; each score is a (jobs x resumes) array.
+        
+        profiles is optional, as in ResumeMatcher.score_resumes.
+        """
+        if self.jd_matrix is None:
+            raise ValueError("Job descriptions not fitted yet. Call fit_job_descriptions first.")
+        
+        # Vectorize the pool once
+        resume_tf = self._sublinear_tf(self.count_vectorizer.transform(resume_texts))
+        
+        # Job vectors are zero outside their own vocabulary, so one product
+        # gives every dot product; the resume norms restricted to each job's
+        # vocabulary come from a second product with the vocabulary masks
+        dots = (self.jd_matrix @ resume_tf.T).toarray()
+        resume_sq_norms = (self.jd_vocab_mask @ resume_tf.multiply(resume_tf).T).toarray()
+        denominators = self.jd_norms[:, None] * np.sqrt(resume_sq_norms)
+        cosine_scores = np.divide(dots, denominators, out=np.zeros_like(dots), where=denominators > 0)
+        
+        # Normalized vectors have a squared norm of 1 (0 when empty)
+        resume_sq = (resume_sq_norms > 0).astype(float)
+        jd_sq = (self.jd_norms > 0).astype(float)[:, None]
+        euclidean_dists = np.sqrt(np.maximum(resume_sq + jd_sq - 2 * cosine_scores, 0))
+        euclidean_scores = 1 / (1 + euclidean_dists)
+        
+        # Custom similarity from key-term overlap counts
+        if profiles is None:
+            profiles = [build_similarity_profile(resume_text) for resume_text in resume_texts]
+        resume_term_matrix, resume_term_counts = self._key_term_matrix(profiles)
+        intersections = (self.jd_term_matrix @ resume_term_matrix.T).toarray()
+        jd_counts = self.jd_term_counts[:, None]
+        resume_counts = resume_term_counts[None, :]
+        unions = jd_counts + resume_counts - intersections
+        jaccard = np.divide(intersections, unions, out=np.zeros_like(intersections), where=unions > 0)
+        magnitudes = np.sqrt(jd_counts) * np.sqrt(resume_counts)
+        term_cosine = np.divide(intersections, magnitudes, out=np.zeros_like(intersections), where=magnitudes > 0)
+        custom_scores = 0.4 * jaccard + 0.6 * term_cosine
+        
+        final_scores = COSINE_WEIGHT * cosine_scores + EUCLIDEAN_WEIGHT * euclidean_scores + CUSTOM_WEIGHT * custom_scores
+        
+        return {
+            'score': final_scores,
+            'cosine_score': cosine_scores,
+            'euclidean_score': euclidean_scores,
+            'custom_score': custom_scores
+        }
+    
+    def match_resumes(self, resumes_data, top_k=10):
+        """Rank the resume pool for every job; returns job id -> top_k results"""
+        if not resumes_data:
+            return {job_id: [] for job_id in self.job_ids}
+        
+        profiles = [resume_data['similarity_profile'] if 'similarity_profile' in resume_data
+                    else build_similarity_profile(resume_data['text']) for resume_data in resumes_data]
+        scores = self.score_resumes([resume_data['text'] for resume_data in resumes_data], profiles)
+        
+        # Skills are only extracted for candidates that make some job's top-k
+        resume_skills = {}
+        resume_bitmaps = {}
+        
+        rankings = {}
+        for row, job_id in enumerate(self.job_ids):
+            order = top_k_indices(scores['score'][row], top_k)
             
-        # Sort results by score (descending)
-        results = sorted(results, key=lambda x: x['score'], reverse=True)
+            results = []
+            for i in order:
+                if i not in resume_skills:
+                    resume_data = resumes_data[i]
+                    resume_skills[i] = (resume_data['skills'] if 'skills' in resume_data
+                                        else extract_skills_advanced(resume_data['text']))
+                    resume_bitmaps[i] = resume_data.get('skill_bitmap')
+                    if resume_bitmaps[i] is None:
+                        resume_bitmaps[i] = skill_bitmap(resume_skills[i])
+                missing_skills = skills_from_bitmap(self.jd_skill_bitmaps[row] & ~resume_bitmaps[i])
+                score = scores['score'][row, i]
+                
+                results.append({
+                    'candidate_name': resumes_data[i]['candidate_name'],
+                    'score': score,
+                    'skills': ', '.join(resume_skills[i]),
+                    'missing_skills': ', '.join(missing_skills),
+                    'decision': get_decision(score),
+                    'detailed_scores': {
+                        'cosine': scores['cosine_score'][row, i],
+                        'euclidean': scores['euclidean_score'][row, i],
+                        'custom': scores['custom_score'][row, i]
+                    }
+                })
+            rankings[job_id] = results
         
-        return results
\ No newline at end of file
+        return rankings
@@ -0,0 +1,122 @@
+import zlib
+from collections import defaultdict
+import numpy as np
+
+# Signature length, words per shingle and the default Jaccard similarity above
+# which two resumes are treated as copies of each other
+NUM_PERM = 128
+SHINGLE_WORDS = 3
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# LSH candidates are verified against their signatures, so a false candidate
+# only costs one comparison while a missed pair costs a whole scoring run
+LSH_FALSE_POSITIVE_WEIGHT = 0.1
+LSH_FALSE_NEGATIVE_WEIGHT = 0.9
+
+# Universal hashing (a * x + b) mod a Mersenne prime; the products fit in uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+def _permutations(num_perm, seed=1):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64),
+            rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64))
+
+_PERMUTATIONS = {NUM_PERM: _permutations(NUM_PERM)}
+
+def shingles(text, size=SHINGLE_WORDS):
+    """Overlapping word size-grams of a text (the whole text if it is shorter)"""
+    words = text.split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(text, num_perm=NUM_PERM):
+    """MinHash signature (uint32 array) of a text's word shingles, or None for a text without words.
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of the two shingle sets. Shingles are hashed with CRC32, so
+    signatures agree across processes and runs.
+    """
+    text_shingles = shingles(text)
+    if not text_shingles:
+        return None
+    if num_perm not in _PERMUTATIONS:
+        _PERMUTATIONS[num_perm] = _permutations(num_perm)
+    a, b = _PERMUTATIONS[num_perm]
+    hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in text_shingles),
+                         dtype=np.uint64, count=len(text_shingles)) % np.uint64(_MERSENNE_PRIME)
+    return ((a[:, None] * hashes[None, :] + b[:, None]) % np.uint64(_MERSENNE_PRIME)).min(axis=1).astype(np.uint32)
+
+def estimate_jaccard(signature1, signature2):
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.mean(signature1 == signature2))
+
+def lsh_bands(threshold, num_perm=NUM_PERM):
+    """(bands, rows) splitting a signature so that pairs near the threshold become candidates.
+
+    Two signatures are candidates when all rows of at least one band agree,
+    which happens with probability 1 - (1 - s**rows)**bands at similarity s.
+    The split minimizes the weighted chances of missing a pair above the
+    threshold and of flagging one below it.
+    """
+    similarities, step = np.linspace(0, 1, 201, retstep=True)
+    below = similarities < threshold
+    best, best_error = None, None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate = 1 - (1 - similarities ** rows) ** bands
+        error = step * (LSH_FALSE_POSITIVE_WEIGHT * candidate[below].sum()
+                        + LSH_FALSE_NEGATIVE_WEIGHT * (1 - candidate[~below]).sum())
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+class NearDuplicateIndex:
+    """LSH index of MinHash signatures that groups near-duplicate texts into clusters.
+
+    Each cluster is represented by the first text added to it. add() looks up
+    the representatives sharing an LSH band with a new signature, checks their
+    estimated Jaccard similarity against threshold and either joins the first
+    that passes or starts a new cluster. Only representatives are indexed, so
+    memory grows with the number of distinct texts, not with the copies.
+    """
+    def __init__(self, threshold=DEFAULT_NEAR_DUPLICATE_THRESHOLD, num_perm=NUM_PERM):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures = {}
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find(self, signature):
+        """Key of the representative of the cluster a signature belongs to, or None"""
+        if signature is None:
+            return None
+        seen = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            for key in bucket.get(band_key, ()):
+                if key not in seen:
+                    seen.add(key)
+                    if estimate_jaccard(signature, self._signatures[key]) >= self.threshold:
+                        return key
+        return None
+
+    def add(self, key, signature):
+        """Place a text in its cluster; returns its representative's key (key itself for a new cluster)"""
+        representative = self.find(signature)
+        if representative is not None:
+            return representative
+        if signature is not None:
+            self._signatures[key] = signature
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                bucket[band_key].append(key)
+        return key
+
+def cluster_near_duplicates(signatures, threshold=DEFAULT_NEAR_DUPLICATE_THRESHOLD, num_perm=NUM_PERM):
+    """Representative index for each signature: the first earlier signature it nearly duplicates, else itself"""
+    index = NearDuplicateIndex(threshold, num_perm)
+    return np.array([index.add(i, signature) for i, signature in enumerate(signatures)], dtype=int)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Default location of the on-disk parse cache
+DEFAULT_CACHE_PATH = ".resume_cache.sqlite"
+
+# Default size budget for cached parse results (sum of stored JSON payloads)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+def content_key(data, parser_version, extension=""):
+    """Build a cache key from file content, parser version and file type"""
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{parser_version}:{extension.lower()}:{digest}"
+
+class ParseCache:
+    """Content-addressed SQLite cache of parse_resume results with LRU eviction"""
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Several worker processes may share one cache file
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS parse_results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS parse_results_last_access "
+            "ON parse_results (last_access)"
+        )
+        self.connection.commit()
+
+    def get(self, key):
+        """Return the cached parse result for a key, or None"""
+        row = self.connection.execute(
+            "SELECT payload FROM parse_results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self.connection:
+            self.connection.execute(
+                "UPDATE parse_results SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key, resume_data):
+        """Store a parse result and evict least recently used entries over budget"""
+        payload = json.dumps(resume_data)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO parse_results (key, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time())
+            )
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        total = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM parse_results"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.connection.execute(
+            "SELECT key, size FROM parse_results ORDER BY last_access"
+        )
+        expired = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            expired.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM parse_results WHERE key = ?", expired)
+        self.evictions += len(expired)
+
+    def stats(self):
+        """Return hit/miss counters and the current cache size"""
+        entries, total = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_results"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self.connection:
+            self.connection.execute("DELETE FROM parse_results")
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
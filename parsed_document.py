@@ -0,0 +1,58 @@
+# Lines containing one of these start a skills list
+SKILL_SECTION_MARKERS = ('skill', 'technical', 'expertise', 'competenc', 'proficienc')
+# Lines containing one of these end a skills list
+SKILL_SECTION_STOPS = ('experience', 'education', 'project')
+# The first line containing one of these starts the education section
+EDUCATION_MARKERS = ('education', 'university', 'college', 'degree', 'bachelor', 'master', 'phd', 'bs', 'ms', 'ba', 'ma')
+# Lines of the education section, header included
+EDUCATION_SECTION_LINES = 5
+
+class ParsedDocument:
+    """A resume text split and normalized once, shared by every field extractor.
+
+    Holds the original, stripped and lowercased lines, the lowercased text and
+    the section boundaries the extractors look for, so each extractor reads
+    these instead of lowercasing and splitting the text again.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.split('\n')
+        self.stripped_lines = [line.strip() for line in self.lines]
+        self.lower = text.lower()
+        self.lower_lines = self.lower.split('\n')
+        self.skill_sections = self._find_skill_sections()
+        self.education_section = self._find_education_section()
+
+    def _find_skill_sections(self):
+        """(start, end) line ranges of skill lists: the non-blank lines after a skills header,
+        up to a blank line, a line naming another section or the next skills header"""
+        sections = []
+        start = None
+        for i, line in enumerate(self.lower_lines):
+            if any(marker in line for marker in SKILL_SECTION_MARKERS):
+                if start is not None and start < i:
+                    sections.append((start, i))
+                start = i + 1
+                continue
+            if start is not None and (line.strip() == '' or any(stop in line for stop in SKILL_SECTION_STOPS)):
+                if start < i:
+                    sections.append((start, i))
+                start = None
+        if start is not None and start < len(self.lower_lines):
+            sections.append((start, len(self.lower_lines)))
+        return sections
+
+    def _find_education_section(self):
+        """(start, end) line range from the first line mentioning education, or None"""
+        for i, line in enumerate(self.lower_lines):
+            if any(marker in line for marker in EDUCATION_MARKERS):
+                return i, min(i + EDUCATION_SECTION_LINES, len(self.lower_lines))
+        return None
+
+    def skill_lines(self):
+        """Lowercased lines of every skill list, in document order"""
+        return [self.lower_lines[i] for start, end in self.skill_sections for i in range(start, end)]
+
+def as_document(text):
+    """text itself if it is already a ParsedDocument, else the text parsed into one"""
+    return text if isinstance(text, ParsedDocument) else ParsedDocument(text)
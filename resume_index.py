@@ -0,0 +1,144 @@
+import numpy as np
+from scipy import sparse
+
+# Slack for floating point error when comparing partial scores to the threshold
+PRUNING_EPSILON = 1e-9
+
+class InvertedIndex:
+    """Inverted index (term -> resume ids and weights) for top-k retrieval.
+
+    Resumes are represented with a fitted CorpusTfidfModel, the same features
+    ResumeMatcher(model=...) scores with. Queries use MaxScore-style dynamic
+    pruning: query terms are processed in decreasing order of their maximum
+    contribution, and posting lists stop being scanned once the remaining terms
+    cannot lift an unseen resume into the top k. Candidates that cannot catch
+    up are dropped and survivors are scored exactly from their stored rows
+    (the remaining terms are looked up there, never scanned), so the ranking is
+    identical to an exhaustive cosine ranking. Rebuild the index if the model
+    is updated, since IDF weights change every stored vector.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.resume_ids = []
+        self.candidate_names = []
+        self.matrix = None
+        self._postings = None
+        self.last_query_stats = {}
+
+    def add_resumes(self, resumes_data, resume_ids=None):
+        """Index resumes; each needs 'text' and 'candidate_name'"""
+        resumes_data = list(resumes_data)
+        if not resumes_data:
+            return
+        if resume_ids is None:
+            start = len(self.resume_ids)
+            resume_ids = range(start, start + len(resumes_data))
+
+        vectors = self.model.transform([resume_data['text'] for resume_data in resumes_data])
+        if self.matrix is None:
+            self.matrix = vectors.tocsr()
+        else:
+            # The model vocabulary may have grown; older rows have no weight there
+            width = max(self.matrix.shape[1], vectors.shape[1])
+            self.matrix.resize((self.matrix.shape[0], width))
+            vectors.resize((vectors.shape[0], width))
+            self.matrix = sparse.vstack([self.matrix, vectors], format='csr')
+
+        self.resume_ids.extend(resume_ids)
+        self.candidate_names.extend(resume_data['candidate_name'] for resume_data in resumes_data)
+        self._postings = None
+
+    def _build_postings(self):
+        """Column-major copy of the index with the maximum weight of every term"""
+        postings = self.matrix.tocsc()
+        postings.sort_indices()
+        max_weights = np.zeros(postings.shape[1])
+        nonempty = np.flatnonzero(np.diff(postings.indptr))
+        if len(nonempty):
+            max_weights[nonempty] = np.maximum.reduceat(postings.data, postings.indptr[nonempty])
+        self._postings = (postings, max_weights)
+
+    def search_text(self, jd_text, top_k=10):
+        """Transform a job description with the model and search the index"""
+        return self.search(self.model.transform([jd_text]), top_k)
+
+    def search(self, query_vector, top_k=10):
+        """Return the top_k resumes by cosine similarity to an L2-normalized query vector"""
+        n_resumes = len(self.resume_ids)
+        if n_resumes == 0 or top_k <= 0:
+            return []
+        if self._postings is None:
+            self._build_postings()
+        postings, max_weights = self._postings
+        top_k = min(top_k, n_resumes)
+
+        query = query_vector.tocsr()
+        in_index = (query.indices < postings.shape[1]) & (query.data > 0)
+        terms = query.indices[in_index]
+        weights = query.data[in_index]
+
+        # Most promising terms first; remaining[i] bounds what terms after i can add
+        upper_bounds = weights * max_weights[terms]
+        order = np.argsort(-upper_bounds, kind='stable')
+        terms, weights, upper_bounds = terms[order], weights[order], upper_bounds[order]
+        remaining = np.concatenate([np.cumsum(upper_bounds[::-1])[::-1][1:], [0.0]])
+
+        # Sparse accumulator: the sorted ids of resumes seen in a posting list
+        # so far and their partial scores, so work follows the postings
+        # scanned rather than the size of the index
+        candidates = np.zeros(0, dtype=postings.indices.dtype)
+        scores = np.zeros(0)
+        threshold = 0.0
+        bound_left = upper_bounds.sum()
+        postings_scanned = 0
+        terms_processed = 0
+
+        # Essential terms: scan postings while an unseen resume could still make the top k
+        for i, term in enumerate(terms):
+            start, end = postings.indptr[term], postings.indptr[term + 1]
+            doc_ids = postings.indices[start:end]
+            merged = np.union1d(candidates, doc_ids)
+            merged_scores = np.zeros(len(merged))
+            merged_scores[np.searchsorted(merged, candidates)] = scores
+            merged_scores[np.searchsorted(merged, doc_ids)] += weights[i] * postings.data[start:end]
+            candidates, scores = merged, merged_scores
+            postings_scanned += len(doc_ids)
+            terms_processed += 1
+            bound_left = remaining[i]
+
+            if len(candidates) >= top_k:
+                threshold = np.partition(scores, len(candidates) - top_k)[len(candidates) - top_k]
+            if bound_left < threshold - PRUNING_EPSILON:
+                break
+
+        # Non-essential terms are never scanned: drop candidates that cannot
+        # reach the k-th partial score even with every remaining term
+        survivors = candidates[scores + bound_left >= threshold - PRUNING_EPSILON]
+
+        # Exact scores for the survivors from their stored rows, computed
+        # exactly like an exhaustive ranking
+        exact = (self.matrix[survivors] @ query.T).toarray().ravel() if len(survivors) else np.zeros(0)
+        ranked = survivors[np.lexsort((survivors, -exact))][:top_k]
+        ranked_scores = dict(zip(survivors, exact))
+
+        # Resumes sharing no terms with the query score 0 and fill the tail in
+        # index order; the first few ids not seen lie below len(candidates) + top_k
+        if len(ranked) < top_k:
+            unseen = np.setdiff1d(np.arange(min(len(candidates) + top_k, n_resumes)), candidates)[:top_k - len(ranked)]
+            ranked = np.concatenate([ranked, unseen])
+
+        self.last_query_stats = {
+            'resumes': n_resumes,
+            'query_terms': len(terms),
+            'terms_processed': terms_processed,
+            'postings_scanned': postings_scanned,
+            'postings_total': int(postings.indptr[terms + 1].sum() - postings.indptr[terms].sum()) if len(terms) else 0,
+            'candidates_scored': len(candidates),
+            'survivors': len(survivors)
+        }
+
+        return [{
+            'resume_id': self.resume_ids[i],
+            'candidate_name': self.candidate_names[i],
+            'cosine_score': ranked_scores.get(i, 0.0)
+        } for i in ranked]
@@ -1,70 +1,215 @@
 import PyPDF2
 import docx2txt
+import io
+import os
+import queue
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
 from text_processor import extract_experience_years
+from parsed_document import ParsedDocument, as_document
+from parse_cache import ParseCache, content_key
+import stage_timing
+from stage_timing import timed, timer
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+# Bump whenever extraction changes so cached parse results are not reused
+PARSER_VERSION = "2"
+
+# Work bounds for a single PDF: pages read, bytes of extracted text kept and
+# wall time before the pages extracted so far are returned
+PDF_MAX_PAGES = 50
+PDF_MAX_TEXT_BYTES = 1024 * 1024
+PDF_TIMEOUT_SECONDS = 30.0
+
+# Documents with at least this many pages are split across page worker
+# processes; shorter ones are not worth the round trip
+PDF_PARALLEL_MIN_PAGES = 8
+PDF_PAGES_PER_TASK = 4
+
+# Page worker pool, created on the first long PDF and reused afterwards
+_page_pool = {'executor': None, 'workers': 0}
+
+# Field extraction patterns, compiled once
+NAME_PATTERNS = [
+    re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'),  # Standard name pattern
+    re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z]\.?\s*[A-Z][a-z]+)*)'),  # With middle initial
+    re.compile(r'Name[:\s]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)'),  # With "Name:" prefix
+]
+# Lines that look like addresses, emails or phone numbers rather than names
+NOT_A_NAME_PATTERN = re.compile(r'.*@\w+|.*\d{3}.*\d{3}.*\d{4}|.*street|.*road|.*avenue|.*drive|.*email|.*phone')
+FALLBACK_NAME_PATTERN = re.compile(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+')
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE_PATTERN = re.compile(r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')
+
+def _as_stream(source):
+    """Wrap in-memory bytes so readers that take a path or binary file also accept them"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+def _extract_page_range(data, start, stop):
+    """Extract pages [start, stop) of a PDF in a page worker process"""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [pdf_reader.pages[i].extract_text() for i in range(start, stop)]
+
+def _get_page_pool(workers):
+    """Shared process pool for page-parallel extraction"""
+    if _page_pool['executor'] is None or _page_pool['workers'] != workers:
+        if _page_pool['executor'] is not None:
+            _page_pool['executor'].shutdown(wait=False, cancel_futures=True)
+        _page_pool['executor'] = ProcessPoolExecutor(max_workers=workers)
+        _page_pool['workers'] = workers
+    return _page_pool['executor']
+
+def _iter_pdf_pages(source, pdf_reader, n_pages, page_workers, deadline):
+    """Yield page texts in order, from page worker processes for long documents"""
+    if page_workers > 1 and n_pages >= PDF_PARALLEL_MIN_PAGES:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+        executor = _get_page_pool(page_workers)
+        futures = [executor.submit(_extract_page_range, data, start, min(start + PDF_PAGES_PER_TASK, n_pages))
+                   for start in range(0, n_pages, PDF_PAGES_PER_TASK)]
+        try:
+            for future in futures:
+                yield from future.result(timeout=max(deadline - time.perf_counter(), 0))
+        finally:
+            # Stop queued pages once the caller has enough text or runs out of time
+            for future in futures:
+                future.cancel()
+    else:
+        # Pages are extracted by a daemon thread so that a page that never
+        # finishes cannot hold the caller past the deadline
+        texts = queue.Queue()
+        stop = threading.Event()
+        
+        def extract_pages():
+            try:
+                for i in range(n_pages):
+                    if stop.is_set():
+                        return
+                    texts.put((pdf_reader.pages[i].extract_text(), None))
+            except Exception as e:
+                texts.put((None, e))
+        
+        threading.Thread(target=extract_pages, daemon=True).start()
+        try:
+            for _ in range(n_pages):
+                remaining = deadline - time.perf_counter()
+                if remaining < 0:
+                    raise FutureTimeoutError()
+                try:
+                    page_text, error = texts.get(timeout=remaining)
+                except queue.Empty:
+                    raise FutureTimeoutError()
+                if error is not None:
+                    raise error
+                yield page_text
+        finally:
+            stop.set()
+
+@timed('parse.pdf_text')
+def extract_pdf_text(source, max_pages=PDF_MAX_PAGES, max_text_bytes=PDF_MAX_TEXT_BYTES,
+                     timeout=PDF_TIMEOUT_SECONDS, page_workers=None):
+    """Extract text from a PDF within page, size and time bounds.
+    
+    Returns (text, stats). stats has the extraction time in 'seconds', the
+    pages read and in the document, and whether the text was 'truncated' by
+    the page or byte limit or cut short by the timeout ('timed_out'). Pages
+    of long documents are extracted in parallel by page_workers processes
+    (default: CPU count; 1 extracts serially, in a background thread). The
+    timeout also holds while a single page is being extracted: on a timeout,
+    pages already running in a page worker or the extraction thread finish in
+    the background and are discarded.
+    """
+    start = time.perf_counter()
+    stats = {'seconds': 0.0, 'pages': 0, 'total_pages': 0, 'truncated': False, 'timed_out': False}
+    pages = []
     try:
-        with open(file_path, 'rb') as pdf_file:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+        # Page workers need the document as bytes, so read a file object once
+        if hasattr(source, 'read'):
+            if hasattr(source, 'getvalue'):
+                source = source.getvalue()
+            else:
+                source.seek(0)
+                source = source.read()
+        pdf_reader = PyPDF2.PdfReader(_as_stream(source))
+        stats['total_pages'] = len(pdf_reader.pages)
+        n_pages = min(stats['total_pages'], max_pages)
+        stats['truncated'] = n_pages < stats['total_pages']
+        
+        page_workers = page_workers or os.cpu_count() or 1
+        text_bytes = 0
+        try:
+            for page_text in _iter_pdf_pages(source, pdf_reader, n_pages, page_workers, start + timeout):
+                page_bytes = len(page_text.encode('utf-8'))
+                if text_bytes + page_bytes > max_text_bytes:
+                    # Keep what fits of this page and stop reading
+                    pages.append(page_text.encode('utf-8')[:max_text_bytes - text_bytes].decode('utf-8', 'ignore'))
+                    stats['truncated'] = True
+                    break
+                pages.append(page_text)
+                text_bytes += page_bytes
+        except FutureTimeoutError:
+            stats['timed_out'] = True
+            print(f"PDF extraction timed out after {timeout}s; keeping {len(pages)} pages")
     except Exception as e:
         print(f"Error reading PDF file: {e}")
-        return ""
+        pages = []
+    stats['pages'] = len(pages)
+    stats['seconds'] = time.perf_counter() - start
+    return "".join(pages), stats
+
+def extract_text_from_pdf(source, **limits):
+    """Extract text from a PDF given as a path, bytes or binary file-like object"""
+    return extract_pdf_text(source, **limits)[0]
 
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
+@timed('parse.docx_text')
+def extract_text_from_docx(source):
+    """Extract text from a DOCX given as a path, bytes or binary file-like object"""
     try:
-        text = docx2txt.process(file_path)
+        text = docx2txt.process(_as_stream(source))
         return text
     except Exception as e:
         print(f"Error reading DOCX file: {e}")
         return ""
 
 def extract_candidate_name(text):
-    """Extract candidate name from resume text with improved accuracy"""
-    # Look for name patterns (improved approach)
-    lines = text.split('\n')
-    
-    # Common name patterns
-    name_patterns = [
-        r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # Standard name pattern
-        r'^([A-Z][a-z]+(?:\s+[A-Z]\.?\s*[A-Z][a-z]+)*)',  # With middle initial
-        r'Name[:\s]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',  # With "Name:" prefix
-    ]
+    """Extract candidate name from resume text (or a ParsedDocument) with improved accuracy"""
+    document = as_document(text)
     
     # Check first few lines for names
-    for i, line in enumerate(lines[:10]):
-        line = line.strip()
+    for line, lower_line in zip(document.stripped_lines[:10], document.lower_lines[:10]):
         # Skip lines that look like addresses, emails, or phone numbers
-        if line and not re.match(r'.*@\w+|.*\d{3}.*\d{3}.*\d{4}|.*street|.*road|.*avenue|.*drive|.*email|.*phone', line.lower()):
+        if line and not NOT_A_NAME_PATTERN.match(lower_line.strip()):
             # Try each pattern
-            for pattern in name_patterns:
-                match = re.search(pattern, line)
+            for pattern in NAME_PATTERNS:
+                match = pattern.search(line)
                 if match:
                     return match.group(1)
     
     # Fallback: return first line that looks like a name
-    for i, line in enumerate(lines[:5]):
-        line = line.strip()
+    for line in document.stripped_lines[:5]:
         # Return first line that looks like a name (has at least two words, starts with capital)
-        if line and re.match(r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+', line):
+        if line and FALLBACK_NAME_PATTERN.match(line):
             return line
             
     return "Unknown Candidate"
 
 def extract_contact_info(text):
-    """Extract contact information from resume"""
+    """Extract contact information from resume text (or a ParsedDocument)"""
+    text = as_document(text).text
+    
     # Extract email
-    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    email_match = EMAIL_PATTERN.search(text)
     email = email_match.group(0) if email_match else ""
     
     # Extract phone number
-    phone_match = re.search(r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}', text)
+    phone_match = PHONE_PATTERN.search(text)
     phone = phone_match.group(0) if phone_match else ""
     
     return {
@@ -73,44 +218,215 @@ def extract_contact_info(text):
     }
 
 def extract_education(text):
-    """Extract education information"""
-    # Common education keywords
-    edu_keywords = ['education', 'university', 'college', 'degree', 'bachelor', 'master', 'phd', 'bs', 'ms', 'ba', 'ma']
-    
-    # Split text into lines
-    lines = text.split('\n')
-    education_lines = []
-    
-    for i, line in enumerate(lines):
-        if any(keyword in line.lower() for keyword in edu_keywords):
-            # Include this line and a few following lines
-            for j in range(i, min(i+5, len(lines))):
-                if lines[j].strip():
-                    education_lines.append(lines[j].strip())
-            break
-    
-    return ' '.join(education_lines)
-
-def parse_resume(file_path):
-    """Main function to parse resume based on file extension"""
-    if file_path.endswith('.pdf'):
-        text = extract_text_from_pdf(file_path)
-        candidate_name = extract_candidate_name(text)
-    elif file_path.endswith('.docx'):
-        text = extract_text_from_docx(file_path)
-        candidate_name = extract_candidate_name(text)
-    else:
+    """Extract education information from resume text (or a ParsedDocument)"""
+    document = as_document(text)
+    if document.education_section is None:
+        return ''
+    
+    # The first line mentioning education and a few following lines
+    start, end = document.education_section
+    return ' '.join(line for line in document.stripped_lines[start:end] if line)
+
+@timed('parse_resume')
+def parse_resume(source, cache=None, file_name=None, max_pages=PDF_MAX_PAGES,
+                 max_text_bytes=PDF_MAX_TEXT_BYTES, timeout=PDF_TIMEOUT_SECONDS, page_workers=None):
+    """Main function to parse resume based on file extension.
+    
+    source is a file path, the file's bytes or a binary file-like object (such
+    as a Streamlit upload). For bytes, or a file object without a name, pass
+    file_name so the format can be told from its extension. The PDF limits
+    are passed to extract_pdf_text, and the result's 'extraction' entry
+    reports how long extraction took and whether the text was cut short.
+    """
+    if file_name is None:
+        file_name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(file_name))[1].lower()
+    if extension not in ('.pdf', '.docx'):
         raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
     
-    # Extract additional information
-    contact_info = extract_contact_info(text)
-    education = extract_education(text)
-    experience_years = extract_experience_years(text)
+    # In-memory input is read once and shared by the cache key and the extractor
+    if hasattr(source, 'read'):
+        source = source.read()
     
-    return {
+    # A repeat upload of the same file skips extraction entirely
+    if cache is not None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+        # PDF limits change what is extracted, so they are part of the key
+        version = PARSER_VERSION
+        if extension == '.pdf':
+            version = f"{PARSER_VERSION}/{max_pages}p/{max_text_bytes}b"
+        cache_key = content_key(data, version, extension)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    if extension == '.pdf':
+        text, extraction = extract_pdf_text(source, max_pages=max_pages, max_text_bytes=max_text_bytes,
+                                            timeout=timeout, page_workers=page_workers)
+    else:
+        start = time.perf_counter()
+        text = extract_text_from_docx(source)
+        extraction = {'seconds': time.perf_counter() - start, 'pages': None, 'total_pages': None,
+                      'truncated': False, 'timed_out': False}
+    with timer('parse.fields'):
+        # Split and normalize the text once for every field extractor
+        document = ParsedDocument(text)
+        candidate_name = extract_candidate_name(document)
+        
+        # Extract additional information
+        contact_info = extract_contact_info(document)
+        education = extract_education(document)
+        experience_years = extract_experience_years(document)
+    
+    resume_data = {
         'text': text,
         'candidate_name': candidate_name,
         'contact_info': contact_info,
         'education': education,
-        'experience_years': experience_years
-    }
\ No newline at end of file
+        'experience_years': experience_years,
+        'extraction': extraction
+    }
+    
+    # Failed and timed-out extractions are not cached so they are retried next time
+    if cache is not None and text.strip() and not extraction['timed_out']:
+        cache.put(cache_key, resume_data)
+    
+    return resume_data
+
+# Per-process settings for parse_resumes workers, set by _init_parse_worker
+_worker_state = {'preprocess': False, 'features': False, 'cache': None, 'page_workers': None, 'timings': None}
+
+def _init_parse_worker(preprocess, cache_path, page_workers=1, features=False, timings=False):
+    """Load the NLP models and open the parse cache once per worker process"""
+    if _worker_state['cache'] is not None:
+        _worker_state['cache'].close()
+    # Matching features are computed from the preprocessed text
+    preprocess = preprocess or features
+    _worker_state['preprocess'] = preprocess
+    _worker_state['features'] = features
+    # Pool workers already use every core, so they extract PDF pages serially
+    _worker_state['page_workers'] = page_workers
+    _worker_state['cache'] = ParseCache(cache_path) if cache_path else None
+    
+    # Stage timings are collected per resume and sent back with its result
+    if timings and _worker_state['timings'] is None:
+        _worker_state['timings'] = stage_timing.HistogramSink()
+        stage_timing.set_sink(_worker_state['timings'])
+    
+    if preprocess:
+        from text_processor import warmup
+        # preprocess_text only needs the NLTK models; SpaCy is never loaded here
+        warmup(spacy_model=False)
+
+def _parse_resume_worker(file_path):
+    """Parse one resume for parse_resumes, reporting failures instead of raising"""
+    # In-memory files arrive as (file_name, data) and are reported under their name
+    source, file_name = file_path, None
+    if isinstance(file_path, tuple):
+        file_name, source = file_path
+        file_path = file_name
+    try:
+        resume_data = parse_resume(source, cache=_worker_state['cache'], file_name=file_name,
+                                   page_workers=_worker_state['page_workers'])
+        if not resume_data['text'].strip():
+            raise ValueError("No text could be extracted from the file")
+        if _worker_state['preprocess']:
+            from text_processor import preprocess_text
+            resume_data['processed_text'] = preprocess_text(resume_data['text'])
+        if _worker_state['features']:
+            from matcher import prepare_resume_features
+            resume_data.update(prepare_resume_features(resume_data['processed_text']))
+        result = {'file_path': file_path, 'resume': resume_data, 'error': None}
+    except Exception as e:
+        result = {'file_path': file_path, 'resume': None, 'error': f"{type(e).__name__}: {e}"}
+    if _worker_state['timings'] is not None:
+        result['timings'] = _worker_state['timings'].drain()
+    return result
+
+def _merge_worker_timings(result):
+    """Record the stage timings a pool worker sent back with a result in this process"""
+    stage_timing.merge(result.pop('timings', None))
+    return result
+
+def create_parse_pool(workers=None, preprocess=False, cache_path=None, features=False, timings=None):
+    """Long-lived parse worker pool that iter_parse_resumes can share between batches.
+    
+    With timings (default: whether stage timing is on in this process), workers
+    time their stages and parse_resumes/iter_parse_resumes record them here.
+    """
+    if timings is None:
+        timings = stage_timing.enabled()
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                               initializer=_init_parse_worker,
+                               initargs=(preprocess, cache_path, 1, features, timings))
+
+def parse_resumes(file_paths, workers=None, chunksize=None, preprocess=False, cache_path=None, features=False):
+    """Parse many resumes in a process pool, returning results in input order.
+    
+    Each item is a file path or a (file_name, data) tuple holding the file's
+    bytes, which avoids writing uploads to disk first. Each result is a dict
+    with 'file_path' (the path, or file_name for in-memory files), 'resume'
+    (the parse_resume dict, or None) and 'error' (None, or a message for a
+    file that could not be parsed).
+    With preprocess=True each resume also gets 'processed_text' from
+    preprocess_text, computed in the worker; features=True adds the
+    job-independent matching features as well (see prepare_resume_features).
+    With cache_path set, every worker shares the ParseCache stored at that path.
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return []
+    
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    
+    # Not worth starting a pool (and loading models again) for one worker
+    if workers == 1:
+        _init_parse_worker(preprocess, cache_path, page_workers=None, features=features)
+        return [_parse_resume_worker(file_path) for file_path in file_paths]
+    
+    # Send files in chunks so each worker round trip parses several resumes
+    if chunksize is None:
+        chunksize = max(1, len(file_paths) // (workers * 4))
+    
+    with create_parse_pool(workers, preprocess, cache_path, features) as executor:
+        return [_merge_worker_timings(result)
+                for result in executor.map(_parse_resume_worker, file_paths, chunksize=chunksize)]
+
+def iter_parse_resumes(file_paths, workers=None, in_flight=16, preprocess=False, cache_path=None,
+                       features=False, executor=None):
+    """Streaming parse_resumes: yields results in input order with bounded work in flight.
+    
+    file_paths may be a lazy iterator; a new path is only pulled once fewer than
+    in_flight files are being parsed, so memory does not grow with the input.
+    Results have the same shape as parse_resumes. Pass a pool from
+    create_parse_pool as executor to reuse its warm workers; it is left
+    running afterwards (and its own preprocess/features settings apply).
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_parse_worker(preprocess, cache_path, page_workers=None, features=features)
+            for file_path in file_paths:
+                yield _parse_resume_worker(file_path)
+            return
+        executor = create_parse_pool(workers, preprocess, cache_path, features)
+    
+    pending = deque()
+    try:
+        for file_path in file_paths:
+            pending.append(executor.submit(_parse_resume_worker, file_path))
+            if len(pending) >= in_flight:
+                yield _merge_worker_timings(pending.popleft().result())
+        while pending:
+            yield _merge_worker_timings(pending.popleft().result())
+    finally:
+        # Stop queued work if the consumer abandons the stream early
+        for future in pending:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,204 @@
+import re
+import numpy as np
+from text_processor import SKILL_KEYWORDS, extract_skills_advanced
+
+# Bit i of a skill bitmap is SKILL_TAXONOMY[i]; the order find_skills reports skills in
+SKILL_TAXONOMY = tuple(dict.fromkeys(SKILL_KEYWORDS))
+SKILL_BITS = {skill: i for i, skill in enumerate(SKILL_TAXONOMY)}
+# 64-bit words per resume bitmap in a SkillIndex
+BITMAP_WORDS = (len(SKILL_TAXONOMY) + 63) // 64
+
+QUERY_OPERATORS = ('and', 'or', 'not')
+QUERY_TOKEN = re.compile(r'\(|\)|[^\s()]+')
+
+def skill_bitmap(skills):
+    """Skills as an integer bitmap over SKILL_TAXONOMY; names outside the taxonomy are ignored"""
+    bitmap = 0
+    for skill in skills:
+        bit = SKILL_BITS.get(skill)
+        if bit is not None:
+            bitmap |= 1 << bit
+    return bitmap
+
+def skill_count(bitmap):
+    """Number of skills set in a bitmap (population count)"""
+    return bin(bitmap).count('1')
+
+def skills_from_bitmap(bitmap):
+    """The skills set in a bitmap, in taxonomy order"""
+    skills = []
+    while bitmap:
+        lowest = bitmap & -bitmap
+        skills.append(SKILL_TAXONOMY[lowest.bit_length() - 1])
+        bitmap ^= lowest
+    return skills
+
+def bitmap_words(bitmap):
+    """An integer bitmap as BITMAP_WORDS uint64 words, lowest bits first"""
+    return np.array([(bitmap >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(BITMAP_WORDS)], dtype=np.uint64)
+
+def words_bitmap(words):
+    """Inverse of bitmap_words"""
+    bitmap = 0
+    for i, word in enumerate(words):
+        bitmap |= int(word) << (64 * i)
+    return bitmap
+
+class SkillIndex:
+    """Skill bitmaps of a resume pool with boolean skill queries.
+
+    Every resume's skills are stored as a row of BITMAP_WORDS uint64 words
+    over SKILL_TAXONOMY. Queries such as "python AND (aws OR gcp) AND NOT php"
+    run on a posting bitset per skill (one bit per resume, packed into uint64
+    words), so an expression costs a few bitwise operations over n / 64 words.
+    Postings are rebuilt after resumes are added.
+    """
+    def __init__(self):
+        self.resume_ids = []
+        self.candidate_names = []
+        self.rows = np.zeros((0, BITMAP_WORDS), dtype=np.uint64)
+        self._postings = None
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    def add_resumes(self, resumes_data, resume_ids=None):
+        """Index resumes by their 'skills' (extracted from 'text' when missing)"""
+        resumes_data = list(resumes_data)
+        rows = np.zeros((len(resumes_data), BITMAP_WORDS), dtype=np.uint64)
+        for i, resume_data in enumerate(resumes_data):
+            bitmap = resume_data.get('skill_bitmap')
+            if bitmap is None:
+                skills = (resume_data['skills'] if 'skills' in resume_data
+                          else extract_skills_advanced(resume_data['text']))
+                bitmap = skill_bitmap(skills)
+            rows[i] = bitmap_words(bitmap)
+        self.add_bitmaps(rows, resume_ids, [resume_data.get('candidate_name') for resume_data in resumes_data])
+
+    def add_bitmaps(self, rows, resume_ids=None, candidate_names=None):
+        """Index resumes given directly as an (n, BITMAP_WORDS) uint64 array of skill bitmaps"""
+        rows = np.asarray(rows, dtype=np.uint64).reshape(-1, BITMAP_WORDS)
+        if resume_ids is None:
+            start = len(self.resume_ids)
+            resume_ids = range(start, start + len(rows))
+        self.resume_ids.extend(resume_ids)
+        self.candidate_names.extend(candidate_names if candidate_names is not None else [None] * len(rows))
+        self.rows = np.concatenate([self.rows, rows]) if len(self.rows) else rows
+        self._postings = None
+
+    def _build_postings(self):
+        """One packed bitset over resumes per skill, plus the mask of valid resume bits"""
+        n = len(self.rows)
+        n_words = (n + 63) // 64
+        postings = np.zeros((len(SKILL_TAXONOMY), n_words), dtype=np.uint64)
+        padding = np.zeros(n_words * 64 - n, dtype=bool)
+        for bit in range(len(SKILL_TAXONOMY)):
+            has_skill = ((self.rows[:, bit // 64] >> np.uint64(bit % 64)) & np.uint64(1)).astype(bool)
+            postings[bit] = np.packbits(np.concatenate([has_skill, padding]), bitorder='little').view(np.uint64)
+        valid = np.packbits(np.concatenate([np.ones(n, dtype=bool), padding]), bitorder='little').view(np.uint64)
+        self._postings = (postings, valid)
+
+    def _bitset_positions(self, bitset):
+        bits = np.unpackbits(bitset.view(np.uint8), count=len(self.rows), bitorder='little')
+        return np.flatnonzero(bits)
+
+    def posting(self, skill):
+        """Positions of the resumes that have a skill"""
+        return self._bitset_positions(self.evaluate(skill))
+
+    def evaluate(self, expression):
+        """A boolean skill expression as a packed bitset over the indexed resumes.
+
+        Skills are matched case-insensitively and may span words ("machine
+        learning"); AND binds tighter than OR, NOT tighter than both, and
+        parentheses group. Raises ValueError for unknown skills or bad syntax.
+        """
+        if self._postings is None:
+            self._build_postings()
+        # A single skill evaluates to its posting row, so hand back a copy
+        return np.array(_QueryParser(QUERY_TOKEN.findall(expression.lower()), self._postings).parse())
+
+    def positions(self, expression):
+        """Positions (insertion order) of the resumes matching an expression"""
+        return self._bitset_positions(self.evaluate(expression))
+
+    def query(self, expression):
+        """Ids of the resumes matching a boolean skill expression"""
+        return [self.resume_ids[i] for i in self.positions(expression)]
+
+    def count(self, expression):
+        """How many resumes match an expression"""
+        return int(np.unpackbits(self.evaluate(expression).view(np.uint8)).sum())
+
+    def skills(self, position):
+        """The skills of the resume at a position, in taxonomy order"""
+        return skills_from_bitmap(words_bitmap(self.rows[position]))
+
+    def missing_skills(self, jd_skills, positions=None):
+        """For each resume (or those at positions), the job skills it lacks, in taxonomy order"""
+        jd_words = bitmap_words(skill_bitmap(jd_skills))
+        rows = self.rows if positions is None else self.rows[positions]
+        return [skills_from_bitmap(words_bitmap(row)) for row in jd_words & ~rows]
+
+class _QueryParser:
+    """Recursive descent over query tokens, evaluating straight to posting bitsets"""
+    def __init__(self, tokens, postings):
+        self.tokens = tokens
+        self.position = 0
+        self.postings, self.valid = postings
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def is_operator(self, token):
+        return token in QUERY_OPERATORS
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty skill query")
+        result = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected '{self.peek()}' in skill query")
+        return result
+
+    def parse_or(self):
+        result = self.parse_and()
+        while self.peek() == 'or':
+            self.position += 1
+            result = result | self.parse_and()
+        return result
+
+    def parse_and(self):
+        result = self.parse_not()
+        while self.peek() == 'and':
+            self.position += 1
+            result = result & self.parse_not()
+        return result
+
+    def parse_not(self):
+        if self.peek() == 'not':
+            self.position += 1
+            return ~self.parse_not() & self.valid
+        return self.parse_atom()
+
+    def parse_atom(self):
+        token = self.peek()
+        if token == '(':
+            self.position += 1
+            result = self.parse_or()
+            if self.peek() != ')':
+                raise ValueError("Missing ')' in skill query")
+            self.position += 1
+            return result
+        if token is None or token == ')' or self.is_operator(token):
+            raise ValueError(f"Expected a skill in skill query, got {token or 'the end'}")
+
+        # Consecutive words form one skill name ("machine learning")
+        words = []
+        while self.peek() is not None and self.peek() not in ('(', ')') and not self.is_operator(self.peek()):
+            words.append(self.peek())
+            self.position += 1
+        skill = ' '.join(words)
+        if skill not in SKILL_BITS:
+            raise ValueError(f"Unknown skill '{skill}'")
+        return self.postings[SKILL_BITS[skill]]
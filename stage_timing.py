@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds (Prometheus style; +Inf is implicit)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROMETHEUS_METRIC = "resume_screening_stage_seconds"
+
+# Global sink and per-thread collectors. _active counts both, so the
+# instrumented hot paths only read one global while nothing is recording.
+_state = {'sink': None}
+_local = threading.local()
+_active = 0
+_active_lock = threading.Lock()
+_NO_TIMER = nullcontext()
+
+class HistogramSink:
+    """In-memory per-stage latency histograms, safe to share between threads"""
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage):
+        histogram = self._stages.get(stage)
+        if histogram is None:
+            histogram = self._stages[stage] = {'counts': [0] * (len(self.buckets) + 1),
+                                               'count': 0, 'sum': 0.0, 'max': 0.0}
+        return histogram
+
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self._stage(stage)
+            histogram['counts'][bisect_left(self.buckets, seconds)] += 1
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            histogram['max'] = max(histogram['max'], seconds)
+
+    def merge(self, snapshot):
+        """Add a snapshot() taken elsewhere (e.g. in a worker process) to these histograms"""
+        with self._lock:
+            for stage, other in snapshot.items():
+                histogram = self._stage(stage)
+                histogram['counts'] = [a + b for a, b in zip(histogram['counts'], other['counts'])]
+                histogram['count'] += other['count']
+                histogram['sum'] += other['sum']
+                histogram['max'] = max(histogram['max'], other['max'])
+
+    def snapshot(self):
+        """Picklable copy of every stage's histogram"""
+        with self._lock:
+            return {stage: dict(histogram, counts=list(histogram['counts']))
+                    for stage, histogram in self._stages.items()}
+
+    def drain(self):
+        """snapshot() and reset() in one step"""
+        with self._lock:
+            stages, self._stages = self._stages, {}
+            return stages
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+    def quantile(self, stage, q):
+        """Estimate a latency quantile from the buckets, interpolating like Prometheus' histogram_quantile"""
+        histogram = self.snapshot().get(stage)
+        return self._quantile(histogram, q) if histogram else 0.0
+
+    def _quantile(self, histogram, q):
+        if not histogram['count']:
+            return 0.0
+        rank = q * histogram['count']
+        cumulative = 0
+        for i, count in enumerate(histogram['counts']):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else histogram['max']
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return histogram['max']
+
+    def summary(self):
+        """One row per stage: calls, total and mean seconds, estimated p50/p95 and max, slowest stage first"""
+        rows = []
+        for stage, histogram in self.snapshot().items():
+            rows.append({
+                'stage': stage,
+                'calls': histogram['count'],
+                'total_seconds': histogram['sum'],
+                'mean_ms': histogram['sum'] / histogram['count'] * 1000 if histogram['count'] else 0.0,
+                'p50_ms': self._quantile(histogram, 0.5) * 1000,
+                'p95_ms': self._quantile(histogram, 0.95) * 1000,
+                'max_ms': histogram['max'] * 1000
+            })
+        return sorted(rows, key=lambda row: row['total_seconds'], reverse=True)
+
+    def to_prometheus(self, metric=PROMETHEUS_METRIC):
+        """Every stage as a Prometheus histogram in the text exposition format"""
+        lines = [f"# HELP {metric} Time spent in each resume screening stage.",
+                 f"# TYPE {metric} histogram"]
+        for stage, histogram in sorted(self.snapshot().items()):
+            label = stage.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {histogram["sum"]!r}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+class LoggingSink:
+    """Logs every timed stage (at DEBUG by default) through the standard logging module"""
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger("resume_screening.timing")
+        self.level = level
+
+    def record(self, stage, seconds):
+        self.logger.log(self.level, "%s took %.3f ms", stage, seconds * 1000)
+
+    def merge(self, snapshot):
+        for stage, histogram in snapshot.items():
+            self.logger.log(self.level, "%s: %d calls, %.3f ms total", stage, histogram['count'],
+                            histogram['sum'] * 1000)
+
+def _adjust_active(delta):
+    global _active
+    with _active_lock:
+        _active += delta
+
+def set_sink(sink):
+    """Send every timed stage to sink (a HistogramSink, LoggingSink or similar); None turns timing off"""
+    previous = _state['sink']
+    _state['sink'] = sink
+    _adjust_active((sink is not None) - (previous is not None))
+    return previous
+
+def get_sink():
+    return _state['sink']
+
+def enabled():
+    """Whether anything is currently recording stage timings"""
+    return _active > 0
+
+def record(stage, seconds):
+    """Send one measurement to the global sink and to this thread's collectors"""
+    sink = _state['sink']
+    if sink is not None:
+        sink.record(stage, seconds)
+    for collector in getattr(_local, 'collectors', ()):
+        collector.record(stage, seconds)
+
+def merge(snapshot):
+    """Add timings measured elsewhere (e.g. returned by a worker process) like record() does"""
+    if not snapshot:
+        return
+    sink = _state['sink']
+    if sink is not None:
+        sink.merge(snapshot)
+    for collector in getattr(_local, 'collectors', ()):
+        collector.merge(snapshot)
+
+@contextmanager
+def _timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def timer(stage):
+    """Context manager timing a block as stage; a shared no-op when timing is off"""
+    if not _active:
+        return _NO_TIMER
+    return _timer(stage)
+
+def timed(stage):
+    """Decorator timing every call of a function as stage"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+@contextmanager
+def collect(buckets=DEFAULT_BUCKETS):
+    """Collect the stages timed by this thread inside the block (e.g. one batch) into a new HistogramSink"""
+    collector = HistogramSink(buckets)
+    if not hasattr(_local, 'collectors'):
+        _local.collectors = []
+    _local.collectors.append(collector)
+    _adjust_active(1)
+    try:
+        yield collector
+    finally:
+        _adjust_active(-1)
+        _local.collectors.remove(collector)
@@ -0,0 +1,259 @@
+"""
+Test the asynchronous screening API
+"""
+import asyncio
+import csv
+import io
+import json
+import threading
+import os
+import tempfile
+import time
+import uuid
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+from tornado.testing import bind_unused_port
+from tornado.httpserver import HTTPServer
+import api_server
+from api_server import make_app, create_executor
+from job_queue import JobQueue
+import stage_timing
+from matcher import ResumeMatcher
+from test_bulk_parsing import write_docx
+from text_processor import preprocess_text
+from utils import load_sample_data, create_sample_resumes
+
+def multipart_body(fields, files):
+    """Encode form fields and (name, data) files as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for file_name, data in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="resumes"; filename="{file_name}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+def expected_ranking(jd_text, resumes):
+    """Rank raw resume texts directly with ResumeMatcher"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(jd_text))
+    return matcher.match_resumes([{'candidate_name': name, 'text': preprocess_text(text)} for name, text in resumes])
+
+async def run_checks(base_url):
+    client = AsyncHTTPClient()
+    jd_text = load_sample_data()
+    samples = create_sample_resumes()
+
+    health = json.loads((await client.fetch(f"{base_url}/api/health")).body)
+    print(f"Health check: {'PASS' if health['status'] == 'ok' else 'FAIL'}")
+
+    # Batch screening of uploaded files, with one unreadable file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = []
+        for i, resume in enumerate(samples):
+            path = os.path.join(tmp_dir, f"resume_{i}.docx")
+            write_docx(path, resume['text'])
+            with open(path, 'rb') as f:
+                files.append((f"resume_{i}.docx", f.read()))
+        files.append(("broken.docx", b"not a docx"))
+    body, content_type = multipart_body({'job_description': jd_text}, files)
+    response = await client.fetch(f"{base_url}/api/screen", method="POST", body=body,
+                                  headers={'Content-Type': content_type}, request_timeout=300)
+    screened = json.loads(response.body)
+    names = [result['candidate_name'] for result in screened['results']]
+    expected_names = [result['candidate_name'] for result in
+                      expected_ranking(jd_text, [(r['candidate_name'], r['text']) for r in samples])]
+    print(f"Screen endpoint ranks uploads: {'PASS' if names == expected_names else 'FAIL'}")
+    print(f"Unreadable upload reported: {'PASS' if [e['file_name'] for e in screened['errors']] == ['broken.docx'] else 'FAIL'}")
+
+    # Batch scoring of raw texts must match ResumeMatcher exactly
+    resumes = [{'candidate_name': r['candidate_name'], 'text': r['text']} for r in samples] * 20
+    response = await client.fetch(f"{base_url}/api/score", method="POST", request_timeout=300,
+                                  body=json.dumps({'job_description': jd_text, 'resumes': resumes}))
+    scored = json.loads(response.body)['results']
+    expected = expected_ranking(jd_text, [(r['candidate_name'], r['text']) for r in resumes])
+    same = all(a['candidate_name'] == b['candidate_name'] and abs(a['score'] - b['score']) < 1e-9
+               for a, b in zip(scored, expected)) and len(scored) == len(expected)
+    print(f"Score endpoint matches ResumeMatcher: {'PASS' if same else 'FAIL'}")
+
+    # The cascade returns only the candidates it keeps, with its stage stats
+    response = await client.fetch(f"{base_url}/api/score", method="POST", request_timeout=300,
+                                  body=json.dumps({'job_description': jd_text, 'resumes': resumes, 'cascade': True}))
+    cascaded = json.loads(response.body)
+    kept_names = [r['candidate_name'] for r in expected if r['decision'] != 'Not Fit']
+    print(f"Score endpoint runs the cascade: "
+          f"{'PASS' if [r['candidate_name'] for r in cascaded['results']] == kept_names and cascaded['stages'][0]['candidates'] == len(resumes) else 'FAIL'} "
+          f"({', '.join(row['stage'] + ' pruned ' + str(row['pruned']) for row in cascaded['stages'])})")
+
+    # The event loop must keep answering while a large batch is scored
+    big_batch = json.dumps({'job_description': jd_text, 'resumes': resumes * 10})
+    batch = asyncio.ensure_future(client.fetch(f"{base_url}/api/score", method="POST", body=big_batch,
+                                               request_timeout=600))
+    await asyncio.sleep(0.2)
+    latencies = []
+    while not batch.done():
+        start = time.perf_counter()
+        await client.fetch(f"{base_url}/api/health")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+    await batch
+    responsive = latencies and max(latencies) < 0.5
+    print(f"Health answered during a {len(resumes) * 10}-resume batch: {'PASS' if responsive else 'FAIL'} "
+          f"({len(latencies)} requests, slowest {max(latencies or [0]) * 1000:.0f} ms)")
+
+    metrics = (await client.fetch(f"{base_url}/metrics")).body.decode()
+    worker_stages = all(f'_count{{stage="{stage}"}}' in metrics for stage in ('parse_resume', 'preprocess_text', 'match_resumes'))
+    print(f"Metrics include worker stages: {'PASS' if worker_stages else 'FAIL'}")
+
+    try:
+        await client.fetch(f"{base_url}/api/score", method="POST", body=json.dumps({'resumes': []}))
+        print("Missing job description rejected: FAIL")
+    except HTTPClientError as e:
+        print(f"Missing job description rejected: {'PASS' if e.code == 400 else 'FAIL'}")
+    try:
+        await client.fetch(f"{base_url}/api/score", method="POST", body=json.dumps(["not", "an", "object"]))
+        print("Non-object body rejected: FAIL")
+    except HTTPClientError as e:
+        print(f"Non-object body rejected: {'PASS' if e.code == 400 else 'FAIL'}")
+
+def parse_events(stream):
+    """Split a server-sent event stream into (event, data) pairs"""
+    events = []
+    for message in stream.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if not line.startswith(":"))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+async def run_job_checks(base_url, jobs):
+    client = AsyncHTTPClient()
+    jd_text = load_sample_data()
+    samples = create_sample_resumes()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = []
+        for i in range(30):
+            resume = samples[i % len(samples)]
+            path = os.path.join(tmp_dir, f"resume_{i}.docx")
+            write_docx(path, resume['text'] + f"\nReference number {i}")
+            with open(path, 'rb') as f:
+                files.append((f"resume_{i}.docx", f.read()))
+    body, content_type = multipart_body({'job_description': jd_text}, files)
+
+    # Submitting returns at once; progress then streams over server-sent events
+    response = await client.fetch(f"{base_url}/api/jobs", method="POST", body=body,
+                                  headers={'Content-Type': content_type}, request_timeout=300)
+    submitted = json.loads(response.body)
+    print(f"Job accepted: {'PASS' if response.code == 202 and submitted['total'] == 30 else 'FAIL'}")
+
+    chunks = []
+    await client.fetch(f"{base_url}{submitted['events_url']}?top_k=5", request_timeout=300,
+                       streaming_callback=chunks.append)
+    events = parse_events(b"".join(chunks))
+    final = events[-1][1] if events else {}
+    progress = [data['processed'] for event, data in events if event == 'progress']
+    streamed = (events and events[-1][0] == 'done' and final['status'] == 'done' and
+                progress == sorted(progress) and len(final['results']) == 5)
+    print(f"Progress streamed as events: {'PASS' if streamed else 'FAIL'} ({len(events)} events)")
+
+    # Without a page the stream still sends a bounded one
+    default_top_k, api_server.EVENT_RESULTS_TOP_K = api_server.EVENT_RESULTS_TOP_K, 3
+    chunks = []
+    try:
+        await client.fetch(f"{base_url}{submitted['events_url']}", request_timeout=300, streaming_callback=chunks.append)
+    finally:
+        api_server.EVENT_RESULTS_TOP_K = default_top_k
+    default_events = parse_events(b"".join(chunks))
+    print(f"Events default to a bounded page: "
+          f"{'PASS' if default_events and len(default_events[-1][1]['results']) == 3 else 'FAIL'}")
+
+    polled = json.loads((await client.fetch(f"{base_url}{submitted['status_url']}")).body)
+    expected_names = [result['candidate_name'] for result in expected_ranking(
+        jd_text, [(samples[i % len(samples)]['candidate_name'], samples[i % len(samples)]['text'] + f"\nReference number {i}")
+                  for i in range(30)])]
+    print(f"Polled job ranks uploads: "
+          f"{'PASS' if [r['candidate_name'] for r in polled['results']] == expected_names else 'FAIL'}")
+
+    paged = json.loads((await client.fetch(f"{base_url}{submitted['status_url']}?top_k=10&offset=10")).body)
+    print(f"Polled job pages: "
+          f"{'PASS' if [r['candidate_name'] for r in paged['results']] == expected_names[10:20] and paged['offset'] == 10 else 'FAIL'}")
+    try:
+        await client.fetch(f"{base_url}{submitted['status_url']}?offset=-1")
+        print("Negative offset rejected: FAIL")
+    except HTTPClientError as e:
+        print(f"Negative offset rejected: {'PASS' if e.code == 400 else 'FAIL'}")
+
+    exported = (await client.fetch(f"{base_url}{submitted['status_url']}/export?format=csv")).body.decode()
+    exported_rows = list(csv.DictReader(io.StringIO(exported)))
+    print(f"Job export streams CSV: "
+          f"{'PASS' if [row['candidate_name'] for row in exported_rows] == expected_names and 'cosine_score' in exported_rows[0] else 'FAIL'}")
+
+    # Near-duplicate detection is a form option; copies reuse the first copy's scores
+    dedup_body, dedup_type = multipart_body({'job_description': jd_text, 'near_duplicate_threshold': '0.9'}, files)
+    response = await client.fetch(f"{base_url}/api/jobs", method="POST", body=dedup_body,
+                                  headers={'Content-Type': dedup_type}, request_timeout=300)
+    dedup_job = jobs.get(json.loads(response.body)['job_id'])
+    while not dedup_job.finished:
+        await asyncio.sleep(0.01)
+    deduplicated = dedup_job.snapshot(0)
+    print(f"Job near-duplicates counted: "
+          f"{'PASS' if deduplicated['scored'] == 30 and deduplicated['near_duplicates'] == 30 - len(samples) else 'FAIL'}")
+    bad_body, bad_type = multipart_body({'job_description': jd_text, 'near_duplicate_threshold': '1.5'}, files)
+    try:
+        await client.fetch(f"{base_url}/api/jobs", method="POST", body=bad_body, headers={'Content-Type': bad_type})
+        print("Bad near-duplicate threshold rejected: FAIL")
+    except HTTPClientError as e:
+        print(f"Bad near-duplicate threshold rejected: {'PASS' if e.code == 400 else 'FAIL'}")
+
+    # Hold the only runner and fill the queue: the next submission is refused
+    release = threading.Event()
+    blocker = jobs.submit(None, [], on_complete=lambda _: release.wait(30))
+    while blocker.status == 'queued':
+        await asyncio.sleep(0.01)
+    response = await client.fetch(f"{base_url}/api/jobs", method="POST", body=body,
+                                  headers={'Content-Type': content_type})
+    queued = json.loads(response.body)
+    try:
+        await client.fetch(f"{base_url}/api/jobs", method="POST", body=body, headers={'Content-Type': content_type})
+        print("Busy server refuses jobs: FAIL")
+    except HTTPClientError as e:
+        print(f"Busy server refuses jobs: {'PASS' if e.code == 503 and e.response.headers.get('Retry-After') else 'FAIL'}")
+
+    response = await client.fetch(f"{base_url}{queued['status_url']}", method="DELETE")
+    release.set()
+    while not jobs.get(queued['job_id']).finished:
+        await asyncio.sleep(0.01)
+    cancelled = json.loads((await client.fetch(f"{base_url}{queued['status_url']}")).body)
+    print(f"Job cancelled: {'PASS' if response.code == 202 and cancelled['status'] == 'cancelled' else 'FAIL'}")
+
+    try:
+        await client.fetch(f"{base_url}/api/jobs/0123abcd")
+        print("Unknown job is a 404: FAIL")
+    except HTTPClientError as e:
+        print(f"Unknown job is a 404: {'PASS' if e.code == 404 else 'FAIL'}")
+
+def test_api_server():
+    """Start the server on a free port and exercise every endpoint"""
+    async def main():
+        previous = stage_timing.set_sink(stage_timing.HistogramSink())
+        executor = create_executor(2, cache_path=None)
+        jobs = JobQueue(max_queued=1, job_workers=1, parse_workers=2, cache_path=None)
+        sock, port = bind_unused_port()
+        server = HTTPServer(make_app(executor, jobs=jobs))
+        server.add_sockets([sock])
+        try:
+            await run_checks(f"http://127.0.0.1:{port}")
+            await run_job_checks(f"http://127.0.0.1:{port}", jobs)
+        finally:
+            server.stop()
+            jobs.shutdown()
+            executor.shutdown()
+            stage_timing.set_sink(previous)
+    asyncio.run(main())
+
+if __name__ == "__main__":
+    print("Screening API Test")
+    print("=" * 50)
+    test_api_server()
+    print("Test completed!")
@@ -0,0 +1,53 @@
+"""
+Test bulk resume parsing with a process pool
+"""
+import os
+import tempfile
+import docx
+from resume_parser import parse_resumes
+from utils import create_sample_resumes
+
+def write_docx(path, text):
+    """Write resume text to a DOCX file, one paragraph per line"""
+    document = docx.Document()
+    for line in text.strip().split('\n'):
+        document.add_paragraph(line.strip())
+    document.save(path)
+
+def test_bulk_parsing():
+    """Parse a mixed batch of good and bad files with several workers"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_paths = []
+        for i, resume in enumerate(create_sample_resumes() * 4):
+            path = os.path.join(tmp_dir, f"resume_{i}.docx")
+            write_docx(path, resume['text'])
+            file_paths.append(path)
+
+        # A corrupt DOCX and an unsupported format in the middle of the batch
+        corrupt_path = os.path.join(tmp_dir, "corrupt.docx")
+        with open(corrupt_path, 'wb') as f:
+            f.write(b"not a zip archive")
+        unsupported_path = os.path.join(tmp_dir, "resume.txt")
+        with open(unsupported_path, 'w') as f:
+            f.write("plain text resume")
+        file_paths[5:5] = [corrupt_path, unsupported_path]
+
+        results = parse_resumes(file_paths, workers=2, chunksize=3)
+
+        in_order = [result['file_path'] for result in results] == file_paths
+        print(f"Results returned in input order: {'PASS' if in_order else 'FAIL'}")
+
+        failures = [result['file_path'] for result in results if result['error']]
+        print(f"Failures: {[os.path.basename(path) for path in failures]}")
+        print(f"Bad files reported as failures: {'PASS' if failures == [corrupt_path, unsupported_path] else 'FAIL'}")
+
+        names = [result['resume']['candidate_name'] for result in results if result['resume']]
+        expected = [resume['candidate_name'] for resume in create_sample_resumes() * 4]
+        print(f"Candidate names: {names[:3]}")
+        print(f"Good files parsed: {'PASS' if names == expected else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Bulk Resume Parsing Test")
+    print("=" * 50)
+    test_bulk_parsing()
+    print("Test completed!")
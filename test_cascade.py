@@ -0,0 +1,57 @@
+"""
+Test cascade scoring: pruning before the costly stages and per-stage stats
+"""
+from cascade import CascadeMatcher, DEFAULT_MIN_SKILL_OVERLAP
+from matcher import ResumeMatcher
+from text_processor import preprocess_text
+from utils import generate_job_description, generate_resumes
+
+OFF_TOPIC = "Chef with ten years in French cuisine, pastry and kitchen management. Skilled in menu planning."
+
+def test_cascade():
+    """With the exact bound, the cascade must keep exactly the candidates match_resumes does not call Not Fit"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(generate_job_description(seed=1)))
+    resumes = [{'candidate_name': r['candidate_name'], 'text': preprocess_text(r['text'])}
+               for r in generate_resumes(300, seed=1)]
+    resumes += [{'candidate_name': f"Chef {i}", 'text': preprocess_text(OFF_TOPIC)} for i in range(20)]
+    full = matcher.match_resumes(resumes)
+    possible_fits = [r for r in full if r['decision'] != 'Not Fit']
+
+    results, stats = CascadeMatcher(matcher, min_skill_overlap=None).match_resumes(resumes)
+    print(f"Exact cascade keeps every possible fit, ranked alike: {'PASS' if results == possible_fits else 'FAIL'} "
+          f"({len(results)} of {len(resumes)})")
+    consistent = (stats[0]['candidates'] == len(resumes) and
+                  all(row['pruned'] + row['kept'] == row['candidates'] for row in stats) and
+                  all(a['kept'] == b['candidates'] for a, b in zip(stats, stats[1:])) and
+                  stats[-1]['kept'] == len(results))
+    print(f"Stage stats add up: {'PASS' if consistent else 'FAIL'} "
+          f"({', '.join(row['stage'] + ' pruned ' + str(row['pruned']) for row in stats)})")
+
+    # A lower ceiling on the custom similarity prunes off-topic resumes before profiling them
+    results, stats = CascadeMatcher(matcher, custom_ceiling=0.5, min_skill_overlap=None).match_resumes(resumes)
+    print(f"Vector stage prunes off-topic resumes: "
+          f"{'PASS' if stats[0]['pruned'] >= 20 and not any(r['candidate_name'].startswith('Chef') for r in results) else 'FAIL'} "
+          f"({stats[0]['pruned']} pruned)")
+
+    # By default the skills stage only keeps resumes with enough of the job's skills
+    results, stats = CascadeMatcher(matcher).match_resumes(resumes)
+    jd_skills = set(matcher.jd_skills)
+    enough = all(len(jd_skills & set(r['skills'].split(', '))) >= DEFAULT_MIN_SKILL_OVERLAP * len(jd_skills)
+                 for r in results)
+    print(f"Skills stage prunes by overlap: "
+          f"{'PASS' if [s['stage'] for s in stats] == ['vector', 'skills', 'custom'] and enough and results else 'FAIL'} "
+          f"({stats[1]['pruned']} pruned)")
+    print(f"Default cascade profiles fewer resumes: "
+          f"{'PASS' if stats[-1]['candidates'] < len(possible_fits) else 'FAIL'} "
+          f"({stats[-1]['candidates']} of {len(resumes)} profiled)")
+
+    page, _ = CascadeMatcher(matcher, min_skill_overlap=None).match_resumes(resumes, top_k=10, offset=5)
+    print(f"Pages of survivors: {'PASS' if page == possible_fits[5:15] else 'FAIL'}")
+    print(f"No resumes: {'PASS' if CascadeMatcher(matcher).match_resumes([]) == ([], []) else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Cascade Scoring Test")
+    print("=" * 50)
+    test_cascade()
+    print("Test completed!")
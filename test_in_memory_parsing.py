@@ -0,0 +1,89 @@
+"""
+Test parsing resumes from bytes and file-like objects instead of paths
+"""
+import io
+import os
+import tempfile
+from resume_parser import parse_resume, parse_resumes
+from test_bulk_parsing import write_docx
+from utils import create_sample_resumes
+
+def build_pdf(pages):
+    """Build a minimal PDF with one page of Helvetica text per entry in pages"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_text in pages:
+        lines = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+                 for line in page_text.split('\n')]
+        content = "BT /F1 11 Tf 14 TL 50 750 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        content = content.encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return output.getvalue()
+
+def test_in_memory_parsing():
+    """Bytes and file-like input must parse exactly like a file on disk"""
+    resume_text = create_sample_resumes()[0]['text'].strip()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        docx_path = os.path.join(tmp_dir, "resume.docx")
+        write_docx(docx_path, resume_text)
+        pdf_path = os.path.join(tmp_dir, "resume.pdf")
+        with open(pdf_path, 'wb') as f:
+            f.write(build_pdf([resume_text]))
+
+        all_match = True
+        for path in (docx_path, pdf_path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            from_path = parse_resume(path)
+            from_bytes = parse_resume(data, file_name=os.path.basename(path))
+            with open(path, 'rb') as f:
+                from_file = parse_resume(f)
+            from_buffer = parse_resume(io.BytesIO(data), file_name=os.path.basename(path))
+            # Everything but the extraction timing must be identical
+            parses = [from_path, from_bytes, from_file, from_buffer]
+            for parsed in parses:
+                parsed.pop('extraction')
+            matches = all(parsed == from_path for parsed in parses) and from_path['text'].strip()
+            all_match = all_match and bool(matches)
+            print(f"  {os.path.basename(path)}: {from_path['candidate_name']}, "
+                  f"{from_path['experience_years']} years of experience")
+        print(f"Bytes and file objects parse like paths: {'PASS' if all_match else 'FAIL'}")
+
+        try:
+            parse_resume(data)
+            print("Bytes without a file name rejected: FAIL")
+        except ValueError:
+            print("Bytes without a file name rejected: PASS")
+
+        # The pool takes (file_name, data) pairs, e.g. Streamlit upload buffers
+        with open(docx_path, 'rb') as f:
+            uploads = [("resume.docx", f.read()), ("broken.pdf", b"not a pdf")] * 3
+        results = parse_resumes(uploads, workers=2)
+        names_kept = [result['file_path'] for result in results] == [name for name, _ in uploads]
+        errors_reported = all(bool(result['error']) == (name == "broken.pdf")
+                              for result, (name, _) in zip(results, uploads))
+        print(f"Pool parses in-memory uploads: {'PASS' if names_kept and errors_reported else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("In-Memory Parsing Test")
+    print("=" * 50)
+    test_in_memory_parsing()
+    print("Test completed!")
@@ -0,0 +1,121 @@
+"""
+Test the streaming ingestion pipeline over directories and archives
+"""
+import io
+import os
+import tarfile
+import tempfile
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+import docx
+from ingest import screen_stream
+from matcher import ResumeMatcher
+from text_processor import preprocess_text
+from utils import load_sample_data, create_sample_resumes, generate_resumes
+
+def write_docx(path, text):
+    """Write resume text to a DOCX file, one paragraph per line"""
+    document = docx.Document()
+    for line in text.strip().split('\n'):
+        document.add_paragraph(line.strip())
+    document.save(path)
+
+def build_tar(path, source_files, copies):
+    """Tar `copies` resumes by cycling through the source DOCX files"""
+    with tarfile.open(path, 'w:gz') as archive:
+        for i in range(copies):
+            archive.add(source_files[i % len(source_files)], f"resumes/resume_{i}.docx")
+
+def build_distinct_tar(path, count, seed=0):
+    """Tar `count` distinct generated resumes as DOCX files.
+
+    Each file is the empty python-docx template with the resume's paragraphs
+    spliced into its body, which is much faster than saving a Document each.
+    """
+    template = io.BytesIO()
+    docx.Document().save(template)
+    with zipfile.ZipFile(template) as template_zip:
+        parts = {name: template_zip.read(name) for name in template_zip.namelist()}
+    head, tail = parts['word/document.xml'].decode('utf-8').split('<w:body>')
+    with tarfile.open(path, 'w:gz') as archive:
+        for i, resume in enumerate(generate_resumes(count, seed=seed)):
+            paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line.strip())}</w:t></w:r></w:p>'
+                                 for line in resume['text'].strip().split('\n'))
+            data = io.BytesIO()
+            with zipfile.ZipFile(data, 'w', zipfile.ZIP_DEFLATED) as document:
+                for name, part in parts.items():
+                    if name == 'word/document.xml':
+                        part = f"{head}<w:body>{paragraphs}{tail}".encode('utf-8')
+                    document.writestr(name, part)
+            info = tarfile.TarInfo(f"resumes/resume_{i}.docx")
+            info.size = data.tell()
+            data.seek(0)
+            archive.addfile(info, data)
+
+def peak_memory(source, matcher):
+    """Peak traced memory while streaming every record from a source"""
+    tracemalloc.start()
+    count = sum(1 for _ in screen_stream(source, matcher, in_flight=4, workers=2))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, peak
+
+def test_ingest():
+    """Stream a directory, a zip and a tar archive and check memory stays flat"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(load_sample_data()))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resume_dir = os.path.join(tmp_dir, "resumes")
+        os.makedirs(resume_dir)
+        source_files = []
+        for resume in create_sample_resumes():
+            path = os.path.join(resume_dir, resume['candidate_name'].replace(' ', '_') + ".docx")
+            write_docx(path, resume['text'])
+            source_files.append(path)
+        with open(os.path.join(resume_dir, "broken.docx"), 'wb') as f:
+            f.write(b"not a docx")
+
+        records = list(screen_stream(resume_dir, matcher, workers=2))
+        names = sorted(record['file_name'] for record in records)
+        print(f"Directory records: {names}")
+        print(f"Directory streamed: {'PASS' if len(names) == 4 else 'FAIL'}")
+        broken = [record for record in records if record['file_name'] == 'broken.docx']
+        print(f"Broken file reported: {'PASS' if broken and broken[0]['error'] else 'FAIL'}")
+        for record in records:
+            if not record['error']:
+                print(f"  {record['candidate_name']}: {record['score']:.4f} ({record['decision']})")
+
+        zip_path = os.path.join(tmp_dir, "resumes.zip")
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            for path in source_files:
+                archive.write(path, os.path.join("resumes", os.path.basename(path)))
+            archive.writestr("resumes/notes.txt", "not a resume")
+        zip_records = list(screen_stream(zip_path, matcher, workers=2))
+        print(f"Zip archive streamed: {'PASS' if len(zip_records) == 3 and not any(r['error'] for r in zip_records) else 'FAIL'}")
+
+        # An uncompressed tar of DOCX files also looks like a zip archive
+        plain_tar = os.path.join(tmp_dir, "resumes.tar")
+        with tarfile.open(plain_tar, 'w') as archive:
+            for path in source_files:
+                archive.add(path, os.path.join("resumes", os.path.basename(path)))
+        print(f"zipfile also accepts the plain tar: {zipfile.is_zipfile(plain_tar)}")
+        tar_records = list(screen_stream(plain_tar, matcher, workers=2))
+        print(f"Plain tar archive streamed: {'PASS' if len(tar_records) == 3 and not any(r['error'] for r in tar_records) else 'FAIL'}")
+
+        # Distinct resumes, so per-resume state anywhere in the stream shows up
+        small_tar = os.path.join(tmp_dir, "small.tar.gz")
+        large_tar = os.path.join(tmp_dir, "large.tar.gz")
+        build_distinct_tar(small_tar, 200, seed=1)
+        build_distinct_tar(large_tar, 2000, seed=2)
+        small_count, small_peak = peak_memory(small_tar, matcher)
+        large_count, large_peak = peak_memory(large_tar, matcher)
+        print(f"Tar of {small_count}: peak {small_peak / 1024:.0f} KiB; tar of {large_count}: peak {large_peak / 1024:.0f} KiB")
+        print(f"Peak memory flat with 10x input: {'PASS' if large_peak < small_peak * 1.5 else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Streaming Ingestion Test")
+    print("=" * 50)
+    test_ingest()
+    print("Test completed!")
@@ -0,0 +1,151 @@
+"""
+Test background screening jobs: streamed progress, cancellation and backpressure
+"""
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+from job_queue import JobQueue, QueueFullError, ScreeningJob, SCORE_CHUNK_SIZE
+from match_results import MatchResults
+from matcher import ResumeMatcher
+from test_bulk_parsing import write_docx
+from text_processor import preprocess_text
+from utils import load_sample_data, create_sample_resumes
+
+def wait_for(job, timeout=300):
+    """Poll a job until it finishes, returning every snapshot seen on the way"""
+    snapshots = []
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        snapshots.append(job.snapshot())
+        time.sleep(0.01)
+    snapshots.append(job.snapshot())
+    return snapshots
+
+def make_uploads(tmp_dir, samples, numbers):
+    """Sample resumes as (file_name, DOCX bytes) uploads, each made unique by a reference number"""
+    uploads = []
+    for i in numbers:
+        path = os.path.join(tmp_dir, f"resume_{i}.docx")
+        write_docx(path, samples[i % len(samples)]['text'] + f"\nReference number {i}")
+        with open(path, 'rb') as f:
+            uploads.append((f"resume_{i}.docx", f.read()))
+    return uploads
+
+def test_job_queue():
+    """A job's final ranking must equal match_resumes, with progress visible while it runs"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(load_sample_data()))
+    samples = create_sample_resumes()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        uploads = make_uploads(tmp_dir, samples, range(40))
+        uploads.insert(5, ("broken.docx", b"not a docx"))
+
+        jobs = JobQueue(max_queued=1, job_workers=1, parse_workers=2, cache_path=None)
+        try:
+            completed = []
+            job = jobs.submit(matcher, uploads, on_complete=completed.append)
+            snapshots = wait_for(job)
+            final = snapshots[-1]
+
+            expected = matcher.match_resumes([
+                {'candidate_name': sample['candidate_name'],
+                 'text': preprocess_text(sample['text'] + f"\nReference number {i}")}
+                for i, sample in ((i, samples[i % len(samples)]) for i in range(40))])
+            same = (len(final['results']) == len(expected) and
+                    all(a['candidate_name'] == b['candidate_name'] and abs(a['score'] - b['score']) < 1e-9
+                        for a, b in zip(final['results'], expected)))
+            print(f"Final ranking matches match_resumes: {'PASS' if final['status'] == 'done' and same else 'FAIL'}")
+            print(f"Unreadable upload reported: {'PASS' if [e['file_name'] for e in final['errors']] == ['broken.docx'] else 'FAIL'}")
+            print(f"on_complete got the processed resumes: {'PASS' if completed and len(completed[0]) == 40 else 'FAIL'}")
+            page = job.snapshot(10, 20)
+            print(f"Snapshot pages: {'PASS' if page['results'] == final['results'][20:30] and page['scored'] == 40 else 'FAIL'}")
+            print(f"Columnar ranking matches the snapshot: "
+                  f"{'PASS' if job.ranking().to_records() == final['results'] else 'FAIL'}")
+            pages = list(job.iter_ranking(page_rows=7))
+            print(f"Ranking pages fit together: "
+                  f"{'PASS' if len(pages) == 6 and MatchResults.concatenate(pages).to_records() == final['results'] else 'FAIL'}")
+            timed_stages = {row['stage']: row['calls'] for row in final['timings']}
+            print(f"Job timings include parse workers: "
+                  f"{'PASS' if timed_stages.get('parse_resume') == 41 and 'score_resumes' in timed_stages else 'FAIL'}")
+
+            partial = [s for s in snapshots if s['status'] == 'running' and 0 < s['processed'] < s['total']]
+            monotonic = all(a['processed'] <= b['processed'] for a, b in zip(snapshots, snapshots[1:]))
+            print(f"Partial progress streamed: {'PASS' if partial and monotonic else 'FAIL'} "
+                  f"({len(set(s['processed'] for s in partial))} distinct progress counts)")
+
+            # The same files again are served from the processed-resume cache
+            start = time.perf_counter()
+            again = wait_for(jobs.submit(matcher, uploads))[-1]
+            print(f"Resubmitted batch reuses processed resumes: "
+                  f"{'PASS' if again['results'] == final['results'] else 'FAIL'} "
+                  f"({time.perf_counter() - start:.2f}s vs {final['elapsed']:.2f}s)")
+
+            # Copies differing only in their reference number reuse the first copy's scores
+            deduplicated = wait_for(jobs.submit(matcher, uploads, near_duplicate_threshold=0.9))[-1]
+            by_name = {}
+            for result in deduplicated['results']:
+                by_name.setdefault(result['candidate_name'], set()).add(result['score'])
+            print(f"Near-duplicates reuse scores: "
+                  f"{'PASS' if deduplicated['scored'] == 40 and deduplicated['near_duplicates'] == 40 - len(samples) and all(len(s) == 1 for s in by_name.values()) else 'FAIL'} "
+                  f"({deduplicated['near_duplicates']} of {deduplicated['scored']} not scored)")
+            print(f"No near-duplicates without a threshold: {'PASS' if final['near_duplicates'] == 0 else 'FAIL'}")
+
+            # Hold the only runner, fill the one queue slot, then one more must be refused
+            release = threading.Event()
+            blocker = jobs.submit(matcher, uploads[:1], on_complete=lambda _: release.wait(30))
+            while blocker.status == 'queued':
+                time.sleep(0.01)
+            queued = jobs.submit(matcher, uploads)
+            try:
+                jobs.submit(matcher, uploads)
+                print("Full queue refuses new jobs: FAIL")
+            except QueueFullError:
+                print("Full queue refuses new jobs: PASS")
+
+            # Cancelling a queued job means it never runs
+            jobs.cancel(queued.job_id)
+            release.set()
+            cancelled = wait_for(queued)[-1]
+            print(f"Queued job cancelled: {'PASS' if cancelled['status'] == 'cancelled' and cancelled['processed'] == 0 else 'FAIL'}")
+
+            # Cancelling a running job stops it early
+            running = jobs.submit(matcher, make_uploads(tmp_dir, samples, range(40, 240)))
+            while running.snapshot()['processed'] == 0 and not running.finished:
+                time.sleep(0.01)
+            jobs.cancel(running.job_id)
+            stopped = wait_for(running)[-1]
+            print(f"Running job cancelled: {'PASS' if stopped['status'] == 'cancelled' and stopped['processed'] < stopped['total'] else 'FAIL'} "
+                  f"({stopped['processed']}/{stopped['total']} processed)")
+            print(f"Unknown job ids: {'PASS' if jobs.get('missing') is None and not jobs.cancel('missing') else 'FAIL'}")
+        finally:
+            jobs.shutdown()
+
+    # Results arrive out of upload order in chunks; ranking them costs one sort per snapshot
+    count = 100000
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 50, count) / 50.0
+    arrival = rng.permutation(count)
+    large = ScreeningJob(matcher, [("resume.docx", b"")] * count)
+    start = time.perf_counter()
+    for chunk in range(0, count, SCORE_CHUNK_SIZE):
+        indices = arrival[chunk:chunk + SCORE_CHUNK_SIZE]
+        chunk_scores = {'score': scores[indices]}
+        large._add_results([({'candidate_name': f"Resume {i}"}, chunk_scores, j) for j, i in enumerate(indices)],
+                           indices, chunk + len(indices))
+    add_seconds = time.perf_counter() - start
+    with large._lock:
+        positions, ranked_scores = large._ranked_positions()
+    page = large._ranked_entries(positions, ranked_scores, top_k=20, offset=100)
+    expected = np.lexsort((np.arange(count), -scores))[100:120]
+    same = [entry[0]['candidate_name'] for entry in page] == [f"Resume {i}" for i in expected]
+    print(f"Large job ranks by score, ties in upload order: {'PASS' if same and add_seconds < 2 else 'FAIL'} "
+          f"({count} results added in {add_seconds:.2f}s)")
+
+if __name__ == "__main__":
+    print("Job Queue Test")
+    print("=" * 50)
+    test_job_queue()
+    print("Test completed!")
@@ -0,0 +1,93 @@
+"""
+Test columnar match results and chunked CSV/Parquet export
+"""
+import csv
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from matcher import ResumeMatcher
+from match_results import MatchResults, EXPORT_COLUMNS
+from text_processor import preprocess_text
+from utils import generate_job_description, generate_resumes, save_results_to_csv, save_results_to_parquet
+
+def legacy_save_results_to_csv(results, filename):
+    """Original export: copy every row, drop detailed_scores, build a DataFrame"""
+    csv_results = []
+    for result in results:
+        csv_result = result.copy()
+        del csv_result['detailed_scores']
+        csv_results.append(csv_result)
+    pd.DataFrame(csv_results).to_csv(filename, index=False)
+
+def test_match_results():
+    """Columnar results must carry exactly what match_resumes returns"""
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(generate_job_description(seed=3)))
+    resumes = [{'candidate_name': r['candidate_name'], 'text': preprocess_text(r['text'])}
+               for r in generate_resumes(300, seed=3)]
+
+    records = matcher.match_resumes(resumes)
+    table = matcher.rank_resumes(resumes)
+    print(f"Columnar rows equal match_resumes: {'PASS' if table.to_records() == records else 'FAIL'}")
+    print(f"Round trip through records: {'PASS' if MatchResults.from_records(records).to_records() == records else 'FAIL'}")
+    print(f"take() selects rows: {'PASS' if table.take(np.arange(10, 20)).to_records() == records[10:20] else 'FAIL'}")
+    print(f"No resumes: {'PASS' if matcher.match_resumes([]) == [] and len(matcher.rank_resumes([])) == 0 else 'FAIL'}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Chunking must not change the file; detailed scores get their own columns
+        chunked = table.write_csv(io.StringIO(), chunk_rows=7).getvalue()
+        whole = table.write_csv(io.StringIO(), chunk_rows=len(table)).getvalue()
+        rows = list(csv.DictReader(io.StringIO(chunked)))
+        flat = (list(rows[0]) == list(EXPORT_COLUMNS) and len(rows) == len(records) and
+                all(row['candidate_name'] == r['candidate_name'] and float(row['score']) == r['score'] and
+                    float(row['cosine_score']) == r['detailed_scores']['cosine'] and
+                    float(row['custom_score']) == r['detailed_scores']['custom'] and
+                    row['missing_skills'] == r['missing_skills'] for row, r in zip(rows, records)))
+        print(f"Chunked CSV export: {'PASS' if chunked == whole and flat else 'FAIL'}")
+
+        csv_path = save_results_to_csv(records, os.path.join(tmp_dir, "results.csv"))
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            print(f"save_results_to_csv accepts rows: {'PASS' if f.read() == chunked else 'FAIL'}")
+
+        try:
+            import pyarrow.parquet
+            parquet_path = save_results_to_parquet(table, os.path.join(tmp_dir, "results.parquet"), chunk_rows=100)
+            parquet_file = pyarrow.parquet.ParquetFile(parquet_path)
+            read_back = parquet_file.read().to_pydict()
+            same = (read_back['candidate_name'] == list(table['candidate_name']) and
+                    np.array_equal(read_back['euclidean_score'], table['euclidean_score']))
+            print(f"Parquet export, one row group per chunk: "
+                  f"{'PASS' if same and parquet_file.num_row_groups == 3 else 'FAIL'}")
+        except ImportError:
+            print("Parquet export: SKIPPED (pyarrow not installed)")
+
+        # 100k candidates: chunked columnar export against the original DataFrame path
+        n = 100000
+        rng = np.random.default_rng(0)
+        scores = rng.random(n)
+        big = MatchResults([f"Candidate {i}" for i in range(n)], scores, ["python, sql"] * n, ["aws"] * n,
+                           np.where(scores > 0.5, "Fit", "Not Fit"), scores, scores, scores)
+        big_records = big.to_records()
+        timings, peaks = {}, {}
+        for name, export in (('legacy', lambda path: legacy_save_results_to_csv(big_records, path)),
+                             ('columnar', lambda path: save_results_to_csv(big, path))):
+            start = time.perf_counter()
+            export(os.path.join(tmp_dir, f"{name}.csv"))
+            timings[name] = time.perf_counter() - start
+            tracemalloc.start()
+            export(os.path.join(tmp_dir, f"{name}.csv"))
+            peaks[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"100,000-row export memory: {'PASS' if peaks['columnar'] < peaks['legacy'] else 'FAIL'} "
+              f"(peak {peaks['legacy'] / 2**20:.0f} MB -> {peaks['columnar'] / 2**20:.0f} MB; "
+              f"{timings['legacy']:.2f}s for 5 columns -> {timings['columnar']:.2f}s for 8 columns)")
+
+if __name__ == "__main__":
+    print("Match Results Test")
+    print("=" * 50)
+    test_match_results()
+    print("Test completed!")
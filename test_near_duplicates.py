@@ -0,0 +1,97 @@
+"""
+Test near-duplicate resume detection and the scoring it avoids
+"""
+import os
+import tempfile
+import time
+import numpy as np
+from ingest import screen_stream
+from matcher import ResumeMatcher, prepare_resume_features
+from near_duplicates import (NearDuplicateIndex, cluster_near_duplicates, estimate_jaccard,
+                             minhash_signature, shingles)
+from test_ingest import build_tar, write_docx
+from text_processor import preprocess_text
+from utils import generate_job_description, generate_resumes, load_sample_data, create_sample_resumes
+
+def jaccard(text1, text2):
+    """Exact Jaccard similarity of two texts' shingle sets"""
+    set1, set2 = shingles(text1), shingles(text2)
+    return len(set1 & set2) / len(set1 | set2)
+
+def test_near_duplicates():
+    """Near-duplicates must be clustered and share their representative's score"""
+    texts = [preprocess_text(r['text']) for r in generate_resumes(200, seed=11)]
+
+    # The estimate stays close to the exact similarity of the shingle sets
+    errors = [abs(estimate_jaccard(minhash_signature(a), minhash_signature(b)) - jaccard(a, b))
+              for a, b in zip(texts, texts[1:])]
+    print(f"Signature estimates Jaccard: {'PASS' if max(errors) < 0.15 else 'FAIL'} (max error {max(errors):.3f})")
+    print(f"Empty text has no signature: {'PASS' if minhash_signature('   ') is None else 'FAIL'}")
+
+    # A copy with an edited header lands in its original's cluster
+    edited = [text.replace(text.split()[0], "updated", 1) + " references available" for text in texts[:50]]
+    similarity = min(jaccard(a, b) for a, b in zip(texts, edited))
+    representatives = cluster_near_duplicates([minhash_signature(text) for text in texts + edited], 0.8)
+    print(f"Edited copies (Jaccard >= {similarity:.2f}) join their originals: "
+          f"{'PASS' if list(representatives[200:]) == list(range(50)) else 'FAIL'}")
+    print(f"Distinct resumes stay apart: {'PASS' if list(representatives[:200]) == list(range(200)) else 'FAIL'}")
+
+    index = NearDuplicateIndex(0.8)
+    print(f"Index returns the representative: "
+          f"{'PASS' if index.add('a', minhash_signature(texts[0])) == 'a' and index.add('b', minhash_signature(edited[0])) == 'a' else 'FAIL'}")
+
+    # Exact copies rank exactly like scoring every resume
+    jd_text = preprocess_text(generate_job_description(seed=11))
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(jd_text)
+    resumes = []
+    for i in range(1000):
+        resume = {'candidate_name': f"Candidate {i}", 'text': texts[i % 200]}
+        resume.update(prepare_resume_features(resume['text']))
+        resumes.append(resume)
+    start = time.perf_counter()
+    full = matcher.match_resumes(resumes)
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    deduplicated = matcher.match_resumes(resumes, near_duplicate_threshold=0.9)
+    deduplicated_seconds = time.perf_counter() - start
+    stats = matcher.last_near_duplicate_stats
+    print(f"Ranking with duplicates scored once equals the full ranking: {'PASS' if deduplicated == full else 'FAIL'}")
+    print(f"Stats: {stats}")
+    print(f"One resume scored per cluster: {'PASS' if stats['scored'] == 200 and stats['near_duplicates'] == 800 else 'FAIL'}")
+    page = matcher.match_resumes(resumes, top_k=20, offset=40, near_duplicate_threshold=0.9)
+    print(f"Paging with near-duplicates: {'PASS' if page == full[40:60] else 'FAIL'}")
+    print(f"Scoring duplicates once is faster: {'PASS' if deduplicated_seconds < full_seconds else 'FAIL'} "
+          f"({deduplicated_seconds * 1000:.0f} ms vs {full_seconds * 1000:.0f} ms)")
+
+    # Ingest scores one copy and points the others at it
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(load_sample_data()))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source_files = []
+        for resume in create_sample_resumes():
+            path = os.path.join(tmp_dir, resume['candidate_name'].replace(' ', '_') + ".docx")
+            write_docx(path, resume['text'])
+            source_files.append(path)
+        tar_path = os.path.join(tmp_dir, "resumes.tar.gz")
+        build_tar(tar_path, source_files, 12)
+
+        report = {}
+        records = list(screen_stream(tar_path, matcher, workers=1, near_duplicate_threshold=0.9, report=report))
+        scores = {}
+        consistent = True
+        for record in records:
+            representative = record['duplicate_of'] or record['file_name']
+            consistent = consistent and scores.setdefault(representative, record['score']) == record['score']
+        print(f"Ingest report: {report}")
+        print(f"Ingest scores one copy of each resume: "
+              f"{'PASS' if report['scored'] == 3 and report['near_duplicates'] == 9 and consistent else 'FAIL'}")
+        plain = list(screen_stream(tar_path, matcher, workers=1, near_duplicate_threshold=None))
+        print(f"Same scores with detection off: "
+              f"{'PASS' if [r['score'] for r in plain] == [r['score'] for r in records] and not any(r['duplicate_of'] for r in plain) else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Near-Duplicate Detection Test")
+    print("=" * 50)
+    test_near_duplicates()
+    print("Test completed!")
@@ -0,0 +1,74 @@
+"""
+Test the content-addressed parse cache
+"""
+import os
+import shutil
+import tempfile
+import docx
+import resume_parser
+from parse_cache import ParseCache
+from resume_parser import parse_resume, parse_resumes
+from utils import create_sample_resumes
+
+def write_docx(path, text):
+    """Write resume text to a DOCX file, one paragraph per line"""
+    document = docx.Document()
+    for line in text.strip().split('\n'):
+        document.add_paragraph(line.strip())
+    document.save(path)
+
+def test_parse_cache():
+    """Check hits on repeat uploads, version invalidation and eviction"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.sqlite")
+        cache = ParseCache(cache_path)
+
+        resume_path = os.path.join(tmp_dir, "alex.docx")
+        write_docx(resume_path, create_sample_resumes()[0]['text'])
+
+        # The same content under another name is a repeat upload
+        copy_path = os.path.join(tmp_dir, "upload_copy.docx")
+        shutil.copy(resume_path, copy_path)
+
+        first = parse_resume(resume_path, cache=cache)
+        second = parse_resume(copy_path, cache=cache)
+        print(f"Cache stats: {cache.stats()}")
+        print(f"Repeat upload served from cache: {'PASS' if cache.hits == 1 and cache.misses == 1 else 'FAIL'}")
+        print(f"Cached result unchanged: {'PASS' if first == second else 'FAIL'}")
+
+        # A new parser version must not reuse old entries
+        original_version = resume_parser.PARSER_VERSION
+        resume_parser.PARSER_VERSION = original_version + "-test"
+        try:
+            parse_resume(resume_path, cache=cache)
+        finally:
+            resume_parser.PARSER_VERSION = original_version
+        print(f"Parser version change misses: {'PASS' if cache.misses == 2 else 'FAIL'}")
+
+        # A tiny budget keeps only the most recent entry
+        small_cache = ParseCache(os.path.join(tmp_dir, "small.sqlite"), max_bytes=1000)
+        paths = []
+        for i, resume in enumerate(create_sample_resumes()):
+            path = os.path.join(tmp_dir, f"resume_{i}.docx")
+            write_docx(path, resume['text'])
+            paths.append(path)
+            parse_resume(path, cache=small_cache)
+        stats = small_cache.stats()
+        print(f"Small cache stats: {stats}")
+        print(f"Size-based eviction: {'PASS' if stats['bytes'] <= 1000 and stats['evictions'] > 0 else 'FAIL'}")
+
+        # Bulk parsing workers share the cache file
+        parse_resumes(paths, workers=2, cache_path=cache_path)
+        results = parse_resumes(paths, workers=2, cache_path=cache_path)
+        shared = ParseCache(cache_path)
+        names = [result['resume']['candidate_name'] for result in results]
+        print(f"Bulk parse through shared cache: {'PASS' if names == [r['candidate_name'] for r in create_sample_resumes()] and shared.stats()['entries'] >= 4 else 'FAIL'}")
+
+        for open_cache in (cache, small_cache, shared):
+            open_cache.close()
+
+if __name__ == "__main__":
+    print("Parse Cache Test")
+    print("=" * 50)
+    test_parse_cache()
+    print("Test completed!")
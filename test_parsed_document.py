@@ -0,0 +1,70 @@
+"""
+Test the shared parsed document used by the field extractors
+"""
+import time
+from parsed_document import ParsedDocument
+from resume_parser import extract_candidate_name, extract_contact_info, extract_education
+from text_processor import extract_experience_years, extract_skills_advanced
+from utils import generate_resumes, create_sample_resumes
+
+RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+
+Technical Skills
+Python, SQL, Docker
+AWS and Terraform
+Project Highlights
+Built a Kubernetes platform
+
+Education
+BS Computer Science, State University
+2012 - 2016
+
+Experience
+7 years experience in data engineering
+"""
+
+EXTRACTORS = (extract_candidate_name, extract_contact_info, extract_education,
+              extract_experience_years, extract_skills_advanced)
+
+def test_parsed_document():
+    """Extractors must give the same fields for a ParsedDocument as for its text"""
+    document = ParsedDocument(RESUME)
+    lines = RESUME.split('\n')
+    print(f"Lines split once: "
+          f"{'PASS' if document.lower_lines == [line.lower() for line in lines] and len(document.stripped_lines) == len(lines) else 'FAIL'}")
+    # The skills list stops at the line naming the projects section
+    print(f"Skill section boundaries: "
+          f"{'PASS' if document.skill_sections == [(4, 6)] and document.skill_lines() == ['python, sql, docker', 'aws and terraform'] else 'FAIL'}")
+    print(f"Education section boundaries: {'PASS' if document.education_section == (9, 14) else 'FAIL'}")
+
+    fields = [extractor(document) for extractor in EXTRACTORS]
+    expected = ["Jane Doe", {'email': 'jane.doe@example.com', 'phone': '(555) 123-4567'},
+                "Education BS Computer Science, State University 2012 - 2016 Experience", 7.0,
+                ['python', 'sql', 'aws', 'docker', 'terraform']]
+    print(f"Fields from the document: {'PASS' if fields == expected else 'FAIL'}")
+
+    texts = [r['text'] for r in generate_resumes(500, seed=7)] + [r['text'] for r in create_sample_resumes()]
+    same = all(extractor(text) == extractor(ParsedDocument(text)) for text in texts for extractor in EXTRACTORS)
+    print(f"Text and document give the same fields: {'PASS' if same else 'FAIL'}")
+
+    # One split and lowercase per resume instead of one per extractor
+    start = time.perf_counter()
+    for text in texts:
+        for extractor in EXTRACTORS:
+            extractor(text)
+    per_extractor = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in texts:
+        document = ParsedDocument(text)
+        for extractor in EXTRACTORS:
+            extractor(document)
+    shared = time.perf_counter() - start
+    print(f"Shared document is faster: {'PASS' if shared < per_extractor else 'FAIL'} "
+          f"({shared * 1000:.0f} ms vs {per_extractor * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    print("Parsed Document Test")
+    print("=" * 50)
+    test_parsed_document()
+    print("Test completed!")
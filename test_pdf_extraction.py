@@ -0,0 +1,70 @@
+"""
+Test bounded, page-parallel PDF text extraction
+"""
+import PyPDF2
+import io
+import time
+from resume_parser import extract_pdf_text, parse_resume
+from test_in_memory_parsing import build_pdf
+from utils import create_sample_resumes
+
+def legacy_extract(data):
+    """Original serial extraction with string concatenation"""
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        text += page.extract_text()
+    return text
+
+def test_pdf_extraction():
+    """Check limits, timeout reporting and parallel/serial equality"""
+    samples = [resume['text'].strip() for resume in create_sample_resumes()]
+    pages = [samples[i % len(samples)] * 4 for i in range(40)]
+    data = build_pdf(pages)
+
+    start = time.perf_counter()
+    expected = legacy_extract(data)
+    legacy_time = time.perf_counter() - start
+    serial_text, serial_stats = extract_pdf_text(data, page_workers=1)
+    parallel_text, parallel_stats = extract_pdf_text(data, page_workers=4)
+    # The first parallel call starts the page pool; time a warm one
+    parallel_text, parallel_stats = extract_pdf_text(data, page_workers=4)
+    same = expected == serial_text == parallel_text and serial_stats['pages'] == 40
+    print(f"Serial and parallel text match original: {'PASS' if same else 'FAIL'}")
+    print(f"40 pages: original {legacy_time * 1000:.0f} ms, serial {serial_stats['seconds'] * 1000:.0f} ms, "
+          f"parallel {parallel_stats['seconds'] * 1000:.0f} ms")
+
+    # A file object must reach the page workers as well as the serial reader
+    streamed_text, streamed_stats = extract_pdf_text(io.BytesIO(data), page_workers=4)
+    print(f"Long PDF as a file object: {'PASS' if streamed_text == expected and streamed_stats['pages'] == 40 else 'FAIL'}")
+
+    text, stats = extract_pdf_text(data, max_pages=5)
+    print(f"Page limit: {'PASS' if stats['pages'] == 5 and stats['total_pages'] == 40 and stats['truncated'] else 'FAIL'}")
+
+    for page_workers in (1, 4):
+        text, stats = extract_pdf_text(data, max_text_bytes=5000, page_workers=page_workers)
+        within = len(text.encode('utf-8')) <= 5000 and expected.startswith(text[:-1]) and stats['truncated']
+        print(f"Byte budget ({page_workers} page workers): {'PASS' if within else 'FAIL'}")
+
+        text, stats = extract_pdf_text(data, timeout=0, page_workers=page_workers)
+        print(f"Timeout reported ({page_workers} page workers): {'PASS' if stats['timed_out'] and stats['pages'] < 40 else 'FAIL'}")
+
+    # Serial extraction gives up during a page that never finishes, not only between pages
+    extract_text = PyPDF2.PageObject.extract_text
+    PyPDF2.PageObject.extract_text = lambda page, *args, **kwargs: time.sleep(5) or ""
+    try:
+        start = time.perf_counter()
+        text, stats = extract_pdf_text(data, timeout=0.5, page_workers=1)
+        seconds = time.perf_counter() - start
+    finally:
+        PyPDF2.PageObject.extract_text = extract_text
+    print(f"Timeout during a slow page: {'PASS' if stats['timed_out'] and seconds < 2 else 'FAIL'} ({seconds:.1f}s)")
+
+    resume = parse_resume(build_pdf([samples[0]]), file_name="resume.pdf")
+    extraction = resume['extraction']
+    print(f"Parse reports extraction time: {'PASS' if extraction['seconds'] > 0 and extraction['pages'] == 1 else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("PDF Extraction Test")
+    print("=" * 50)
+    test_pdf_extraction()
+    print("Test completed!")
@@ -0,0 +1,55 @@
+"""
+Test top-k retrieval from the inverted resume index
+"""
+import random
+import numpy as np
+from matcher import ResumeMatcher
+from resume_index import InvertedIndex
+from text_processor import SKILL_KEYWORDS, preprocess_text
+from tfidf_model import CorpusTfidfModel
+from utils import load_sample_data, create_sample_resumes
+
+def synthetic_resume(rng, length):
+    """Random resume text drawn from the skill taxonomy plus filler words"""
+    vocabulary = SKILL_KEYWORDS + ['experience', 'team', 'project', 'develop', 'design', 'lead']
+    return ' '.join(rng.choice(vocabulary) for _ in range(length))
+
+def test_resume_index():
+    """Index results must equal an exhaustive cosine ranking"""
+    rng = random.Random(7)
+    resumes = [{'candidate_name': r['candidate_name'], 'text': preprocess_text(r['text'])}
+               for r in create_sample_resumes()]
+    resumes += [{'candidate_name': f"Candidate {i+1}", 'text': synthetic_resume(rng, rng.randint(0, 60))}
+                for i in range(2000)]
+
+    model = CorpusTfidfModel().fit([resume['text'] for resume in resumes])
+    index = InvertedIndex(model)
+    index.add_resumes(resumes)
+
+    matcher = ResumeMatcher(model=model)
+    queries = [preprocess_text(load_sample_data())] + [synthetic_resume(rng, rng.randint(1, 40)) for _ in range(10)]
+
+    all_identical = True
+    for query in queries:
+        matcher.fit_job_description(query)
+        exhaustive = matcher.score_resumes([resume['text'] for resume in resumes])['cosine_score']
+        for top_k in (1, 10, 50):
+            expected = list(np.argsort(-exhaustive, kind='stable')[:top_k])
+            results = index.search(matcher.jd_vector, top_k=top_k)
+            if [result['resume_id'] for result in results] != expected:
+                all_identical = False
+
+    print(f"Top-k identical to exhaustive ranking: {'PASS' if all_identical else 'FAIL'}")
+
+    results = index.search_text(preprocess_text(load_sample_data()), top_k=3)
+    for result in results:
+        print(f"  {result['candidate_name']}: {result['cosine_score']:.4f}")
+    stats = index.last_query_stats
+    print(f"Postings scanned: {stats['postings_scanned']} of {stats['postings_total']}, "
+          f"candidates scored: {stats['candidates_scored']} of {stats['resumes']}")
+
+if __name__ == "__main__":
+    print("Inverted Resume Index Test")
+    print("=" * 50)
+    test_resume_index()
+    print("Test completed!")
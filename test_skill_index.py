@@ -0,0 +1,79 @@
+"""
+Test skill bitmaps and boolean skill queries
+"""
+import time
+import numpy as np
+from matcher import ResumeMatcher
+from skill_index import (SkillIndex, SKILL_TAXONOMY, SKILL_BITS, BITMAP_WORDS, skill_bitmap,
+                         skill_count, skills_from_bitmap)
+from text_processor import preprocess_text, extract_skills_advanced
+from utils import generate_job_description, generate_resumes
+
+def random_rows(n, density, seed=0):
+    """n random skill bitmaps as a bool matrix and as SkillIndex rows"""
+    has_skill = np.random.default_rng(seed).random((n, len(SKILL_TAXONOMY))) < density
+    padded = np.zeros((n, BITMAP_WORDS * 64), dtype=bool)
+    padded[:, :len(SKILL_TAXONOMY)] = has_skill
+    return has_skill, np.packbits(padded, axis=1, bitorder='little').view(np.uint64)
+
+def test_skill_index():
+    """Bitmap queries must match the same questions asked of the skill lists"""
+    resumes = [{'candidate_name': r['candidate_name'], 'text': r['text']} for r in generate_resumes(500, seed=2)]
+    skills = [extract_skills_advanced(r['text']) for r in resumes]
+    print(f"Bitmap round trip: "
+          f"{'PASS' if all(skills_from_bitmap(skill_bitmap(s)) == s for s in skills) else 'FAIL'}")
+    print(f"Bitmap skill count: "
+          f"{'PASS' if all(skill_count(skill_bitmap(s)) == len(s) for s in skills) else 'FAIL'}")
+
+    index = SkillIndex()
+    index.add_resumes([dict(r, skills=s) for r, s in zip(resumes, skills)], resume_ids=[f"r{i}" for i in range(500)])
+    queries = {
+        "python AND (aws OR gcp) AND NOT php": lambda s: 'python' in s and ('aws' in s or 'gcp' in s) and 'php' not in s,
+        "machine learning or Docker and NOT kubernetes": lambda s: 'machine learning' in s or ('docker' in s and 'kubernetes' not in s),
+        "NOT (sql OR c++)": lambda s: 'sql' not in s and 'c++' not in s,
+        "not not java": lambda s: 'java' in s,
+    }
+    same = all(index.query(query) == [f"r{i}" for i, s in enumerate(skills) if check(s)]
+               for query, check in queries.items())
+    print(f"Queries match the skill lists: {'PASS' if same else 'FAIL'}")
+    print(f"Postings and counts: "
+          f"{'PASS' if list(index.posting('python')) == [i for i, s in enumerate(skills) if 'python' in s] and index.count('python OR NOT python') == 500 else 'FAIL'}")
+
+    rejected = 0
+    for bad in ["", "python AND", "(python OR java", "cobol", "python )"]:
+        try:
+            index.count(bad)
+        except ValueError:
+            rejected += 1
+    print(f"Bad queries rejected: {'PASS' if rejected == 5 else 'FAIL'}")
+
+    # Missing skills come from the bitmaps, in taxonomy order
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(preprocess_text(generate_job_description(seed=2)))
+    expected = [[skill for skill in matcher.jd_skills if skill not in s] for s in skills]
+    print(f"Missing skills from bitmaps: "
+          f"{'PASS' if index.missing_skills(matcher.jd_skills) == expected else 'FAIL'}")
+    results = matcher.match_resumes([dict(r, text=preprocess_text(r['text'])) for r in resumes[:20]])
+    consistent = all(r['missing_skills'] == ', '.join(skill for skill in matcher.jd_skills
+                                                       if skill not in r['skills'].split(', ')) for r in results)
+    print(f"match_resumes missing skills: {'PASS' if consistent else 'FAIL'}")
+
+    # A million resumes: queries are a few bitwise operations over the postings
+    has_skill, rows = random_rows(1_000_000, 0.07)
+    big = SkillIndex()
+    big.add_bitmaps(rows)
+    big.count("python")
+    query = "python AND (aws OR gcp) AND NOT php"
+    start = time.perf_counter()
+    positions = big.positions(query)
+    seconds = time.perf_counter() - start
+    bits = {skill: has_skill[:, SKILL_BITS[skill]] for skill in ('python', 'aws', 'gcp', 'php')}
+    expected = np.flatnonzero(bits['python'] & (bits['aws'] | bits['gcp']) & ~bits['php'])
+    print(f"Query over 1M resumes: {'PASS' if np.array_equal(positions, expected) and seconds < 0.1 else 'FAIL'} "
+          f"({len(positions):,} matches in {seconds * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    print("Skill Index Test")
+    print("=" * 50)
+    test_skill_index()
+    print("Test completed!")
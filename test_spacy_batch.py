@@ -0,0 +1,40 @@
+"""
+Test batched SpaCy entity and noun phrase extraction
+"""
+import time
+from text_processor import (extract_entities_spacy, extract_noun_phrases, extract_entities_spacy_batch,
+                            extract_noun_phrases_batch, extract_spacy_features_batch)
+from utils import create_sample_resumes
+
+def test_spacy_batch():
+    """Batch variants must match the single-document functions"""
+    texts = [resume['text'] for resume in create_sample_resumes()] * 20
+
+    start = time.perf_counter()
+    single_entities = [extract_entities_spacy(text) for text in texts]
+    single_phrases = [extract_noun_phrases(text) for text in texts]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_entities = extract_entities_spacy_batch(texts, batch_size=16)
+    batch_phrases = extract_noun_phrases_batch(texts, batch_size=16)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shared = extract_spacy_features_batch(texts, batch_size=16)
+    shared_time = time.perf_counter() - start
+
+    print(f"Entities (first resume): {batch_entities[0]}")
+    print(f"Noun phrases (first resume): {batch_phrases[0][:8]}")
+    print(f"Batch entities match: {'PASS' if batch_entities == single_entities else 'FAIL'}")
+    print(f"Batch noun phrases match: {'PASS' if batch_phrases == single_phrases else 'FAIL'}")
+    shared_match = ([item['entities'] for item in shared] == single_entities and
+                    [item['noun_phrases'] for item in shared] == single_phrases)
+    print(f"Shared pass matches: {'PASS' if shared_match else 'FAIL'}")
+    print(f"One document at a time: {single_time:.2f}s, batched: {batch_time:.2f}s, shared pass: {shared_time:.2f}s")
+
+if __name__ == "__main__":
+    print("Batched SpaCy Processing Test")
+    print("=" * 50)
+    test_spacy_batch()
+    print("Test completed!")
@@ -0,0 +1,111 @@
+"""
+Test per-stage timing instrumentation and its sinks
+"""
+import logging
+import threading
+import time
+import stage_timing
+from matcher import ResumeMatcher
+from resume_parser import parse_resume, parse_resumes
+from test_in_memory_parsing import build_pdf
+from text_processor import preprocess_text
+from utils import load_sample_data, create_sample_resumes
+
+def test_stage_timing():
+    """Stages are recorded only while a sink or collector is active"""
+    samples = create_sample_resumes()
+    pdf = build_pdf([samples[0]['text'].strip()])
+
+    # Disabled: nothing is recorded and a timed call costs about one extra function call
+    sink = stage_timing.HistogramSink()
+    previous = stage_timing.set_sink(None)
+    parse_resume(pdf, file_name="resume.pdf")
+    print(f"Nothing recorded when disabled: {'PASS' if not stage_timing.enabled() and not sink.summary() else 'FAIL'}")
+
+    def plain(x):
+        return x
+    timed_plain = stage_timing.timed('noop')(plain)
+    calls = 200000
+    start = time.perf_counter()
+    for i in range(calls):
+        plain(i)
+    base = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(calls):
+        timed_plain(i)
+    overhead = (time.perf_counter() - start - base) / calls
+    print(f"Disabled overhead per call: {'PASS' if overhead < 2e-6 else 'FAIL'} ({overhead * 1e9:.0f} ns)")
+
+    # Enabled: every stage of parse -> preprocess -> match is recorded
+    stage_timing.set_sink(sink)
+    try:
+        resume = parse_resume(pdf, file_name="resume.pdf")
+        matcher = ResumeMatcher()
+        matcher.fit_job_description(preprocess_text(load_sample_data()))
+        resumes = [{'candidate_name': r['candidate_name'], 'text': preprocess_text(r['text'])} for r in samples]
+        matcher.match_resumes(resumes)
+        matcher.match_resume(resumes[0]['text'])
+        stages = {row['stage']: row for row in sink.summary()}
+        expected = {'parse_resume', 'parse.pdf_text', 'parse.fields', 'preprocess_text', 'preprocess.tokenize',
+                    'preprocess.pos_tag', 'preprocess.lemmatize', 'extract_skills_advanced', 'skills.scan',
+                    'similarity.profile', 'match_resumes', 'score_resumes', 'match.vectorize',
+                    'match.distances', 'match_resume'}
+        missing = expected - set(stages)
+        print(f"Every stage recorded: {'PASS' if not missing else 'FAIL'}{f' (missing {sorted(missing)})' if missing else ''}")
+        print(f"Call counts: {'PASS' if stages['match_resumes']['calls'] == 1 and stages['match_resume']['calls'] == 1 else 'FAIL'}")
+
+        # Stages timed inside pool workers are sent back to this process
+        sink.reset()
+        uploads = [("resume.pdf", pdf)] * 6
+        parse_resumes(uploads, workers=2, preprocess=True)
+        stages = {row['stage']: row for row in sink.summary()}
+        from_workers = stages.get('parse_resume', {}).get('calls') == 6 and stages.get('preprocess_text', {}).get('calls') == 6
+        print(f"Worker timings merged: {'PASS' if from_workers else 'FAIL'}")
+
+        # A collector only sees its own thread's work
+        results = {}
+        def batch(name, count):
+            with stage_timing.collect() as timings:
+                for text in [samples[0]['text']] * count:
+                    preprocess_text(text)
+            results[name] = {row['stage']: row['calls'] for row in timings.summary()}
+        threads = [threading.Thread(target=batch, args=(name, count)) for name, count in (('a', 2), ('b', 5))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        isolated = results['a']['preprocess_text'] == 2 and results['b']['preprocess_text'] == 5
+        print(f"Per-batch collectors isolated: {'PASS' if isolated else 'FAIL'}")
+
+        # Prometheus text exposition: cumulative buckets ending at +Inf == count
+        text = sink.to_prometheus()
+        lines = [line for line in text.splitlines() if not line.startswith('#')]
+        inf = [line for line in lines if 'stage="preprocess_text",le="+Inf"' in line]
+        count = [line for line in lines if line.startswith('resume_screening_stage_seconds_count{stage="preprocess_text"}')]
+        valid = (text.startswith('# HELP') and '# TYPE resume_screening_stage_seconds histogram' in text and
+                 inf and count and inf[0].split()[-1] == count[0].split()[-1])
+        print(f"Prometheus export: {'PASS' if valid else 'FAIL'}")
+    finally:
+        stage_timing.set_sink(previous)
+
+    # A logging sink reports each stage as it finishes
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("test_stage_timing")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    stage_timing.set_sink(stage_timing.LoggingSink(logger))
+    try:
+        preprocess_text(samples[1]['text'])
+    finally:
+        stage_timing.set_sink(previous)
+    logged = any(record.getMessage().startswith('preprocess_text took') for record in records)
+    print(f"Logging sink: {'PASS' if logged else 'FAIL'}")
+    print(f"Disabled again afterwards: {'PASS' if not stage_timing.enabled() else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Stage Timing Test")
+    print("=" * 50)
+    test_stage_timing()
+    print("Test completed!")
@@ -0,0 +1,99 @@
+"""
+Test the persistent corpus-fitted TF-IDF model
+"""
+import os
+import tempfile
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from matcher import ResumeMatcher
+from tfidf_model import CorpusTfidfModel
+from text_processor import preprocess_text
+from utils import load_sample_data, create_sample_resumes
+
+def rows_as_dicts(matrix, terms):
+    """Turn sparse rows into term -> weight dicts so column order does not matter"""
+    rows = []
+    for i in range(matrix.shape[0]):
+        row = matrix.getrow(i)
+        rows.append({terms[j]: value for j, value in zip(row.indices, row.data)})
+    return rows
+
+def same_rows(rows_a, rows_b):
+    """Compare two lists of term -> weight dicts"""
+    return all(a.keys() == b.keys() and all(abs(a[t] - b[t]) < 1e-12 for t in a)
+               for a, b in zip(rows_a, rows_b))
+
+def test_tfidf_model():
+    """Check parity with TfidfVectorizer, incremental updates and persistence"""
+    corpus = [preprocess_text(resume['text']) for resume in create_sample_resumes()]
+    corpus += [
+        "python developer django flask rest api docker aws",
+        "data analyst sql excel tableau statistic python",
+        "frontend engineer javascript react css html",
+    ]
+
+    # Full fit must match sklearn with the same settings
+    reference = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_df=0.8, sublinear_tf=True)
+    reference_matrix = reference.fit_transform(corpus)
+    reference_terms = reference.get_feature_names_out()
+
+    model = CorpusTfidfModel(max_features=None)
+    model_matrix = model.fit_transform(corpus)
+    parity = same_rows(rows_as_dicts(reference_matrix, reference_terms), rows_as_dicts(model_matrix, model.terms))
+    print(f"Matches TfidfVectorizer(max_df=0.8): {'PASS' if parity else 'FAIL'}")
+
+    # fit(A) + partial_fit(B) must equal fit(A + B)
+    incremental = CorpusTfidfModel(max_features=None).fit(corpus[:3]).partial_fit(corpus[3:])
+    incremental_rows = rows_as_dicts(incremental.transform(corpus), incremental.terms)
+    print(f"Incremental update equals full fit: {'PASS' if same_rows(incremental_rows, rows_as_dicts(model_matrix, model.terms)) else 'FAIL'}")
+
+    # Re-adding known documents must not change document frequencies
+    before = incremental.document_frequency.copy()
+    incremental.partial_fit(corpus)
+    print(f"Duplicate documents ignored: {'PASS' if np.array_equal(before, incremental.document_frequency) else 'FAIL'}")
+
+    # One document: max_df cannot tell common terms apart yet, so it is not applied
+    single = CorpusTfidfModel().fit(corpus[:1])
+    print(f"Single document keeps its terms: {'PASS' if single.transform(corpus[:1]).nnz > 0 else 'FAIL'}")
+
+    # The document frequency table stays bounded; the most frequent terms survive a prune
+    bounded = CorpusTfidfModel(max_features=20, max_vocabulary=100).fit(corpus)
+    for i in range(200):
+        bounded.partial_fit([f"python sql unique{i} rare{i} word{i}"])
+    kept = bounded.max_vocabulary * 0.8 <= len(bounded.terms) <= bounded.max_vocabulary
+    consistent = (len(bounded.document_frequency) == len(bounded.terms) and
+                  all(bounded.vocabulary[term] == i for i, term in enumerate(bounded.terms)))
+    print(f"Vocabulary capped: {'PASS' if kept and consistent and 'python' in bounded.vocabulary else 'FAIL'} "
+          f"({len(bounded.terms)} terms)")
+
+    # Only the most recently seen documents are remembered for deduplication
+    forgetful = CorpusTfidfModel(max_digests=3).fit(corpus[:3])
+    forgetful.partial_fit([corpus[0], "python developer"])
+    forgetful.partial_fit([corpus[1], corpus[0]])
+    print(f"Digests bounded (least recently seen forgotten): "
+          f"{'PASS' if len(forgetful.document_digests) == 3 and forgetful.n_documents == 5 else 'FAIL'} "
+          f"({forgetful.n_documents} documents counted)")
+
+    # Save and load round trip
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.npz")
+        model.save(path)
+        loaded = CorpusTfidfModel.load(path)
+        round_trip = (loaded.terms == model.terms and loaded.n_documents == model.n_documents
+                      and loaded.document_digests == model.document_digests
+                      and abs(loaded.transform(corpus) - model_matrix).max() < 1e-12)
+        print(f"Save/load round trip: {'PASS' if round_trip else 'FAIL'}")
+
+    # A matcher using the model only transforms the job description
+    matcher = ResumeMatcher(model=model)
+    matcher.fit_job_description(preprocess_text(load_sample_data()))
+    results = matcher.match_resumes([{'candidate_name': f"Resume {i+1}", 'text': text} for i, text in enumerate(corpus)])
+    for result in results[:3]:
+        print(f"  {result['candidate_name']}: {result['score']:.4f} ({result['decision']})")
+    print(f"Matcher uses corpus vocabulary: {'PASS' if matcher.jd_vector.shape[1] == len(model.terms) else 'FAIL'}")
+
+if __name__ == "__main__":
+    print("Corpus TF-IDF Model Test")
+    print("=" * 50)
+    test_tfidf_model()
+    print("Test completed!")
@@ -0,0 +1,60 @@
+"""
+Test top-k selection and paging of ranked results
+"""
+import time
+import numpy as np
+import stage_timing
+from matcher import ResumeMatcher, MultiJobMatcher, top_k_indices
+from text_processor import preprocess_text
+from utils import generate_job_description, generate_resumes
+
+def test_top_k():
+    """Pages of a top-k ranking must equal slices of the full ranking"""
+    rng = np.random.default_rng(0)
+    same = True
+    for _ in range(500):
+        # Few distinct values so ties straddle the cut
+        scores = rng.integers(0, 5, rng.integers(0, 40)) / 4.0
+        k = int(rng.integers(0, 45))
+        same = same and list(top_k_indices(scores, k)) == list(np.argsort(-scores, kind='stable')[:k])
+    print(f"top_k_indices equals a stable argsort prefix: {'PASS' if same else 'FAIL'}")
+
+    jd_text = preprocess_text(generate_job_description(seed=5))
+    matcher = ResumeMatcher()
+    matcher.fit_job_description(jd_text)
+    resumes = [{'candidate_name': r['candidate_name'], 'text': preprocess_text(r['text'])}
+               for r in generate_resumes(1000, seed=5)]
+
+    full = matcher.match_resumes(resumes)
+    pages = [matcher.match_resumes(resumes, top_k=50, offset=offset) for offset in range(0, 1000, 50)]
+    print(f"Pages equal slices of the full ranking: "
+          f"{'PASS' if all(page == full[i * 50:(i + 1) * 50] for i, page in enumerate(pages)) else 'FAIL'}")
+    print(f"Past the end is empty: {'PASS' if matcher.match_resumes(resumes, top_k=10, offset=1000) == [] else 'FAIL'}")
+    print(f"Short last page: {'PASS' if matcher.match_resumes(resumes, top_k=30, offset=990) == full[990:] else 'FAIL'}")
+
+    # Only the page's candidates get their skills extracted
+    with stage_timing.collect() as timings:
+        matcher.match_resumes(resumes, top_k=50)
+    extracted = {row['stage']: row['calls'] for row in timings.summary()}.get('extract_skills_advanced')
+    print(f"Skills extracted for the page only: {'PASS' if extracted == 50 else 'FAIL'} ({extracted} calls)")
+
+    multi = MultiJobMatcher()
+    multi.fit_job_descriptions({'job': jd_text})
+    ranking = multi.match_resumes(resumes, top_k=20)['job']
+    print(f"MultiJobMatcher top_k: {'PASS' if [r['candidate_name'] for r in ranking] == [r['candidate_name'] for r in full[:20]] else 'FAIL'}")
+
+    # Scores are shared, so the top-k saving is the per-row work it skips
+    start = time.perf_counter()
+    matcher.match_resumes(resumes)
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    matcher.match_resumes(resumes, top_k=50)
+    top_seconds = time.perf_counter() - start
+    print(f"Top 50 of 1000 is faster: {'PASS' if top_seconds < full_seconds else 'FAIL'} "
+          f"({top_seconds * 1000:.0f} ms vs {full_seconds * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    print("Top-k Ranking Test")
+    print("=" * 50)
+    test_top_k()
+    print("Test completed!")
@@ -1,31 +1,105 @@
-import nltk
-import spacy
 import re
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
+import time
 from collections import Counter
+from functools import lru_cache
 import string
+from stage_timing import timed, timer
+from parsed_document import as_document
 
-# Download required NLTK data (run once)
-try:
-    stop_words = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-except LookupError:
-    nltk.download('stopwords')
-    nltk.download('punkt')
-    nltk.download('wordnet')
-    nltk.download('averaged_perceptron_tagger')
-    stop_words = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-
-# Load SpaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Please install the SpaCy English model: python -m spacy download en_core_web_sm")
-    nlp = None
+# NLTK and SpaCy are imported and their models loaded on first use (or by
+# warmup()), so importing this module stays cheap for code that only needs
+# the regex helpers, e.g. resume_parser and the app before a batch runs.
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'wordnet': 'corpora/wordnet',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger'
+}
+SPACY_MODEL = "en_core_web_sm"
+
+# The POS codes WordNet's lemmatize() accepts (wordnet.ADJ etc.); spelled out
+# so mapping tags does not load the WordNet corpus
+WORDNET_ADJ, WORDNET_NOUN, WORDNET_VERB, WORDNET_ADV = 'a', 'n', 'v', 'r'
+
+# Lazily loaded models, keyed by name
+_models = {}
+
+def _ensure_nltk_data():
+    """Download any missing NLTK data (run once)"""
+    import nltk
+    for package, resource in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package)
+
+def get_stop_words():
+    """English stop words, loaded on first use"""
+    if 'stop_words' not in _models:
+        from nltk.corpus import stopwords
+        try:
+            _models['stop_words'] = set(stopwords.words('english'))
+        except LookupError:
+            _ensure_nltk_data()
+            _models['stop_words'] = set(stopwords.words('english'))
+    return _models['stop_words']
+
+def get_lemmatizer():
+    """WordNet lemmatizer, created on first use (WordNet itself loads on the first lemmatize call)"""
+    if 'lemmatizer' not in _models:
+        from nltk.stem import WordNetLemmatizer
+        _models['lemmatizer'] = WordNetLemmatizer()
+    return _models['lemmatizer']
+
+def get_nlp():
+    """SpaCy pipeline, loaded on first use; None if the model is not installed"""
+    if 'nlp' not in _models:
+        import spacy
+        try:
+            _models['nlp'] = spacy.load(SPACY_MODEL)
+        except OSError:
+            print(f"Please install the SpaCy English model: python -m spacy download {SPACY_MODEL}")
+            _models['nlp'] = None
+    return _models['nlp']
+
+def __getattr__(name):
+    """Keep the old module-level stop_words, lemmatizer and nlp names working, loaded lazily"""
+    loaders = {'stop_words': get_stop_words, 'lemmatizer': get_lemmatizer, 'nlp': get_nlp}
+    if name in loaders:
+        return loaders[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warmup(spacy_model=True):
+    """Load every model now instead of on the first request; returns seconds spent per model.
+
+    Call this before a server takes traffic. NLTK's tokenizer, tagger and
+    WordNet are only read from disk the first time they are used, so each
+    is exercised once here.
+    """
+    import nltk
+    timings = {}
+
+    start = time.perf_counter()
+    get_stop_words()
+    timings['stopwords'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nltk.word_tokenize("warm up")
+    timings['tokenizer'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nltk.pos_tag_sents([["warm"]])
+    timings['tagger'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_lemmatizer().lemmatize("warming", WORDNET_VERB)
+    timings['wordnet'] = time.perf_counter() - start
+
+    if spacy_model:
+        start = time.perf_counter()
+        get_nlp()
+        timings['spacy'] = time.perf_counter() - start
+    return timings
 
 def clean_text(text):
     """Clean and preprocess text"""
@@ -40,37 +114,109 @@ def clean_text(text):
     
     return text
 
+# Upper bound on cached (token, POS) -> lemma entries shared across documents
+LEMMA_CACHE_SIZE = 50000
+
+def penn_to_wordnet_pos(tag):
+    """Map a Penn Treebank tag to the first character lemmatize() accepts"""
+    tag_dict = {"J": WORDNET_ADJ,
+                "N": WORDNET_NOUN,
+                "V": WORDNET_VERB,
+                "R": WORDNET_ADV}
+    return tag_dict.get(tag[0].upper(), WORDNET_NOUN)
+
 def get_wordnet_pos(word):
     """Map POS tag to first character lemmatize() accepts"""
-    tag = nltk.pos_tag([word])[0][1][0].upper()
-    tag_dict = {"J": wordnet.ADJ,
-                "N": wordnet.NOUN,
-                "V": wordnet.VERB,
-                "R": wordnet.ADV}
-    return tag_dict.get(tag, wordnet.NOUN)
+    import nltk
+    tag = nltk.pos_tag([word])[0][1]
+    return penn_to_wordnet_pos(tag)
+
+@timed('preprocess.pos_tag')
+def get_wordnet_pos_batch(tokens):
+    """Map every distinct token to its WordNet POS with a single tagger call"""
+    import nltk
+    unique_tokens = list(dict.fromkeys(tokens))
+    if not unique_tokens:
+        return {}
+    
+    # Each token is tagged as its own one-word sentence, exactly like
+    # get_wordnet_pos, so the tags (and lemmas) do not change. Batching them
+    # loads the tagger once per document instead of once per token.
+    tagged = nltk.pos_tag_sents([[token] for token in unique_tokens])
+    return {sent[0][0]: penn_to_wordnet_pos(sent[0][1]) for sent in tagged}
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize_cached(token, pos):
+    """Lemmatize a token, memoized on (token, POS) across documents"""
+    return get_lemmatizer().lemmatize(token, pos)
 
 def tokenize_and_lemmatize(text):
     """Tokenize and lemmatize text using NLTK with POS tagging"""
+    from nltk.tokenize import word_tokenize
+    
     # Tokenize
-    tokens = word_tokenize(text)
+    with timer('preprocess.tokenize'):
+        tokens = word_tokenize(text)
     
     # Remove stopwords and punctuation
+    stop_words = get_stop_words()
     tokens = [token for token in tokens if token not in stop_words and token not in string.punctuation]
     
-    # Lemmatize with POS tagging
-    tokens = [lemmatizer.lemmatize(token, get_wordnet_pos(token)) for token in tokens]
+    # Tag the whole document in one pass, then lemmatize through the shared cache
+    pos_map = get_wordnet_pos_batch(tokens)
+    with timer('preprocess.lemmatize'):
+        tokens = [lemmatize_cached(token, pos_map[token]) for token in tokens]
     
     return ' '.join(tokens)
 
+# SpaCy components each task can skip. NER does not use the parser or tagger;
+# noun chunks need the tagger and parser but not NER. The lemmatizer is never used.
+ENTITY_DISABLED_COMPONENTS = ('tagger', 'attribute_ruler', 'parser', 'senter', 'lemmatizer')
+NOUN_PHRASE_DISABLED_COMPONENTS = ('ner', 'lemmatizer')
+SHARED_DISABLED_COMPONENTS = ('lemmatizer',)
+
+# Default number of documents SpaCy processes per batch
+SPACY_BATCH_SIZE = 64
+
+def _spacy_disabled(nlp, components):
+    """Components to disable for a task, limited to those in the loaded pipeline"""
+    disabled = [name for name in components if name in nlp.pipe_names]
+    
+    # The shared tok2vec can go too when no remaining component listens to it
+    if 'tok2vec' in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe('tok2vec'), 'listening_components', [])
+        if all(listener in disabled for listener in listeners):
+            disabled.append('tok2vec')
+    return disabled
+
+def _pipe_docs(nlp, texts, components, batch_size, n_process):
+    """Stream texts through SpaCy with the components a task does not need disabled"""
+    return nlp.pipe(texts, batch_size=batch_size, n_process=n_process,
+                    disable=_spacy_disabled(nlp, components))
+
+@timed('spacy.entities')
 def extract_entities_spacy(text):
     """Extract named entities using SpaCy"""
+    nlp = get_nlp()
     if nlp is None:
         return []
     
-    doc = nlp(text)
+    doc = nlp(text, disable=_spacy_disabled(nlp, ENTITY_DISABLED_COMPONENTS))
     entities = [(ent.text, ent.label_) for ent in doc.ents]
     return entities
 
+@timed('spacy.entities')
+def extract_entities_spacy_batch(texts, batch_size=SPACY_BATCH_SIZE, n_process=1):
+    """Extract named entities for many texts with nlp.pipe, skipping the parser"""
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is None:
+        return [[] for _ in texts]
+    
+    return [[(ent.text, ent.label_) for ent in doc.ents]
+            for doc in _pipe_docs(nlp, texts, ENTITY_DISABLED_COMPONENTS, batch_size, n_process)]
+
+@timed('preprocess_text')
 def preprocess_text(text):
     """Complete text preprocessing pipeline"""
     # Clean text
@@ -81,17 +227,45 @@ def preprocess_text(text):
     
     return processed_text
 
+@timed('spacy.noun_phrases')
 def extract_noun_phrases(text):
     """Extract noun phrases using SpaCy"""
+    nlp = get_nlp()
     if nlp is None:
         return []
     
-    doc = nlp(text)
+    doc = nlp(text, disable=_spacy_disabled(nlp, NOUN_PHRASE_DISABLED_COMPONENTS))
     noun_phrases = [chunk.text for chunk in doc.noun_chunks]
     return noun_phrases
 
+@timed('spacy.noun_phrases')
+def extract_noun_phrases_batch(texts, batch_size=SPACY_BATCH_SIZE, n_process=1):
+    """Extract noun phrases for many texts with nlp.pipe, skipping NER"""
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is None:
+        return [[] for _ in texts]
+    
+    return [[chunk.text for chunk in doc.noun_chunks]
+            for doc in _pipe_docs(nlp, texts, NOUN_PHRASE_DISABLED_COMPONENTS, batch_size, n_process)]
+
+@timed('spacy.features')
+def extract_spacy_features_batch(texts, batch_size=SPACY_BATCH_SIZE, n_process=1):
+    """Entities and noun phrases for many texts from a single SpaCy pass"""
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is None:
+        return [{'entities': [], 'noun_phrases': []} for _ in texts]
+    
+    return [{
+        'entities': [(ent.text, ent.label_) for ent in doc.ents],
+        'noun_phrases': [chunk.text for chunk in doc.noun_chunks]
+    } for doc in _pipe_docs(nlp, texts, SHARED_DISABLED_COMPONENTS, batch_size, n_process)]
+
 def extract_key_terms(text, top_n=20):
     """Extract key terms based on frequency and TF-IDF-like scoring"""
+    from nltk.tokenize import word_tokenize
+    
     # Preprocess text
     processed_text = preprocess_text(text)
     
@@ -109,75 +283,111 @@ def extract_key_terms(text, top_n=20):
     
     return top_terms
 
+# Common skills keywords (expanded list), compiled once into SKILL_PATTERN below
+SKILL_KEYWORDS = [
+    # Programming Languages
+    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust', 'scala',
+    'r', 'matlab', 'sql', 'typescript', 'dart', 'perl', 'shell', 'bash',
+    
+    # Web Technologies
+    'html', 'css', 'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring', 'express',
+    'asp.net', 'jquery', 'bootstrap', 'sass', 'less', 'webpack', 'npm', 'rest', 'graphql',
+    
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'oracle', 'sql server', 'redis', 'elasticsearch',
+    'cassandra', 'firebase', 'dynamodb', 'sqlite',
+    
+    # Machine Learning & AI
+    'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch', 'keras',
+    'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'opencv', 'nltk', 'spacy',
+    'computer vision', 'natural language processing', 'reinforcement learning', 'xgboost',
+    'data science', 'artificial intelligence', 'data mining', 'predictive modeling',
+    
+    # Cloud & DevOps
+    'aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
+    'gitlab', 'ci/cd', 'terraform', 'ansible', 'puppet', 'chef', 'openshift', 'heroku',
+    'serverless', 'lambda', 'ec2', 's3', 'gcp', 'cloudformation',
+    
+    # Data & Analytics
+    'data analysis', 'data visualization', 'tableau', 'power bi', 'excel', 'statistics',
+    'hadoop', 'spark', 'hive', 'pig', 'kafka', 'airflow', 'etl', 'big data',
+    
+    # Mobile Development
+    'android', 'ios', 'flutter', 'react native', 'xamarin', 'ionic', 'cordova',
+    
+    # Software Engineering
+    'agile', 'scrum', 'kanban', 'jira', 'confluence', 'testing', 'unit testing',
+    'integration testing', 'test automation', 'selenium', 'junit', 'pytest',
+    'object-oriented programming', 'design patterns', 'software architecture',
+    'microservices', 'api development', 'debugging', 'refactoring',
+    
+    # Soft Skills
+    'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
+    'project management', 'time management', 'adaptability', 'creativity',
+    'attention to detail', 'customer service', 'negotiation', 'mentoring'
+]
+
+def _build_skill_trie_regex(node):
+    """Turn a character trie of skills into a prefix-factored regex"""
+    alternatives = [re.escape(char) + _build_skill_trie_regex(child)
+                    for char, child in sorted(node.items()) if char != '']
+    if not alternatives:
+        return ''
+    if len(alternatives) == 1 and len(alternatives[0]) == 1:
+        body = alternatives[0]
+    else:
+        body = '(?:' + '|'.join(alternatives) + ')'
+    # A skill ending here is optional so the greedy match prefers longer skills
+    return body + '?' if '' in node else body
+
+def compile_skill_matcher(skills):
+    """Compile a skill list into a single-pass matcher"""
+    trie = {}
+    for skill in skills:
+        node = trie
+        for char in skill:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    # The lookahead lets one scan report a match at every word start; each
+    # match is the longest skill there with the same \b...\b rules as before
+    pattern = re.compile(r'(?=\b(' + _build_skill_trie_regex(trie) + r')\b)')
+    
+    # Shorter skills hidden by a longer match at the same position (e.g. 'sql'
+    # inside 'sql server') are re-checked with their own anchored pattern
+    prefix_skills = {}
+    for skill in skills:
+        for other in skills:
+            if other != skill and skill.startswith(other):
+                prefix_skills.setdefault(skill, []).append(
+                    (other, re.compile(r'\b' + re.escape(other) + r'\b')))
+    
+    return pattern, prefix_skills
+
+SKILL_PATTERN, SKILL_PREFIX_PATTERNS = compile_skill_matcher(SKILL_KEYWORDS)
+
+@timed('skills.scan')
+def find_skills(skill_text):
+    """Find every taxonomy skill in the text, in SKILL_KEYWORDS order"""
+    found = set()
+    for match in SKILL_PATTERN.finditer(skill_text):
+        skill = match.group(1)
+        found.add(skill)
+        for prefix_skill, prefix_pattern in SKILL_PREFIX_PATTERNS.get(skill, ()):
+            if prefix_pattern.match(skill_text, match.start()):
+                found.add(prefix_skill)
+    
+    return [skill for skill in dict.fromkeys(SKILL_KEYWORDS) if skill in found]
+
+@timed('extract_skills_advanced')
 def extract_skills_advanced(text):
-    """Extract skills using a sophisticated approach to avoid false positives"""
-    # Common skills keywords (expanded list)
-    skill_keywords = [
-        # Programming Languages
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust', 'scala',
-        'r', 'matlab', 'sql', 'typescript', 'dart', 'perl', 'shell', 'bash',
-        
-        # Web Technologies
-        'html', 'css', 'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring', 'express',
-        'asp.net', 'jquery', 'bootstrap', 'sass', 'less', 'webpack', 'npm', 'rest', 'graphql',
-        
-        # Databases
-        'mysql', 'postgresql', 'mongodb', 'oracle', 'sql server', 'redis', 'elasticsearch',
-        'cassandra', 'firebase', 'dynamodb', 'sqlite',
-        
-        # Machine Learning & AI
-        'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch', 'keras',
-        'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'seaborn', 'opencv', 'nltk', 'spacy',
-        'computer vision', 'natural language processing', 'reinforcement learning', 'xgboost',
-        'data science', 'artificial intelligence', 'data mining', 'predictive modeling',
-        
-        # Cloud & DevOps
-        'aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'jenkins', 'git', 'github',
-        'gitlab', 'ci/cd', 'terraform', 'ansible', 'puppet', 'chef', 'openshift', 'heroku',
-        'serverless', 'lambda', 'ec2', 's3', 'gcp', 'cloudformation',
-        
-        # Data & Analytics
-        'data analysis', 'data visualization', 'tableau', 'power bi', 'excel', 'statistics',
-        'hadoop', 'spark', 'hive', 'pig', 'kafka', 'airflow', 'etl', 'big data',
-        
-        # Mobile Development
-        'android', 'ios', 'flutter', 'react native', 'xamarin', 'ionic', 'cordova',
-        
-        # Software Engineering
-        'agile', 'scrum', 'kanban', 'jira', 'confluence', 'testing', 'unit testing',
-        'integration testing', 'test automation', 'selenium', 'junit', 'pytest',
-        'object-oriented programming', 'design patterns', 'software architecture',
-        'microservices', 'api development', 'debugging', 'refactoring',
-        
-        # Soft Skills
-        'communication', 'leadership', 'teamwork', 'problem solving', 'critical thinking',
-        'project management', 'time management', 'adaptability', 'creativity',
-        'attention to detail', 'customer service', 'negotiation', 'mentoring'
-    ]
-    
-    # Split text into lines and process each line
-    lines = text.lower().split('\n')
-    found_skills = []
-    
-    # Common section headers where skills are listed
-    skill_section_indicators = ['skill', 'technical', 'expertise', 'competenc', 'proficienc']
-    
-    # Look for skill sections
-    in_skill_section = False
-    skill_lines = []
-    
-    for line in lines:
-        # Check if we're entering a skill section
-        if any(indicator in line for indicator in skill_section_indicators):
-            in_skill_section = True
-            continue
-            
-        # If we're in a skill section, collect lines until we hit an empty line or new section
-        if in_skill_section:
-            if line.strip() == '' or any(word in line for word in ['experience', 'education', 'project']):
-                in_skill_section = False
-            elif line.strip():
-                skill_lines.append(line)
+    """Extract skills from text (or a ParsedDocument) using a sophisticated approach to avoid false positives"""
+    # Lowercased lines and skill sections come from the shared parsed document
+    document = as_document(text)
+    lines = document.lower_lines
+    
+    # Lines of the skill sections (up to an empty line or another section)
+    skill_lines = document.skill_lines()
     
     # If no skill section found, use the whole text but be more careful
     if not skill_lines:
@@ -190,49 +400,35 @@ def extract_skills_advanced(text):
         if not skill_lines:
             skill_indicators = ['proficient', 'experienced', 'skilled', 'knowledge', 'ability']
             for line in lines:
-                if any(indicator in line.lower() for indicator in skill_indicators):
+                if any(indicator in line for indicator in skill_indicators):
                     skill_lines.append(line)
     
     # If still nothing, use a more restrictive approach on the whole text
-    skill_text = ' '.join(skill_lines) if skill_lines else text.lower()
+    skill_text = ' '.join(skill_lines) if skill_lines else document.lower
     
     # If we're using the whole text, be extra careful
     if not skill_lines:
         # Add boundaries to avoid matching in names
         skill_text = ' ' + skill_text + ' '
     
-    for skill in skill_keywords:
-        # Escape special regex characters and add word boundaries
-        escaped_skill = re.escape(skill)
-        pattern = r'\b' + escaped_skill + r'\b'
-        
-        # Search for the pattern
-        if re.search(pattern, skill_text):
-            found_skills.append(skill)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_skills = []
-    for skill in found_skills:
-        if skill not in seen:
-            seen.add(skill)
-            unique_skills.append(skill)
-    
-    return unique_skills
+    # Single scan over the text for the whole taxonomy
+    return find_skills(skill_text)
+
+# Patterns matching experience mentions, compiled once
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\s*years?\s*experience'),
+    re.compile(r'experience\s*of\s*(\d+)\s*years?'),
+    re.compile(r'(\d+)\s*years?\s*(?:of\s*)?experience'),
+    re.compile(r'experience[:\s]*(\d+)\s*years?')
+]
 
 def extract_experience_years(text):
-    """Extract years of experience from text"""
-    # Pattern to match experience mentions
-    patterns = [
-        r'(\d+)\s*years?\s*experience',
-        r'experience\s*of\s*(\d+)\s*years?',
-        r'(\d+)\s*years?\s*(?:of\s*)?experience',
-        r'experience[:\s]*(\d+)\s*years?'
-    ]
+    """Extract years of experience from text (or a ParsedDocument)"""
+    lower_text = as_document(text).lower
     
     years = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
+    for pattern in EXPERIENCE_PATTERNS:
+        matches = pattern.findall(lower_text)
         years.extend([int(match) for match in matches])
     
     # Return average if multiple matches, otherwise return the value or 0
@@ -240,15 +436,28 @@ def extract_experience_years(text):
         return sum(years) / len(years)
     return 0
 
-def calculate_text_similarity(text1, text2):
-    """Calculate similarity between two texts using multiple methods"""
-    # Preprocess texts
-    processed_text1 = preprocess_text(text1)
-    processed_text2 = preprocess_text(text2)
+@timed('similarity.profile')
+def build_similarity_profile(text):
+    """Precompute one side of calculate_text_similarity"""
+    # Preprocess text
+    processed_text = preprocess_text(text)
     
     # Extract key terms
-    terms1 = set(extract_key_terms(processed_text1))
-    terms2 = set(extract_key_terms(processed_text2))
+    terms = set(extract_key_terms(processed_text))
+    
+    # Every key term counts once, so the magnitude only depends on the term count
+    magnitude = len(terms) ** 0.5
+    
+    return {
+        'processed_text': processed_text,
+        'terms': terms,
+        'magnitude': magnitude
+    }
+
+def calculate_profile_similarity(profile1, profile2):
+    """Calculate similarity between two precomputed similarity profiles"""
+    terms1 = profile1['terms']
+    terms2 = profile2['terms']
     
     # Calculate Jaccard similarity
     intersection = terms1.intersection(terms2)
@@ -261,18 +470,11 @@ def calculate_text_similarity(text1, text2):
     
     # Calculate cosine similarity (simplified)
     # In a real implementation, you would use TF-IDF vectors
-    vector1 = Counter(terms1)
-    vector2 = Counter(terms2)
-    
-    # Get common terms
-    common_terms = set(vector1.keys()) & set(vector2.keys())
+    # Each term has a count of 1, so the dot product is the number of common terms
+    dot_product = len(intersection)
     
-    # Calculate dot product
-    dot_product = sum(vector1[term] * vector2[term] for term in common_terms)
-    
-    # Calculate magnitudes
-    magnitude1 = sum(value**2 for value in vector1.values()) ** 0.5
-    magnitude2 = sum(value**2 for value in vector2.values()) ** 0.5
+    magnitude1 = profile1['magnitude']
+    magnitude2 = profile2['magnitude']
     
     if magnitude1 == 0 or magnitude2 == 0:
         cosine_similarity = 0.0
@@ -282,4 +484,10 @@ def calculate_text_similarity(text1, text2):
     # Weighted average of both similarities
     final_similarity = 0.4 * jaccard_similarity + 0.6 * cosine_similarity
     
-    return final_similarity
\ No newline at end of file
+    return final_similarity
+
+@timed('calculate_text_similarity')
+def calculate_text_similarity(text1, text2):
+    """Calculate similarity between two texts using multiple methods"""
+    return calculate_profile_similarity(build_similarity_profile(text1),
+                                        build_similarity_profile(text2))
@@ -0,0 +1,219 @@
+import hashlib
+import json
+import numpy as np
+from collections import Counter, OrderedDict
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Default location of the persisted corpus model
+DEFAULT_MODEL_PATH = "tfidf_model.npz"
+# Terms whose document frequencies are tracked, and the share of them (the
+# most frequent) kept when the table outgrows that and is pruned
+DEFAULT_MAX_VOCABULARY = 200000
+VOCABULARY_PRUNE_KEEP = 0.8
+# Digests of counted documents remembered for deduplication (16 bytes each)
+DEFAULT_MAX_DIGESTS = 100000
+
+class CorpusTfidfModel:
+    """TF-IDF model fitted on the resume corpus and updated incrementally.
+
+    Document frequencies are kept per term, so new resumes only add to the
+    counts (no refit). Terms are appended to the vocabulary, and terms pruned
+    by min_df / max_df / max_features simply get an IDF weight of 0, so column
+    indices stay stable while the vocabulary grows. max_df only applies once
+    there are at least 2 documents (otherwise it would reject every term).
+    Weights follow TfidfVectorizer (smooth IDF, sublinear TF, L2-normalized
+    rows), and transform() returns the same sparse matrix shape, so a model
+    can stand in for ResumeMatcher's vectorizer.
+
+    The table is bounded by max_vocabulary terms (None: unbounded). When it
+    grows past that, only the most frequent VOCABULARY_PRUNE_KEEP of it is
+    kept and the columns are renumbered, so vectors from before the prune must
+    be recomputed. A pruned term that appears again starts counting from zero,
+    which only affects rare terms.
+
+    Re-adding a document already counted leaves the counts unchanged, but
+    this deduplication is best-effort: only the max_digests most recently
+    seen documents (None: all) are remembered, so an older one is counted
+    again.
+    """
+    def __init__(self, max_features=10000, min_df=1, max_df=0.8, ngram_range=(1, 2),
+                 max_vocabulary=DEFAULT_MAX_VOCABULARY, max_digests=DEFAULT_MAX_DIGESTS):
+        if max_vocabulary is not None and max_features is not None and max_vocabulary < max_features:
+            raise ValueError("max_vocabulary must be at least max_features")
+        self.max_features = max_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_vocabulary = max_vocabulary
+        self.max_digests = max_digests
+        self.ngram_range = tuple(ngram_range)
+        self.analyzer = CountVectorizer(stop_words='english', ngram_range=self.ngram_range).build_analyzer()
+        self.vocabulary = {}
+        self.terms = []
+        self.document_frequency = np.zeros(0, dtype=np.int64)
+        self.n_documents = 0
+        # Digests of documents already counted, least recently seen first, so
+        # re-uploads do not inflate DF
+        self.document_digests = OrderedDict()
+        self.idf = np.zeros(0)
+        self._weights_stale = True
+
+    def _digest(self, text):
+        """Short content digest used to recognise documents already counted"""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def partial_fit(self, texts):
+        """Add documents to the document frequencies without a full refit"""
+        df_updates = Counter()
+        added = 0
+        for text in texts:
+            digest = self._digest(text)
+            if digest in self.document_digests:
+                self.document_digests.move_to_end(digest)
+                continue
+            self.document_digests[digest] = None
+            if self.max_digests is not None and len(self.document_digests) > self.max_digests:
+                self.document_digests.popitem(last=False)
+            df_updates.update(set(self.analyzer(text)))
+            added += 1
+
+        if not added:
+            return self
+
+        # Append unseen terms so existing column indices stay valid
+        new_terms = [term for term in df_updates if term not in self.vocabulary]
+        for term in new_terms:
+            self.vocabulary[term] = len(self.terms)
+            self.terms.append(term)
+        if new_terms:
+            self.document_frequency = np.concatenate(
+                [self.document_frequency, np.zeros(len(new_terms), dtype=np.int64)])
+
+        indices = np.fromiter((self.vocabulary[term] for term in df_updates), dtype=np.int64, count=len(df_updates))
+        counts = np.fromiter(df_updates.values(), dtype=np.int64, count=len(df_updates))
+        self.document_frequency[indices] += counts
+        self.n_documents += added
+        if self.max_vocabulary is not None and len(self.terms) > self.max_vocabulary:
+            self._prune_vocabulary()
+        self._weights_stale = True
+        return self
+
+    def _prune_vocabulary(self):
+        """Keep only the most frequent terms (ties to the oldest) and renumber the columns"""
+        keep_count = int(self.max_vocabulary * VOCABULARY_PRUNE_KEEP)
+        keep = np.sort(np.argsort(-self.document_frequency, kind='stable')[:keep_count])
+        self.terms = [self.terms[i] for i in keep]
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.document_frequency = self.document_frequency[keep]
+
+    def fit(self, texts):
+        """Fit the model from scratch on a corpus"""
+        self.vocabulary = {}
+        self.terms = []
+        self.document_frequency = np.zeros(0, dtype=np.int64)
+        self.n_documents = 0
+        self.document_digests = OrderedDict()
+        return self.partial_fit(texts)
+
+    def _update_weights(self):
+        """Recompute IDF weights and the active feature set from the counts"""
+        df = self.document_frequency
+        n = self.n_documents
+
+        # Same pruning rules as TfidfVectorizer (floats are fractions of the
+        # corpus); max_df needs a second document to tell common terms apart
+        if n < 2:
+            max_doc_count = n
+        else:
+            max_doc_count = self.max_df if isinstance(self.max_df, int) else self.max_df * n
+        min_doc_count = self.min_df if isinstance(self.min_df, int) else self.min_df * n
+        active = (df >= min_doc_count) & (df <= max_doc_count)
+
+        # Keep the most common remaining terms (ties broken by vocabulary order)
+        if self.max_features is not None and active.sum() > self.max_features:
+            candidates = np.flatnonzero(active)
+            keep = candidates[np.argsort(-df[candidates], kind='stable')[:self.max_features]]
+            active = np.zeros_like(active)
+            active[keep] = True
+
+        idf = np.log((1 + n) / (1 + df)) + 1
+        self.idf = np.where(active, idf, 0.0)
+        self._weights_stale = False
+
+    def transform(self, texts):
+        """Transform texts into L2-normalized sublinear TF-IDF rows"""
+        if self.n_documents == 0:
+            raise ValueError("Model not fitted yet. Call fit or partial_fit first.")
+        if self._weights_stale:
+            self._update_weights()
+
+        indptr = [0]
+        indices = []
+        values = []
+        for text in texts:
+            counts = Counter(term for term in self.analyzer(text) if term in self.vocabulary)
+            for term, count in counts.items():
+                column = self.vocabulary[term]
+                weight = self.idf[column]
+                if weight:
+                    indices.append(column)
+                    values.append((np.log(count) + 1) * weight)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.array(values, dtype=float), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(indptr) - 1, len(self.terms))
+        )
+        matrix.sort_indices()
+
+        # L2-normalize each row (empty rows stay empty)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def fit_transform(self, texts):
+        """Fit the model on texts and transform them"""
+        texts = list(texts)
+        return self.fit(texts).transform(texts)
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Persist vocabulary, document frequencies and IDF arrays"""
+        if self._weights_stale and self.n_documents:
+            self._update_weights()
+        params = {
+            'max_features': self.max_features,
+            'min_df': self.min_df,
+            'max_df': self.max_df,
+            'max_vocabulary': self.max_vocabulary,
+            'max_digests': self.max_digests,
+            'ngram_range': list(self.ngram_range),
+            'n_documents': self.n_documents
+        }
+        np.savez_compressed(
+            path,
+            params=np.array(json.dumps(params)),
+            terms=np.array(self.terms, dtype=str),
+            document_frequency=self.document_frequency,
+            idf=self.idf,
+            document_digests=np.frombuffer(b''.join(self.document_digests), dtype=np.uint8).reshape(-1, 16)
+        )
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """Load a model saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            params = json.loads(str(data['params']))
+            model = cls(max_features=params['max_features'],
+                        min_df=params['min_df'],
+                        max_df=params['max_df'],
+                        ngram_range=params['ngram_range'],
+                        max_vocabulary=params.get('max_vocabulary', DEFAULT_MAX_VOCABULARY),
+                        max_digests=params.get('max_digests', DEFAULT_MAX_DIGESTS))
+            model.terms = [str(term) for term in data['terms']]
+            model.vocabulary = {term: i for i, term in enumerate(model.terms)}
+            model.document_frequency = data['document_frequency'].astype(np.int64)
+            model.idf = data['idf']
+            model.document_digests = OrderedDict.fromkeys(row.tobytes() for row in data['document_digests'])
+            model.n_documents = params['n_documents']
+            model._weights_stale = False
+        return model
@@ -1,19 +1,21 @@
-import pandas as pd
 import os
+import random
+from text_processor import SKILL_KEYWORDS
+from match_results import MatchResults, EXPORT_CHUNK_ROWS
 
-def save_results_to_csv(results, filename="results.csv"):
-    """Save matching results to CSV file"""
-    # Create a copy of results without the detailed_scores for CSV export
-    csv_results = []
-    for result in results:
-        csv_result = result.copy()
-        # Remove detailed_scores for cleaner CSV
-        if 'detailed_scores' in csv_result:
-            del csv_result['detailed_scores']
-        csv_results.append(csv_result)
-    
-    df = pd.DataFrame(csv_results)
-    df.to_csv(filename, index=False)
+def as_match_results(results):
+    """Columnar MatchResults for match_resumes rows (or MatchResults, returned as is)"""
+    return results if isinstance(results, MatchResults) else MatchResults.from_records(results)
+
+def save_results_to_csv(results, filename="results.csv", chunk_rows=EXPORT_CHUNK_ROWS):
+    """Save matching results to CSV file, detailed scores as their own columns"""
+    # Written chunk by chunk from the columns, without a DataFrame of every row
+    as_match_results(results).write_csv(filename, chunk_rows)
+    return filename
+
+def save_results_to_parquet(results, filename="results.parquet", chunk_rows=EXPORT_CHUNK_ROWS):
+    """Save matching results to a Parquet file (needs pyarrow), one row group per chunk"""
+    as_match_results(results).write_parquet(filename, chunk_rows)
     return filename
 
 def load_sample_data():
@@ -106,4 +108,92 @@ def create_sample_resumes():
         }
     ]
     
-    return resumes
\ No newline at end of file
+    return resumes
+
+# Building blocks for synthetic resumes and job descriptions
+SYNTHETIC_FIRST_NAMES = ['Alex', 'Sarah', 'Michael', 'Priya', 'Jordan', 'Elena', 'David', 'Mei', 'Omar', 'Grace',
+                         'Lucas', 'Aisha', 'Daniel', 'Sofia', 'Kenji', 'Hannah', 'Mateo', 'Olivia', 'Ravi', 'Chloe']
+SYNTHETIC_LAST_NAMES = ['Johnson', 'Williams', 'Chen', 'Patel', 'Garcia', 'Kim', 'Nguyen', 'Smith', 'Okafor',
+                        'Rossi', 'Muller', 'Silva', 'Tanaka', 'Brown', 'Khan', 'Lopez', 'Novak', 'Wilson']
+SYNTHETIC_ROLES = {
+    'Data Scientist': ['python', 'r', 'sql', 'machine learning', 'deep learning', 'tensorflow', 'pytorch',
+                       'scikit-learn', 'pandas', 'numpy', 'statistics', 'data visualization', 'spark', 'aws'],
+    'Software Engineer': ['java', 'python', 'go', 'c++', 'rest', 'microservices', 'docker', 'kubernetes',
+                          'postgresql', 'redis', 'git', 'ci/cd', 'unit testing', 'design patterns'],
+    'Frontend Developer': ['javascript', 'typescript', 'react', 'angular', 'vue', 'html', 'css', 'sass',
+                           'webpack', 'npm', 'graphql', 'testing', 'git', 'agile'],
+    'DevOps Engineer': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins',
+                        'bash', 'python', 'ci/cd', 'shell', 'kafka', 'elasticsearch'],
+    'Data Engineer': ['python', 'scala', 'sql', 'spark', 'hadoop', 'hive', 'kafka', 'airflow', 'etl',
+                      'big data', 'aws', 's3', 'dynamodb', 'mongodb'],
+    'Mobile Developer': ['kotlin', 'swift', 'java', 'android', 'ios', 'flutter', 'react native', 'dart',
+                         'firebase', 'rest', 'git', 'unit testing', 'agile', 'sqlite']
+}
+SYNTHETIC_DEGREES = ["Bachelor's degree", "Master's degree", 'PhD']
+SYNTHETIC_FIELDS = ['Computer Science', 'Statistics', 'Mathematics', 'Software Engineering', 'Physics']
+SYNTHETIC_UNIVERSITIES = ['Stanford University', 'MIT', 'University of Toronto', 'ETH Zurich',
+                          'Georgia Tech', 'University of Michigan', 'IIT Bombay', 'TU Munich']
+SYNTHETIC_SOFT_SKILLS = ['communication', 'leadership', 'teamwork', 'problem solving', 'mentoring',
+                         'project management', 'critical thinking', 'time management']
+
+SYNTHETIC_SKILL_LABELS = {'git': 'Git', 'vue': 'Vue', 'npm': 'npm', 'ios': 'iOS', 'go': 'Go'}
+
+def _skill_label(skill):
+    """Display form of a taxonomy skill, as a person would write it on a resume"""
+    if skill in SYNTHETIC_SKILL_LABELS:
+        return SYNTHETIC_SKILL_LABELS[skill]
+    if any(c in skill for c in '+#/.'):
+        return skill
+    return skill.upper() if len(skill) <= 3 else skill.title()
+
+def generate_job_description(seed=0, role=None):
+    """Generate a synthetic job description in the shape of load_sample_data"""
+    rng = random.Random(seed)
+    role = role or rng.choice(list(SYNTHETIC_ROLES))
+    required = rng.sample(SYNTHETIC_ROLES[role], 6)
+    years = rng.randint(2, 8)
+    requirements = [
+        f"{rng.choice(SYNTHETIC_DEGREES)} in {rng.choice(SYNTHETIC_FIELDS)} or related field",
+        f"{years}+ years of experience as a {role}",
+        f"Expertise in {', '.join(_skill_label(s) for s in required[:3])}",
+        f"Experience with {', '.join(_skill_label(s) for s in required[3:])}",
+        f"Excellent {rng.choice(SYNTHETIC_SOFT_SKILLS)} and {rng.choice(SYNTHETIC_SOFT_SKILLS)} skills"
+    ]
+    return (f"\n    Senior {role}\n"
+            f"    We are seeking a {role} to join our team. The ideal candidate will have experience with "
+            f"{_skill_label(required[0])} and {_skill_label(required[1])}.\n    \n    Requirements:\n"
+            + "".join(f"    - {requirement}\n" for requirement in requirements))
+
+def generate_resumes(count, seed=0):
+    """Generate count synthetic resumes in the shape of create_sample_resumes.
+    
+    Each resume draws a role and most of its skills from that role's pool plus
+    a few from the whole SKILL_KEYWORDS taxonomy, so a corpus has realistic
+    overlap with any generated job description. The same seed gives the same corpus.
+    """
+    rng = random.Random(seed)
+    roles = list(SYNTHETIC_ROLES)
+    resumes = []
+    for i in range(count):
+        name = f"{rng.choice(SYNTHETIC_FIRST_NAMES)} {rng.choice(SYNTHETIC_LAST_NAMES)}"
+        role = rng.choice(roles)
+        skills = rng.sample(SYNTHETIC_ROLES[role], rng.randint(4, 10))
+        skills += [skill for skill in rng.sample(SKILL_KEYWORDS, 3) if skill not in skills]
+        skills += rng.sample(SYNTHETIC_SOFT_SKILLS, 2)
+        years = rng.randint(1, 15)
+        headline = rng.sample(skills[:4], min(3, len(skills)))
+        text = (
+            f"\n            {name}\n"
+            f"            Email: {name.lower().replace(' ', '.')}{i}@email.com\n"
+            f"            Phone: (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}\n"
+            f"            \n"
+            f"            {role} with {years} years of experience in {_skill_label(skills[0])} and "
+            f"{_skill_label(skills[1])}. {rng.choice(SYNTHETIC_DEGREES)} in {rng.choice(SYNTHETIC_FIELDS)} "
+            f"from {rng.choice(SYNTHETIC_UNIVERSITIES)}. Expert in {', '.join(_skill_label(s) for s in headline)}. "
+            f"Delivered {rng.randint(2, 12)} projects improving key metrics by {rng.randint(5, 40)}%.\n"
+            f"            \n"
+            f"            Skills:\n"
+            + "".join(f"            - {_skill_label(skill)}\n" for skill in skills)
+        )
+        resumes.append({'candidate_name': name, 'text': text})
+    return resumes